@@ -2,27 +2,32 @@ from __future__ import annotations
 import time
 import logging
 import os
+from functools import partial
+from typing import Dict, Iterator, List, Tuple
 
 from config import settings
+from utils.circuit_breaker import get_breakers, get_retry_budget
+from utils.http_client import get_http_client
 from utils.log import setup_logging
 from utils.date_utils import is_today, get_today, get_age_in_days
 
-from collectors.rss_collector import RSSCollector
-from collectors.sec_collector import SECRSSCollector
-from collectors.sec_filtered_collector import SECFilteredCollector
-from collectors.alpha_vantage_collector import AlphaVantageCollector
-from collectors.thenewsapi_collector import TheNewsAPICollector
-from collectors.newsapi_ai_collector import NewsAPIaiCollector
+from collectors.registry import load_registry
 
-from core.dedup import make_uid
-from core.scoring import score
-from core.ticker_extraction import extract_ticker
+from core.event_cluster import EventClusterIndex
+from core.fanout import FanOut
+from core.near_dup import NearDupIndex
+from core.models import NewsItem
+from core.scheduler import PollScheduler
+from core.scoring import score, topic
+from core.ticker_extraction import pick_ticker, rank_tickers, scan_tickers
 from core.validation import validate_market_impact
 from core.stock_filter import is_stock_market_related
+from core.text_prep import prepare
 
 from market_data.yfinance_provider import YFinanceProvider
 from market_data.market_data_manager import MarketDataManager, ProviderType
 from storage.sqlite_store import SQLiteStore
+from storage.feed_state import get_feed_state
 
 from notifier.console import ConsoleNotifier
 from notifier.telegram import TelegramNotifier
@@ -30,6 +35,10 @@ from notifier.telegram import TelegramNotifier
 
 logger = logging.getLogger("market_radar")
 
+def _collector_batches(key: str, collector) -> Iterator[Tuple[str, List[NewsItem]]]:
+    yield key, collector.fetch()
+
+
 def build_notifier():
     console = ConsoleNotifier()
     notifiers = [console]
@@ -63,6 +72,11 @@ def main():
     logger.info(f"Date filtering: {'TODAY ONLY' if settings.only_today_news else 'ALL DATES'}")
     logger.info(f"Today's date (Israel): {get_today('Asia/Jerusalem')}")
 
+    if settings.http_replay_file:
+        get_http_client().enable_replay(settings.http_replay_file, speed=settings.http_replay_speed)
+    elif settings.http_capture_file:
+        get_http_client().enable_capture(settings.http_capture_file)
+
     NO_TICKER_NOTIFY_SCORE = settings.no_ticker_notify_score
 
     store = SQLiteStore("market_radar.db")
@@ -115,7 +129,7 @@ def main():
         ticker_filter = get_ticker_filter()
         stats_filter = ticker_filter.get_stats()
         logger.info(f"🎯 Ticker filter enabled: {stats_filter['total_tickers']} tickers (NASDAQ + S&P 500)")
-        logger.info(f"   Cache age: {stats_filter['cache_age_hours']:.1f}h, Valid: {stats_filter['cache_valid']}")
+        logger.info(f"   Source: {stats_filter['source']}, age: {stats_filter['cache_age_hours']:.1f}h, Valid: {stats_filter['cache_valid']}")
     else:
         logger.info("🎯 Ticker filter disabled - all tickers allowed")
     
@@ -138,100 +152,107 @@ def main():
     else:
         logger.info("📊 Trading Signals disabled")
 
-    # 1) News RSS Sources (verified working - tested 2025-12-29)
-    rss_sources = [
-        # Wire Services (HIGH PRIORITY - Press releases from companies)
-        ("PR Newswire", "https://www.prnewswire.com/rss/news-releases-list.rss"),  # 20 items
-        ("GlobeNewswire", "https://www.globenewswire.com/RssFeed/orgclass/1/feedTitle/GlobeNewswire%20-%20News%20Release"),  # NEW! Company announcements
-        ("Business Wire", "https://feed.businesswire.com/rss/home/?rss=G1QFDERJXkJeGVtUWA=="),  # NEW! Company announcements
-        
-        # Financial News (high volume, good quality)
-        ("Yahoo Finance", "https://finance.yahoo.com/news/rssindex"),  # 50 items
-        ("MarketWatch Top", "https://feeds.marketwatch.com/marketwatch/topstories/"),  # 10 items
-        ("MarketWatch Breaking", "https://feeds.marketwatch.com/marketwatch/marketpulse/"),  # 30 items
-        ("CNBC Top News", "https://www.cnbc.com/id/100003114/device/rss/rss.html"),  # 30 items
-        ("CNBC Investing", "https://www.cnbc.com/id/15839135/device/rss/rss.html"),  # 30 items
-        
-        # Investment Analysis
-        ("Seeking Alpha Market", "https://seekingalpha.com/market_currents.xml"),  # 7 items
-        ("Seeking Alpha Articles", "https://seekingalpha.com/feed.xml"),  # 30 items
-        
-        # Tech & Startups (for tech stock news)
-        ("TechCrunch", "https://techcrunch.com/feed/"),  # 20 items
-        ("VentureBeat", "https://venturebeat.com/feed/"),  # 7 items
-        ("The Verge", "https://www.theverge.com/rss/index.xml"),  # 10 items
-        
-        # Crypto/Fintech (optional - comment out if not needed)
-        ("CoinDesk", "https://www.coindesk.com/arc/outboundfeeds/rss/"),  # 25 items
-        ("Decrypt", "https://decrypt.co/feed"),  # 52 items
-    ]
-    wire_collector = RSSCollector(rss_sources)
-
-    # 2) SEC RSS (material filings)
-    # Options:
-    # - SECFilteredCollector() = Only 8-K/S-4 (high-impact events) [RECOMMENDED]
-    # - SECRSSCollector() = All filings (100 items, lots of noise)
-    if settings.enable_sec_filtered:
-        sec_collector = SECFilteredCollector()
-        logger.info("🏛️  SEC Filtered collector enabled (8-K, S-4 + clinical trials)")
-    elif settings.enable_sec_legacy:
-        sec_collector = SECRSSCollector()
-        logger.info("🏛️  SEC Legacy collector enabled (all forms)")
-    else:
-        sec_collector = None
-        logger.info("🏛️  SEC collector disabled")
-    
-    # 3) Alpha Vantage News API (premium news with sentiment)
-    alpha_vantage_collector = None
-    if settings.enable_alpha_vantage and settings.alpha_vantage_api_key:
-        logger.info("Alpha Vantage API enabled")
-        alpha_vantage_collector = AlphaVantageCollector(
-            api_key=settings.alpha_vantage_api_key,
-            topics="technology,earnings,ipo,mergers_and_acquisitions",
-            limit=50,
-        )
-        logger.info(f"Alpha Vantage config: {alpha_vantage_collector.get_usage_info()}")
-    
-    # 4) TheNewsAPI (global news coverage)
-    thenewsapi_collector = None
-    if settings.enable_thenewsapi and settings.thenewsapi_token:
-        logger.info("TheNewsAPI enabled")
-        thenewsapi_collector = TheNewsAPICollector(
-            api_token=settings.thenewsapi_token,
-            categories="business,tech",
-            limit=50,
-        )
-        logger.info(f"TheNewsAPI config: {thenewsapi_collector.get_usage_info()}")
-    
-    # 5) NewsAPI.ai (advanced analytics)
-    newsapi_ai_collector = None
-    if settings.enable_newsapi_ai and settings.newsapi_ai_key:
-        logger.info("NewsAPI.ai enabled")
-        newsapi_ai_collector = NewsAPIaiCollector(
-            api_key=settings.newsapi_ai_key,
-            category_uri="news/Business",
-            limit=50,
+    # Sources: RSS feeds from the sources file, SEC / premium APIs from the
+    # registry (each imported only when enabled)
+    registry = load_registry(settings.sources_file)
+    wire_collector = registry.build_rss(
+        concurrent=settings.rss_concurrent,
+        max_workers=settings.rss_max_workers,
+        max_per_host=settings.rss_max_per_host,
+        fast_parse=settings.fast_feed_parser,
+        summary_limit=settings.summary_max_chars,
+    )
+    rss_names = [f.name for f in registry.enabled_feeds()]
+    collectors = registry.build(settings)
+    # Watermarks / validators advance only once a batch went through the
+    # pipeline below (arrivals() acks it), not when it was fetched
+    for collector in [wire_collector, *collectors.values()]:
+        if collector is not None and hasattr(collector, "auto_ack"):
+            collector.auto_ack = False
+    feed_state = get_feed_state()
+
+    # Per-source scheduler: every source gets its own next-due time,
+    # adapted to how often it actually publishes
+    scheduler = PollScheduler(
+        default_interval=settings.poll_seconds,
+        min_interval=settings.sched_min_seconds,
+        max_interval=settings.sched_max_seconds,
+        priority_max_interval=settings.sched_priority_max_seconds,
+    )
+    registry.schedule(scheduler)
+
+    # Hosts to pre-connect before a poll (DNS + TLS off the critical path)
+    http = get_http_client()
+    warm_up_urls = registry.warm_up_urls()
+
+    budgeted_collectors = {key: c for key, c in collectors.items() if getattr(c, "budget", None)}
+
+    near_dups = None
+    if settings.enable_near_dup:
+        near_dups = NearDupIndex(
+            max_distance=settings.near_dup_max_distance,
+            window=settings.near_dup_window_hours * 3600,
         )
-        logger.info(f"NewsAPI.ai config: {newsapi_ai_collector.get_usage_info()}")
-    
+
+    # Articles about the same ticker + topic are one event: validated,
+    # evaluated and alerted once, the alert updated as more sources join
+    clusters = None
+    if settings.enable_event_clustering:
+        clusters = EventClusterIndex(window=settings.event_cluster_window_minutes * 60)
+        restored = clusters.load(store.load_clusters(since=time.time() - clusters.window))
+        if restored:
+            logger.info(f"🧷 Restored {restored} open event clusters")
+
+    def join_cluster(cluster, item: NewsItem) -> None:
+        clusters.join(cluster, item)
+        item.cluster_id = cluster.cluster_id
+        if cluster.validated:  # the lead was alerted: update that alert
+            for n in notifiers:
+                if not hasattr(n, "update_cluster"):
+                    continue
+                ref = cluster.messages.get(type(n).__name__)
+                if ref:
+                    n.update_cluster(cluster, ref)
+                else:
+                    # the lead's alert never went out here (send failed): alert now instead of editing nothing
+                    ref = n.notify(item)
+                    if ref:
+                        cluster.messages[type(n).__name__] = ref
+        store.save_cluster(cluster)
+
+    # Collectors run in parallel, each with its own per-poll deadline
+    fanout = FanOut(max_workers=len(collectors) + 1)
+    deadline = settings.collector_deadline_seconds
+
     poll_count = 0
     max_iterations = int(os.getenv("MAX_ITERATIONS", "0"))  # 0 = infinite
 
     while True:
         try:
-            poll_count += 1
-            
-            # Check if we should exit after this iteration (for scheduled tasks)
-            if max_iterations > 0 and poll_count > max_iterations:
+            # Check if we should exit before this iteration (for scheduled tasks)
+            if max_iterations > 0 and poll_count >= max_iterations:
                 logger.info(f"✅ Reached max iterations ({max_iterations}), exiting...")
                 break
+
+            # Sleep until the next source is due
+            wait = scheduler.seconds_until_next()
+            if wait > 0:
+                time.sleep(wait)
+            due = set(scheduler.due())
+            if settings.http_warm_up:
+                http.warm_up(url for name in due for url in warm_up_urls.get(name, []))
+
+            poll_count += 1
             logger.info(f"{'='*80}")
-            logger.info(f"Poll #{poll_count} - Fetching news...")
+            logger.info(f"Poll #{poll_count} - Fetching news from {len(due)} due sources...")
             
             # Statistics for this poll
             stats = {
                 "fetched": 0,
                 "duplicates": 0,
+                "near_duplicates": 0,
+                "collapsed": 0,
+                "clustered": 0,
                 "new": 0,
                 "not_stock_related": 0,  # NEW!
                 "no_ticker": 0,
@@ -242,26 +263,40 @@ def main():
                 "notified": 0,
             }
             
-            items = []
-            items.extend(wire_collector.fetch())
-            if sec_collector:
-                items.extend(sec_collector.fetch())
-            
-            # Premium APIs (if enabled)
-            if alpha_vantage_collector:
-                items.extend(alpha_vantage_collector.fetch())
-            
-            if thenewsapi_collector:
-                items.extend(thenewsapi_collector.fetch())
-            
-            if newsapi_ai_collector:
-                items.extend(newsapi_ai_collector.fetch())
-            
-            stats["fetched"] = len(items)
-            logger.info(f"📥 Fetched {len(items)} total items from all sources")
+            # All due collectors start at once and stream (source, items) batches
+            # - one per RSS feed - into the pipeline below as each source
+            # responds. Task key -> schedule keys it covers (RSS is one task).
+            tasks = {}
+            task_sources = {}
+            rss_due = [name for name in rss_names if name in due]
+            if wire_collector and rss_due:
+                tasks["RSS"] = (partial(wire_collector.iter_fetch, rss_due), registry.deadline("RSS", deadline))
+                task_sources["RSS"] = rss_due
+            for key, collector in collectors.items():
+                if key in due:
+                    tasks[key] = (partial(_collector_batches, key, collector), registry.deadline(key, deadline))
+                    task_sources[key] = [key]
+
+            # new items per source feed the scheduler's rate estimate
+            new_by_source: Dict[str, int] = {}
+
+            def arrivals():
+                for task, (key, items) in fanout.run(tasks):
+                    stats["fetched"] += len(items)
+                    new_by_source.setdefault(key, 0)
+                    if settings.verbose_logging and items:
+                        logger.debug(f"📥 {key}: {len(items)} items")
+                    for it in items:
+                        yield key, it
+                    # every item was handled (or the generator was closed by an error: no ack)
+                    if hasattr(items, "ack"):
+                        items.ack()
 
-            for item in items:
-                item.uid = make_uid(item.title, item.link, item.published)
+            for source_key, item in arrivals():
+                # canonical id: tracking params / AMP links / republished timestamps collapse
+                collapsed_before = store.identity.collapsed
+                item.uid = store.resolve_uid(item)
+                stats["collapsed"] += store.identity.collapsed - collapsed_before
                 
                 if store.exists(item.uid):
                     stats["duplicates"] += 1
@@ -277,18 +312,41 @@ def main():
                             logger.debug(f"📅 SKIP (old news, {age_days} days): {item.title[:60]}...")
                         continue
                 
+                # Syndicated copy of an event we already have (other source / link):
+                # attach it to that event instead of scoring / alerting again
+                if near_dups is not None:
+                    original = near_dups.observe(item.uid, item.source, item.title, item.summary)
+                    if original is not None:
+                        stats["near_duplicates"] += 1
+                        new_by_source[source_key] += 1
+                        item.duplicate_of = original.uid
+                        item.validation_reason = f"near-duplicate of {original.source}"
+                        cluster = clusters.cluster_of(original.uid) if clusters is not None else None
+                        if cluster is not None:
+                            join_cluster(cluster, item)
+                        store.save(item)
+                        if settings.verbose_logging:
+                            logger.debug(f"🔁 SKIP (copy of {original.source}): {item.title[:60]}...")
+                        continue
+
                 stats["new"] += 1
+                new_by_source[source_key] += 1
+                text = prepare(item)  # title + summary forms shared by the analyzers below
 
                 # 0.5) Stock Market Relevance Check (NEW!)
-                is_relevant, relevance_reason = is_stock_market_related(item.title, item.summary)
+                is_relevant, relevance_reason = is_stock_market_related(item.title, item.summary, prepared=text)
                 if not is_relevant:
                     stats["not_stock_related"] += 1
                     if settings.verbose_logging:
                         logger.debug(f"🚫 NOT STOCK-RELATED: {item.title[:60]}... | Reason: {relevance_reason}")
                     continue  # Skip this article
 
-                # 1) Ticker Extraction
-                item.ticker = extract_ticker(item.title, item.summary)
+                # 1) Ticker Extraction: one scan, primary ticker + every ticker mentioned
+                candidates = scan_tickers(item.title, item.summary, prepared=text)
+                item.ticker = pick_ticker(candidates)
+                tickers = [t for t, _ in rank_tickers(candidates, title_len=len(item.title))]
+                if len(tickers) > 1:
+                    item.raw["tickers"] = tickers  # multi-company article, most relevant first
                 
                 # 1.5) Ticker Filtering (NASDAQ & S&P 500 only) - reduces noise
                 if ticker_filter and item.ticker:
@@ -302,7 +360,7 @@ def main():
                     logger.debug(f"⚠️  No ticker found: {item.title[:60]}...")
 
                 # 2) Impact Scoring
-                item.impact_score, item.impact_reason = score(item.source, item.title, item.summary)
+                item.impact_score, item.impact_reason = score(item.source, item.title, item.summary, prepared=text)
 
                 # ✅ NEW: High impact but no ticker → still notify (optional)
                 if not item.ticker:
@@ -344,6 +402,36 @@ def main():
                         f"✅ HIGH SCORE ({item.impact_score}): "
                         f"{item.ticker or 'N/A'} - {item.title[:50]}... | Reason: {item.impact_reason}"
                     )
+
+                # 2.5) Event clustering: another article about an alerted event joins
+                # it and inherits its validation - no new validation / signal / alert.
+                # An event that wasn't validated (yet) is re-validated with each
+                # article that joins it: the move may have started since the lead.
+                cluster = None
+                if clusters is not None:
+                    event_topic = topic(item.title, item.summary, prepared=text)
+                    cluster = clusters.find(item.ticker, event_topic)
+                    if cluster is not None:
+                        stats["clustered"] += 1
+                        if settings.verbose_logging:
+                            logger.debug(
+                                f"🧷 JOINED EVENT ({cluster.ticker}/{cluster.topic}, {cluster.size + 1} articles): "
+                                f"{item.title[:50]}..."
+                            )
+                    if cluster is not None and cluster.validated:
+                        item.validated = True
+                        item.validation_reason = (
+                            f"joined event {cluster.ticker}/{cluster.topic}: {cluster.validation_reason}"
+                        )
+                        join_cluster(cluster, item)
+                        store.save(item)
+                        continue
+                    if cluster is not None:
+                        join_cluster(cluster, item)
+                    else:
+                        cluster = clusters.open(item, event_topic)
+                        item.cluster_id = cluster.cluster_id
+
                 # 3) Market Validation (gap/volume) - optional
                 if settings.enable_market_validation and item.ticker:
                     try:
@@ -368,6 +456,10 @@ def main():
 
                 # Save always
                 store.save(item)
+                if cluster is not None:
+                    cluster.validated = item.validated
+                    cluster.validation_reason = item.validation_reason
+                    store.save_cluster(cluster)
 
                 if not item.validated:
                     stats["not_validated"] += 1
@@ -387,7 +479,11 @@ def main():
                 if item.validated:
                     stats["notified"] += 1
                     for n in notifiers:
-                        n.notify(item)
+                        ref = n.notify(item)
+                        if cluster is not None and ref:
+                            cluster.messages[type(n).__name__] = ref  # edited as articles join
+                    if cluster is not None and cluster.messages:
+                        store.save_cluster(cluster)
                     
                     # 5) Generate Trading Signal (NEW - optional, doesn't affect existing flow)
                     if signals_integration and signals_integration.enabled:
@@ -413,9 +509,31 @@ def main():
                         except Exception as e:
                             logger.error(f"Error generating/sending signal: {e}", exc_info=True)
             
+            feed_state.save()
+
+            logger.info(f"📥 Fetched {stats['fetched']} total items from {len(new_by_source)} sources")
+            for key, new_count in new_by_source.items():
+                scheduler.record(key, new_count)
+
+            # Missed the deadline / still running: retry soon instead of spinning
+            for task in fanout.last_missed + fanout.last_busy:
+                for key in task_sources.get(task, []):
+                    scheduler.defer(key, settings.sched_min_seconds)
+
+            # Daily-quota APIs: don't wake up before the budget allows the next call
+            for key, collector in budgeted_collectors.items():
+                if key in new_by_source:
+                    scheduler.defer(key, collector.budget.seconds_until_next_call())
+
             # Print poll summary
             logger.info(f"📊 Poll #{poll_count} Summary:")
             logger.info(f"   Fetched: {stats['fetched']} | New: {stats['new']} | Duplicates: {stats['duplicates']}")
+            if stats['near_duplicates'] > 0:
+                logger.info(f"   🔁 Syndicated copies: {stats['near_duplicates']}")
+            if stats['collapsed'] > 0:
+                logger.info(f"   🔗 URL/guid variants collapsed: {stats['collapsed']}")
+            if stats['clustered'] > 0:
+                logger.info(f"   🧷 Joined open events: {stats['clustered']}")
             if stats['not_stock_related'] > 0:
                 logger.info(f"   🚫 Not Stock-Related: {stats['not_stock_related']}")
             if stats['no_ticker'] > 0:
@@ -423,9 +541,21 @@ def main():
             logger.info(f"   Low Score: {stats['low_score']} | High Score: {stats['high_score']}")
             logger.info(f"   Not Validated: {stats['not_validated']} | Validated: {stats['validated']}")
             logger.info(f"   🔔 Notified: {stats['notified']}")
-            logger.info(f"Next poll in {settings.poll_seconds} seconds...")
-
-            time.sleep(settings.poll_seconds)
+            if fanout.last_missed or fanout.last_busy:
+                logger.info(f"   ⏱️  Past deadline: {', '.join(fanout.last_missed + fanout.last_busy)}")
+            open_circuits = get_breakers().open_circuits()
+            if open_circuits:
+                logger.info(f"   ⚡ Circuit open: {', '.join(sorted(open_circuits))}")
+            retry_budget = get_retry_budget().snapshot()
+            if retry_budget["denied"]:
+                logger.info(f"   ⚡ Retries denied by budget: {retry_budget['denied']}")
+            if settings.verbose_logging:
+                logger.debug(f"   HTTP per host: {http.get_stats()}")
+                logger.debug(f"   Dedup index: {store.get_dedup_stats()}")
+                logger.debug(f"   Identity index: {store.get_identity_stats()}")
+                if clusters is not None:
+                    logger.debug(f"   Event clusters: {clusters.get_stats()}")
+            logger.info(f"Next poll in {scheduler.seconds_until_next():.0f} seconds...")
 
         except KeyboardInterrupt:
             logger.info("Stopped by user.")
@@ -434,5 +564,7 @@ def main():
             logger.exception(f"Loop error: {e}")
             time.sleep(settings.poll_seconds)
 
+    fanout.shutdown()
+
 if __name__ == "__main__":
     main()
@@ -8,11 +8,21 @@ API Docs: https://www.alphavantage.co/documentation/#news-sentiment
 """
 
 from __future__ import annotations
-from typing import List
+from typing import List, Optional
 import logging
 import requests
 from datetime import datetime, timedelta, timezone
+from collectors.ingest import DEFAULT_SUMMARY_LIMIT, normalize_item
+from collectors.watermark import Batch, Watermark
 from core.models import NewsItem
+from core.quota_budget import QuotaBudget
+from storage.feed_state import FeedStateStore, get_feed_state
+from utils.circuit_breaker import get_breakers
+from utils.date_utils import parse_datetime_utc
+from utils.http_client import get_http_client
+
+# Re-request a few minutes before the cursor: articles are sometimes indexed late
+CURSOR_OVERLAP = timedelta(minutes=5)
 
 logger = logging.getLogger("market_radar.alpha_vantage")
 
@@ -28,8 +38,7 @@ class AlphaVantageCollector:
     - Multiple sources aggregated
     
     Rate Limits (free tier):
-    - 25 requests per day
-    - Consider caching results
+    - 25 requests per day, spread over the day by a QuotaBudget
     """
     
     BASE_URL = "https://www.alphavantage.co/query"
@@ -40,6 +49,9 @@ class AlphaVantageCollector:
         topics: str = "technology,earnings,ipo,mergers_and_acquisitions",
         limit: int = 50,
         time_from: str = None,
+        budget: Optional[QuotaBudget] = None,
+        state_store: Optional[FeedStateStore] = None,
+        summary_limit: int = DEFAULT_SUMMARY_LIMIT,
     ):
         """
         Initialize Alpha Vantage collector
@@ -53,13 +65,23 @@ class AlphaVantageCollector:
                            life_sciences, manufacturing, real_estate,
                            retail_wholesale, technology
             limit: Number of news items to fetch (max 1000)
-            time_from: Start time in YYYYMMDDTHHMM format (optional)
+            time_from: Start time in YYYYMMDDTHHMM format, used until a
+                       cursor exists (optional)
+            budget: Daily request budget (default: 25 requests/day)
+            state_store: Persistent state (cursor, budget usage)
+            summary_limit: Max summary characters kept for analysis (collectors.ingest)
         """
         self.api_key = api_key
         self.topics = topics
         self.limit = limit
         self.time_from = time_from
         self._last_fetch_time = None
+        self.http = get_http_client()
+        self.state_store = state_store or get_feed_state()
+        # False: the caller acks the returned batch after processing (watermark.Batch)
+        self.auto_ack = True
+        self.summary_limit = summary_limit
+        self.budget = budget or QuotaBudget("Alpha Vantage", daily_limit=25, state_store=self.state_store)
     
     def fetch(self) -> List[NewsItem]:
         """
@@ -72,6 +94,15 @@ class AlphaVantageCollector:
             logger.warning("Alpha Vantage API key not configured")
             return []
         
+        if not self.budget.can_call():
+            logger.debug(f"Alpha Vantage: daily budget paced, next call at {self.budget.next_call_time():%H:%M %Z}")
+            return []
+        
+        breaker = get_breakers().get("Alpha Vantage")
+        if not breaker.allow():
+            logger.debug(f"Alpha Vantage: circuit open, skipped (retry in {breaker.retry_in():.0f}s)")
+            return []
+        
         try:
             params = {
                 "function": "NEWS_SENTIMENT",
@@ -81,12 +112,18 @@ class AlphaVantageCollector:
                 "sort": "LATEST",  # Most recent first
             }
             
-            if self.time_from:
+            # Incremental cursor: only ask for news since the newest article we returned
+            wm = Watermark(self.state_store.get("api:Alpha Vantage"))
+            since = wm.since(CURSOR_OVERLAP)
+            if since:
+                params["time_from"] = since.strftime("%Y%m%dT%H%M")
+            elif self.time_from:
                 params["time_from"] = self.time_from
             
             logger.debug(f"Fetching from Alpha Vantage: topics={self.topics}, limit={self.limit}")
             
-            response = requests.get(
+            self.budget.record()
+            response = self.http.get(
                 self.BASE_URL,
                 params=params,
                 timeout=30,
@@ -94,38 +131,53 @@ class AlphaVantageCollector:
             response.raise_for_status()
             
             data = response.json()
+            breaker.record_success()
             
             # Check for API errors
             if "Error Message" in data:
                 logger.error(f"Alpha Vantage API error: {data['Error Message']}")
                 return []
             
-            if "Note" in data:
-                logger.warning(f"Alpha Vantage rate limit: {data['Note']}")
+            if "Note" in data or "Information" in data:
+                logger.warning(f"Alpha Vantage rate limit: {data.get('Note') or data.get('Information')}")
+                self.budget.exhaust()
                 return []
             
             # Parse news feed
             feed = data.get("feed", [])
-            items = []
+            items = Batch()
             
             for article in feed:
                 try:
                     item = self._parse_article(article)
-                    if item:
-                        items.append(item)
+                    if not item:
+                        continue
+                    # cursor is minute-precision and overlaps: drop what we already returned
+                    published_dt = parse_datetime_utc(item.published)
+                    if wm.seen(item.link):
+                        continue
+                    wm.add(item.link, published_dt)
+                    items.append(item)
                 except Exception as e:
                     logger.warning(f"Failed to parse article: {e}")
                     continue
             
-            logger.info(f"📰 Alpha Vantage: fetched {len(items)} news items")
+            items.defer(wm.commit)
+            if self.auto_ack:
+                items.ack()
+            self.state_store.save()
+            
+            logger.info(f"📰 Alpha Vantage: fetched {len(items)} news items ({len(feed) - len(items)} already seen)")
             self._last_fetch_time = datetime.now()
             
             return items
             
         except requests.exceptions.RequestException as e:
+            breaker.record_failure()
             logger.error(f"Alpha Vantage API request failed: {e}")
             return []
         except Exception as e:
+            breaker.record_failure()
             logger.error(f"Alpha Vantage collector error: {e}", exc_info=True)
             return []
     
@@ -181,7 +233,7 @@ class AlphaVantageCollector:
             summary = f"[Sentiment: {sentiment_label}] {summary}"
         
         # Create NewsItem
-        item = NewsItem(
+        item = normalize_item(NewsItem(
             source="Alpha Vantage",
             title=article.get("title", ""),
             link=article.get("url", ""),
@@ -197,7 +249,7 @@ class AlphaVantageCollector:
                     "source_domain": article.get("source_domain", ""),
                 }
             }
-        )
+        ), self.summary_limit)
         
         return item
     
@@ -214,6 +266,7 @@ class AlphaVantageCollector:
             "rate_limit": "25 requests/day (free tier)",
             "topics": self.topics,
             "limit_per_request": self.limit,
+            **self.budget.get_usage_info(),
         }
 
 
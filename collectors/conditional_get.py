@@ -0,0 +1,118 @@
+"""
+Conditional GET for feed polling
+================================
+Sends ETag / Last-Modified validators stored per feed, so unchanged feeds
+come back as 304 and are never parsed. When a server sends no validators
+(or ignores them), the body hash is compared with the previous poll and an
+identical body is skipped as well.
+
+With defer=True the new validators and body hash are staged on the result
+instead of written to the state; the caller applies them with
+result.commit(state) once the body was processed, so a body that failed to
+parse (or a later page that failed) is fetched and parsed again next poll.
+
+State lives in a plain dict per feed (see storage.feed_state):
+    etag, last_modified, body_hash, last_size,
+    fetched, not_modified, hash_hits, bytes_saved
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class FetchResult:
+    status: int
+    content: Optional[bytes]  # None when the feed did not change
+    unchanged_reason: str = ""  # "304" / "hash" / ""
+    validators: Dict[str, Optional[str]] = field(default_factory=dict)  # staged (defer=True)
+
+    @property
+    def unchanged(self) -> bool:
+        return self.content is None
+
+    def commit(self, state: Dict[str, Any]) -> None:
+        """Write the staged validators / body hash into the feed state."""
+        _apply(state, self.validators)
+        self.validators = {}
+
+
+def _bump(state: Dict[str, Any], key: str, n: int = 1) -> None:
+    state[key] = int(state.get(key, 0)) + n
+
+
+def _apply(state: Dict[str, Any], validators: Dict[str, Optional[str]]) -> None:
+    for key, value in validators.items():
+        if value:
+            state[key] = value
+        else:
+            state.pop(key, None)
+
+
+def conditional_get(
+    session: Any,
+    url: str,
+    headers: Dict[str, str],
+    state: Dict[str, Any],
+    timeout: float = 25,
+    defer: bool = False,
+) -> FetchResult:
+    """
+    GET a feed using the validators stored in `state`, updating it in place.
+
+    With defer=True a changed body's validators and hash are left on the
+    result for the caller to commit(); counters are always updated.
+
+    Raises RuntimeError on HTTP errors (>= 400).
+    """
+    req_headers = dict(headers)
+    if state.get("etag"):
+        req_headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        req_headers["If-Modified-Since"] = state["last_modified"]
+
+    resp = session.get(url, headers=req_headers, timeout=timeout)
+
+    if resp.status_code == 304:
+        _bump(state, "not_modified")
+        _bump(state, "bytes_saved", int(state.get("last_size", 0)))
+        return FetchResult(status=304, content=None, unchanged_reason="304")
+
+    if resp.status_code >= 400:
+        raise RuntimeError(f"HTTP {resp.status_code}")
+
+    resp_headers = getattr(resp, "headers", {}) or {}
+    validators = {
+        "etag": resp_headers.get("ETag"),
+        "last_modified": resp_headers.get("Last-Modified"),
+    }
+
+    content = resp.content or b""
+    _bump(state, "fetched")
+    state["last_size"] = len(content)
+
+    digest = hashlib.sha1(content).hexdigest()
+    if state.get("body_hash") == digest:
+        # same body as the last processed one: safe to keep its validators
+        _apply(state, validators)
+        _bump(state, "hash_hits")
+        return FetchResult(status=resp.status_code, content=None, unchanged_reason="hash")
+
+    validators["body_hash"] = digest
+    result = FetchResult(status=resp.status_code, content=content, validators=validators)
+    if not defer:
+        result.commit(state)
+    return result
+
+
+def cache_counters(state: Dict[str, Any]) -> Dict[str, int]:
+    """Counters for a single feed (for logs / stats)."""
+    return {
+        "fetched": int(state.get("fetched", 0)),
+        "not_modified": int(state.get("not_modified", 0)),
+        "hash_hits": int(state.get("hash_hits", 0)),
+        "bytes_saved": int(state.get("bytes_saved", 0)),
+    }
@@ -0,0 +1,158 @@
+"""
+Feed Entry Parser
+=================
+Streaming fast path for well-formed RSS 2.0 / RSS 1.0 / Atom feeds built on
+lxml.etree.iterparse, with automatic fallback to feedparser.
+
+We only need title, link, guid, published/updated and summary, so the fast
+path skips feedparser's HTML sanitizing, date normalization and dict tree.
+Entries are yielded one by one, so a caller that stops at its high-water
+mark never parses the rest of the document.
+
+If the fast path fails (malformed XML, undefined HTML entities, unknown
+format) iter_entries() falls back to feedparser and continues after the
+entries it already yielded. Callers remember the failure per feed and stop
+trying the fast path for that feed.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Any, Callable, Iterator, Optional
+
+import feedparser
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional - feedparser alone still works
+    etree = None
+
+logger = logging.getLogger("market_radar.feed_parser")
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+RSS1 = "{http://purl.org/rss/1.0/}"
+DC_DATE = "{http://purl.org/dc/elements/1.1/}date"
+CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded"
+
+_ENTRY_TAGS = ("item", ATOM + "entry", RSS1 + "item")
+
+
+@dataclass
+class FeedEntry:
+    title: str = ""
+    link: str = ""
+    guid: str = ""
+    published: str = ""
+    updated: str = ""
+    summary: str = ""
+
+
+def _text(el: Any, tag: str) -> str:
+    child = el.find(tag)
+    if child is None:
+        return ""
+    return "".join(child.itertext()).strip()
+
+
+def _rss_entry(el: Any, ns: str = "") -> FeedEntry:
+    guid = _text(el, ns + "guid") or el.get("{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about", "")
+    return FeedEntry(
+        title=_text(el, ns + "title"),
+        link=_text(el, ns + "link"),
+        guid=guid,
+        published=_text(el, ns + "pubDate") or _text(el, DC_DATE),
+        summary=_text(el, ns + "description") or _text(el, CONTENT_ENCODED),
+    )
+
+
+def _atom_entry(el: Any) -> FeedEntry:
+    link = ""
+    for l in el.iterfind(ATOM + "link"):
+        if l.get("rel", "alternate") == "alternate":
+            link = l.get("href", "")
+            break
+    return FeedEntry(
+        title=_text(el, ATOM + "title"),
+        link=link.strip(),
+        guid=_text(el, ATOM + "id"),
+        published=_text(el, ATOM + "published"),
+        updated=_text(el, ATOM + "updated"),
+        summary=_text(el, ATOM + "summary") or _text(el, ATOM + "content"),
+    )
+
+
+def iter_entries_fast(content: bytes) -> Iterator[FeedEntry]:
+    """Stream entries with lxml.iterparse. Raises on malformed documents."""
+    if etree is None:
+        raise RuntimeError("lxml not installed")
+
+    context = etree.iterparse(
+        BytesIO(content),
+        events=("end",),
+        tag=_ENTRY_TAGS,
+        resolve_entities=False,
+        no_network=True,
+        recover=False,
+    )
+    for _event, el in context:
+        if el.tag == ATOM + "entry":
+            entry = _atom_entry(el)
+        elif el.tag == RSS1 + "item":
+            entry = _rss_entry(el, RSS1)
+        else:
+            entry = _rss_entry(el)
+
+        # free memory as we go
+        el.clear()
+        parent = el.getparent()
+        if parent is not None:
+            while el.getprevious() is not None:
+                del parent[0]
+
+        yield entry
+
+
+def _from_feedparser(e: Any) -> FeedEntry:
+    return FeedEntry(
+        title=(e.get("title", "") or "").strip(),
+        link=(e.get("link", "") or "").strip(),
+        guid=(e.get("id", "") or "").strip(),
+        published=e.get("published", "") or "",
+        # dict.get: skip feedparser's deprecated updated -> published alias
+        updated=dict.get(e, "updated", "") or "",
+        summary=e.get("summary", "") or e.get("description", "") or "",
+    )
+
+
+def iter_entries(
+    content: bytes,
+    fast: bool = True,
+    on_fallback: Optional[Callable[[Exception], None]] = None,
+) -> Iterator[FeedEntry]:
+    """
+    Yield FeedEntry objects in document order.
+
+    Args:
+        content: Raw feed body
+        fast: Try the lxml fast path first
+        on_fallback: Called with the error when the fast path fails
+    """
+    yielded = 0
+    if fast and etree is not None:
+        try:
+            for entry in iter_entries_fast(content):
+                yielded += 1
+                yield entry
+            if yielded:
+                return
+            # well-formed but nothing recognised - let feedparser have a look
+        except Exception as e:
+            if on_fallback:
+                on_fallback(e)
+            logger.debug(f"Fast feed parse failed after {yielded} entries: {e}")
+
+    d = feedparser.parse(content)
+    for e in (getattr(d, "entries", []) or [])[yielded:]:
+        yield _from_feedparser(e)
@@ -0,0 +1,75 @@
+"""
+Ingest-Time Text Normalization
+==============================
+RSS summaries (Yahoo, CNBC, Seeking Alpha, content:encoded bodies) arrive
+as HTML and the premium APIs return long article bodies. Every collector
+passes its items through normalize_item() before returning them, so
+everything downstream works on bounded plain text:
+
+- markup removed (tags, comments, script / style blocks), entities
+  decoded, whitespace collapsed - tag and attribute text can't produce
+  keyword or ticker matches
+- the summary capped at `summary_limit` characters (at a word boundary),
+  which bounds the regex / automaton work and the derived text forms per
+  item; the raw input is cut before stripping, so a huge body costs no
+  more than a long one
+- the original markup is not kept: items are stored and alerted as plain
+  text, and a copy of an uncapped body would undo the cap
+
+The limit is per source: SUMMARY_MAX_CHARS by default, "summary_limit" on
+a feed or under "collectors" in the sources file (see collectors/registry.py).
+"""
+
+from __future__ import annotations
+
+import html
+import re
+
+from core.models import NewsItem
+
+DEFAULT_SUMMARY_LIMIT = 1000
+
+# Markup is cut to this many times the limit before stripping
+_RAW_FACTOR = 8
+
+_MARKUP_RE = re.compile(
+    r"<!--.*?-->"
+    r"|<(script|style)\b.*?</\1\s*>"  # the block with its content
+    r"|</?[A-Za-z][^<>]*>",  # a tag; "a < b" in text isn't one
+    re.S | re.I,
+)
+_CUT_TAG_RE = re.compile(r"<[^<>]*$")  # a tag the raw cut went through
+_SPACE_RE = re.compile(r"\s+")
+
+
+def strip_html(text: str) -> str:
+    """Plain text: markup removed, entities decoded, whitespace collapsed."""
+    if not text:
+        return ""
+    if "<" in text:
+        text = _MARKUP_RE.sub(" ", text)
+    if "&" in text:
+        text = html.unescape(text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def bound(text: str, limit: int) -> str:
+    """`text` cut to at most `limit` characters at a word boundary ("…" marks the cut); 0 = no limit."""
+    if limit <= 0 or len(text) <= limit:
+        return text
+    cut = text[:limit - 1]
+    space = cut.rfind(" ")
+    if space > limit * 0.8:
+        cut = cut[:space]
+    return cut.rstrip() + "…"
+
+
+def normalize_item(item: NewsItem, summary_limit: int = DEFAULT_SUMMARY_LIMIT) -> NewsItem:
+    """Strip markup from the title and summary and cap the summary (in place)."""
+    item.title = strip_html(item.title)
+
+    raw = item.summary or ""
+    if summary_limit > 0 and len(raw) > summary_limit * _RAW_FACTOR:
+        raw = _CUT_TAG_RE.sub("", raw[:summary_limit * _RAW_FACTOR])
+    item.summary = bound(strip_html(raw), summary_limit)
+    return item
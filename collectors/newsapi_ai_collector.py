@@ -6,11 +6,21 @@ Documentation: https://newsapi.ai/documentation
 """
 
 from __future__ import annotations
-from typing import List
+from typing import List, Optional
 import logging
 import requests
 from datetime import datetime, timedelta, timezone
+from collectors.ingest import DEFAULT_SUMMARY_LIMIT, normalize_item
+from collectors.watermark import Batch, Watermark
 from core.models import NewsItem
+from core.quota_budget import QuotaBudget
+from storage.feed_state import FeedStateStore, get_feed_state
+from utils.circuit_breaker import get_breakers
+from utils.date_utils import parse_datetime_utc
+from utils.http_client import get_http_client
+
+# Re-request a few minutes before the cursor: articles are sometimes indexed late
+CURSOR_OVERLAP = timedelta(minutes=5)
 
 logger = logging.getLogger("market_radar.newsapi_ai")
 
@@ -29,6 +39,7 @@ class NewsAPIaiCollector:
     Rate Limits:
     - Free: 2,000 tokens/day
     - 1 article query = ~10 tokens
+    - Token budget is spread over the day by a QuotaBudget
     """
     
     BASE_URL = "https://newsapi.ai/api/v1/article/getArticles"
@@ -40,6 +51,10 @@ class NewsAPIaiCollector:
         concept_uri: str = None,
         category_uri: str = "news/Business",
         limit: int = 50,
+        budget: Optional[QuotaBudget] = None,
+        state_store: Optional[FeedStateStore] = None,
+        body_len: int = 500,
+        summary_limit: int = DEFAULT_SUMMARY_LIMIT,
     ):
         """
         Initialize NewsAPI.ai collector
@@ -50,6 +65,10 @@ class NewsAPIaiCollector:
             concept_uri: Concept URI to filter by (optional)
             category_uri: Category URI (news/Business, news/Technology, etc.)
             limit: Number of articles to fetch (max 100)
+            budget: Daily token budget (default: 2,000 tokens/day, 10 per query)
+            state_store: Persistent state (cursor, budget usage)
+            body_len: Article body characters to download (-1 = full body)
+            summary_limit: Max summary characters kept for analysis (collectors.ingest)
         """
         self.api_key = api_key
         self.keywords = keywords
@@ -57,6 +76,13 @@ class NewsAPIaiCollector:
         self.category_uri = category_uri
         self.limit = limit
         self._last_fetch_time = None
+        self.body_len = body_len
+        self.summary_limit = summary_limit
+        self.http = get_http_client()
+        self.state_store = state_store or get_feed_state()
+        # False: the caller acks the returned batch after processing (watermark.Batch)
+        self.auto_ack = True
+        self.budget = budget or QuotaBudget("NewsAPI.ai", daily_limit=2000, cost_per_call=10, state_store=self.state_store)
     
     def fetch(self) -> List[NewsItem]:
         """
@@ -69,6 +95,15 @@ class NewsAPIaiCollector:
             logger.warning("NewsAPI.ai API key not configured")
             return []
         
+        if not self.budget.can_call():
+            logger.debug(f"NewsAPI.ai: daily budget paced, next call at {self.budget.next_call_time():%H:%M %Z}")
+            return []
+        
+        breaker = get_breakers().get("NewsAPI.ai")
+        if not breaker.allow():
+            logger.debug(f"NewsAPI.ai: circuit open, skipped (retry in {breaker.retry_in():.0f}s)")
+            return []
+        
         try:
             # Build query
             query = {
@@ -97,6 +132,13 @@ class NewsAPIaiCollector:
                     ]
                 }
             
+            # Incremental cursor: the API filters by day only, so articles
+            # we already returned are dropped by key below
+            wm = Watermark(self.state_store.get("api:NewsAPI.ai"))
+            since = wm.since(CURSOR_OVERLAP)
+            if since:
+                query["$query"] = {"$and": [query["$query"], {"dateStart": since.strftime("%Y-%m-%d")}]}
+            
             payload = {
                 "query": query,
                 "resultType": "articles",
@@ -104,6 +146,7 @@ class NewsAPIaiCollector:
                 "articlesCount": self.limit,
                 "includeArticleTitle": True,
                 "includeArticleBody": True,
+                "articleBodyLen": self.body_len,  # summary only needs the start
                 "includeArticleBasicInfo": True,
                 "includeArticleConcepts": True,
                 "includeArticleCategories": True,
@@ -112,7 +155,8 @@ class NewsAPIaiCollector:
             
             logger.debug(f"Fetching from NewsAPI.ai: category={self.category_uri}, limit={self.limit}")
             
-            response = requests.post(
+            self.budget.record()
+            response = self.http.post(
                 self.BASE_URL,
                 json=payload,
                 timeout=30,
@@ -120,6 +164,7 @@ class NewsAPIaiCollector:
             response.raise_for_status()
             
             data = response.json()
+            breaker.record_success()
             
             # Check for errors
             if "error" in data:
@@ -128,26 +173,39 @@ class NewsAPIaiCollector:
             
             # Parse articles
             articles = data.get("articles", {}).get("results", [])
-            items = []
+            items = Batch()
             
             for article in articles:
                 try:
                     item = self._parse_article(article)
-                    if item:
-                        items.append(item)
+                    if not item:
+                        continue
+                    key = article.get("uri") or item.link
+                    published_dt = parse_datetime_utc(item.published)
+                    if wm.seen(key):
+                        continue
+                    wm.add(key, published_dt)
+                    items.append(item)
                 except Exception as e:
                     logger.warning(f"Failed to parse article: {e}")
                     continue
             
-            logger.info(f"📰 NewsAPI.ai: fetched {len(items)} news items")
+            items.defer(wm.commit)
+            if self.auto_ack:
+                items.ack()
+            self.state_store.save()
+            
+            logger.info(f"📰 NewsAPI.ai: fetched {len(items)} news items ({len(articles) - len(items)} already seen)")
             self._last_fetch_time = datetime.now()
             
             return items
             
         except requests.exceptions.RequestException as e:
+            breaker.record_failure()
             logger.error(f"NewsAPI.ai request failed: {e}")
             return []
         except Exception as e:
+            breaker.record_failure()
             logger.error(f"NewsAPI.ai collector error: {e}", exc_info=True)
             return []
     
@@ -184,7 +242,7 @@ class NewsAPIaiCollector:
         
         # Get sentiment
         sentiment = article.get("sentiment")
-        summary = article.get("body", "")[:500]  # First 500 chars
+        summary = article.get("body", "")  # capped by normalize_item()
         if sentiment is not None:
             summary = f"[Sentiment: {sentiment:.2f}] {summary}"
         
@@ -193,7 +251,7 @@ class NewsAPIaiCollector:
         concept_labels = [c.get("label", {}).get("eng", "") for c in concepts[:3]]
         
         # Create NewsItem
-        item = NewsItem(
+        item = normalize_item(NewsItem(
             source=f"NewsAPI.ai ({source_name})",
             title=article.get("title", ""),
             link=article.get("url", ""),
@@ -208,7 +266,7 @@ class NewsAPIaiCollector:
                     "source_uri": source_info.get("uri"),
                 }
             }
-        )
+        ), self.summary_limit)
         
         return item
     
@@ -220,5 +278,6 @@ class NewsAPIaiCollector:
             "rate_limit": "2,000 tokens/day (free tier)",
             "category": self.category_uri,
             "limit_per_request": self.limit,
+            **self.budget.get_usage_info(),
         }
 
@@ -0,0 +1,403 @@
+"""
+Collector Registry
+==================
+Declares what Market Radar polls, instead of hardcoding it in app.main.
+
+- RSS feeds come from a sources file: JSON (data/sources.json) or OPML
+  (any feed reader's export). Every feed carries its own priority,
+  polling interval bounds and parser choice, so coverage grows by
+  editing the file, not the main loop.
+- The SEC and premium API collectors are registered as "module:Class"
+  targets and imported only when enabled - a disabled collector costs
+  nothing at startup.
+- The sources file may override a collector's priority, interval,
+  fetch deadline, summary length cap (collectors.ingest) and constructor
+  options under "collectors" ("RSS" sets the deadline and the default
+  summary cap for the whole RSS batch).
+
+sources.json:
+    {
+      "feeds": [
+        {"name": "PR Newswire", "url": "https://...", "category": "wire", "priority": true},
+        {"name": "TechCrunch", "url": "https://...", "max_interval": 600, "parser": "feedparser"},
+        {"name": "Seeking Alpha", "url": "https://...", "summary_limit": 600}
+      ],
+      "collectors": {
+        "Alpha Vantage": {"interval": 900, "options": {"topics": "earnings"}},
+        "NewsAPI.ai": {"summary_limit": 400},
+        "RSS": {"deadline": 20}
+      }
+    }
+
+OPML: <outline> elements with an xmlUrl are feeds; the enclosing outline's
+text is the category. Optional attributes: priority="true", interval,
+min_interval, max_interval, parser, summary_limit, enabled="false".
+
+    python -m tools.import_opml feeds.opml   # merge an OPML export into data/sources.json
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import logging
+import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger("market_radar.registry")
+
+DEFAULT_SOURCES_FILE = Path("data") / "sources.json"
+PARSERS = ("auto", "feedparser")
+
+
+@dataclass(frozen=True)
+class FeedSource:
+    name: str
+    url: str
+    category: str = ""
+    priority: bool = False
+    interval: Optional[float] = None  # starting poll interval (seconds)
+    min_interval: Optional[float] = None
+    max_interval: Optional[float] = None
+    parser: str = "auto"  # "auto" = lxml fast path with feedparser fallback
+    summary_limit: Optional[int] = None  # summary length cap (default: the RSS batch's)
+    enabled: bool = True
+
+    def schedule_options(self) -> Dict[str, Any]:
+        """Keyword arguments for PollScheduler.add()."""
+        return {
+            "interval": self.interval,
+            "min_interval": self.min_interval,
+            "max_interval": self.max_interval,
+            "priority": self.priority,
+        }
+
+
+@dataclass
+class CollectorSpec:
+    name: str  # schedule key, e.g. "SEC"
+    target: str  # "package.module:ClassName", imported on build
+    enabled: Callable[[Any], bool]  # settings -> bool
+    options: Callable[[Any], Dict[str, Any]] = lambda settings: {}  # settings -> constructor kwargs
+    priority: bool = False
+    interval: Optional[float] = None
+    min_interval: Optional[float] = None
+    max_interval: Optional[float] = None
+    warm_up: Tuple[str, ...] = ()  # extra URLs to pre-connect (default: the collector's BASE_URL)
+    description: str = ""
+
+    def schedule_options(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "min_interval": self.min_interval,
+            "max_interval": self.max_interval,
+            "priority": self.priority,
+        }
+
+
+_FEED_FIELDS = {f.name for f in fields(FeedSource)}
+_OVERRIDE_FIELDS = {
+    "priority", "interval", "min_interval", "max_interval", "options", "enabled", "deadline", "summary_limit",
+}
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in {"1", "true", "yes", "y", "on"}
+    return bool(value)
+
+
+def _as_seconds(value: Any) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def _as_limit(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    return int(value)
+
+
+def make_feed(data: Dict[str, Any], where: str = "") -> FeedSource:
+    """Build a FeedSource from a JSON object / OPML attributes (validated)."""
+    unknown = set(data) - _FEED_FIELDS
+    if unknown:
+        raise ValueError(f"{where}: unknown feed option(s) {sorted(unknown)}")
+    if not data.get("name") or not data.get("url"):
+        raise ValueError(f"{where}: feed needs a name and a url")
+    parser = str(data.get("parser") or "auto").lower()
+    if parser not in PARSERS:
+        raise ValueError(f"{where}: parser must be one of {PARSERS}, got {parser!r}")
+    return FeedSource(
+        name=str(data["name"]).strip(),
+        url=str(data["url"]).strip(),
+        category=str(data.get("category") or ""),
+        priority=_as_bool(data.get("priority", False)),
+        interval=_as_seconds(data.get("interval")),
+        min_interval=_as_seconds(data.get("min_interval")),
+        max_interval=_as_seconds(data.get("max_interval")),
+        parser=parser,
+        summary_limit=_as_limit(data.get("summary_limit")),
+        enabled=_as_bool(data.get("enabled", True)),
+    )
+
+
+def load_opml(path: Union[str, Path]) -> List[FeedSource]:
+    """Feeds from an OPML file (nested outlines become categories)."""
+    root = ET.parse(path).getroot()
+    body = root.find("body")
+    feeds: List[FeedSource] = []
+
+    def walk(node: ET.Element, category: str) -> None:
+        for outline in node.findall("outline"):
+            attrs = dict(outline.attrib)
+            url = attrs.get("xmlUrl")
+            if not url:
+                walk(outline, attrs.get("text") or attrs.get("title") or category)
+                continue
+            data = {k: attrs[k] for k in _FEED_FIELDS & set(attrs)}
+            data["name"] = attrs.get("title") or attrs.get("text") or url
+            data["url"] = url
+            data.setdefault("category", category)
+            feeds.append(make_feed(data, where=f"{path}: {data['name']}"))
+
+    walk(body if body is not None else root, "")
+    return feeds
+
+
+def load_json(path: Union[str, Path]) -> Tuple[List[FeedSource], Dict[str, Dict[str, Any]]]:
+    """Feeds and collector overrides from a JSON sources file."""
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    if isinstance(data, list):
+        data = {"feeds": data}
+
+    feeds = [make_feed(f, where=f"{path}: feeds[{i}]") for i, f in enumerate(data.get("feeds", []))]
+    overrides = data.get("collectors", {})
+    for name, opts in overrides.items():
+        unknown = set(opts) - _OVERRIDE_FIELDS
+        if unknown:
+            raise ValueError(f"{path}: collectors[{name!r}]: unknown option(s) {sorted(unknown)}")
+    return feeds, overrides
+
+
+def dump_json(feeds: Iterable[FeedSource], path: Union[str, Path], overrides: Optional[Dict[str, Any]] = None) -> None:
+    """Write feeds (default-valued fields omitted) and overrides to a sources file."""
+    defaults = asdict(FeedSource(name="", url=""))
+    out = []
+    for feed in feeds:
+        d = asdict(feed)
+        out.append({k: v for k, v in d.items() if k in ("name", "url") or v != defaults[k]})
+    data: Dict[str, Any] = {"feeds": out}
+    if overrides:
+        data["collectors"] = overrides
+    Path(path).write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def import_target(target: str) -> Any:
+    """Resolve "package.module:Name" (imports the module)."""
+    module_name, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class CollectorRegistry:
+    def __init__(
+        self,
+        feeds: Iterable[FeedSource] = (),
+        specs: Iterable[CollectorSpec] = (),
+        overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """
+        Args:
+            feeds: RSS feeds (disabled ones are kept but not polled)
+            specs: Non-RSS collectors, imported only when enabled
+            overrides: Per-collector priority / interval / options from the sources file
+        """
+        self.feeds: List[FeedSource] = []
+        self.specs: List[CollectorSpec] = []
+        self.overrides = overrides or {}
+        self.collectors: Dict[str, Any] = {}  # built collectors by schedule key
+        for feed in feeds:
+            self.add_feed(feed)
+        for spec in specs:
+            self.register(spec)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], specs: Iterable[CollectorSpec] = ()) -> "CollectorRegistry":
+        path = Path(path)
+        if path.suffix.lower() in (".opml", ".xml"):
+            feeds, overrides = load_opml(path), {}
+        else:
+            feeds, overrides = load_json(path)
+        registry = cls(feeds, specs, overrides)
+        logger.info(f"📋 {len(registry.enabled_feeds())} RSS feeds from {path}")
+        return registry
+
+    def add_feed(self, feed: FeedSource) -> None:
+        if any(f.name == feed.name for f in self.feeds):
+            raise ValueError(f"duplicate feed name {feed.name!r}")
+        self.feeds.append(feed)
+
+    def register(self, spec: CollectorSpec) -> None:
+        self.specs.append(spec)
+
+    def enabled_feeds(self) -> List[FeedSource]:
+        return [f for f in self.feeds if f.enabled]
+
+    # ------------------------------------------------------------------ build
+
+    def build_rss(self, **kwargs: Any) -> Any:
+        """One RSSCollector for all enabled feeds (None if there are none)."""
+        feeds = self.enabled_feeds()
+        if not feeds:
+            return None
+        rss_cls = import_target("collectors.rss_collector:RSSCollector")
+        parsers = {f.name: f.parser for f in feeds if f.parser != "auto"}
+        summary_limits = {f.name: f.summary_limit for f in feeds if f.summary_limit is not None}
+        batch_limit = self.summary_limit("RSS")
+        if batch_limit is not None:
+            kwargs["summary_limit"] = batch_limit
+        return rss_cls([(f.name, f.url) for f in feeds], parsers=parsers, summary_limits=summary_limits, **kwargs)
+
+    def build(self, settings: Any) -> Dict[str, Any]:
+        """
+        Import and construct every enabled collector.
+
+        Returns:
+            {schedule key: collector}; the first enabled spec per key wins
+        """
+        for spec in self.specs:
+            override = self.overrides.get(spec.name, {})
+            if spec.name in self.collectors or not _as_bool(override.get("enabled", True)):
+                continue
+            if not spec.enabled(settings):
+                continue
+            try:
+                kwargs = {**spec.options(settings), **override.get("options", {})}
+                summary_limit = self.summary_limit(spec.name, getattr(settings, "summary_max_chars", None))
+                if summary_limit is not None:
+                    kwargs["summary_limit"] = summary_limit
+                collector = import_target(spec.target)(**kwargs)
+            except Exception as e:
+                logger.error(f"❌ Failed to initialize {spec.name} ({spec.target}): {e}")
+                continue
+            self.collectors[spec.name] = collector
+            logger.info(f"✅ {spec.description or spec.name} enabled")
+            if hasattr(collector, "get_usage_info"):
+                logger.info(f"{spec.name} config: {collector.get_usage_info()}")
+        return self.collectors
+
+    # ------------------------------------------------------------------ scheduling
+
+    def schedule(self, scheduler: Any) -> None:
+        """Add every enabled feed and built collector to a PollScheduler."""
+        for feed in self.enabled_feeds():
+            scheduler.add(feed.name, **feed.schedule_options())
+        for spec in self.specs:
+            if self.collectors.get(spec.name) is None or spec.name in scheduler.sources:
+                continue
+            opts = spec.schedule_options()
+            opts.update({k: v for k, v in self.overrides.get(spec.name, {}).items() if k in opts})
+            scheduler.add(spec.name, **opts)
+
+    def deadline(self, name: str, default: float) -> float:
+        """Per-poll fetch deadline (seconds) for a collector."""
+        value = self.overrides.get(name, {}).get("deadline")
+        return default if value is None else float(value)
+
+    def summary_limit(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        """Summary length cap for a collector (None: the collector's default)."""
+        return _as_limit(self.overrides.get(name, {}).get("summary_limit", default))
+
+    def warm_up_urls(self) -> Dict[str, List[str]]:
+        """Hosts to pre-connect per schedule key."""
+        urls = {f.name: [f.url] for f in self.enabled_feeds()}
+        for spec in self.specs:
+            collector = self.collectors.get(spec.name)
+            if collector is None or spec.name in urls:
+                continue
+            base = getattr(collector, "BASE_URL", None)
+            urls[spec.name] = list(spec.warm_up) or ([base] if base else [])
+        return urls
+
+
+# ---------------------------------------------------------------------- built-in collectors
+
+
+def _budget(name: str, daily_limit: int, settings: Any, cost_per_call: int = 1) -> Any:
+    from core.quota_budget import QuotaBudget
+
+    return QuotaBudget(
+        name,
+        daily_limit=daily_limit,
+        cost_per_call=cost_per_call,
+        schedule=settings.api_quota_schedule,
+    )
+
+
+BUILTIN_COLLECTORS: List[CollectorSpec] = [
+    # SEC: filtered (8-K/S-4) is preferred; the legacy all-forms feed only if it's off
+    CollectorSpec(
+        name="SEC",
+        target="collectors.sec_filtered_collector:SECFilteredCollector",
+        enabled=lambda s: s.enable_sec_filtered,
+        options=lambda s: {"max_pages": s.sec_max_pages},
+        priority=True,
+        warm_up=("https://www.sec.gov/",),
+        description="SEC Filtered collector (8-K, S-4 + clinical trials)",
+    ),
+    CollectorSpec(
+        name="SEC",
+        target="collectors.sec_collector:SECRSSCollector",
+        enabled=lambda s: s.enable_sec_legacy,
+        priority=True,
+        warm_up=("https://www.sec.gov/",),
+        description="SEC Legacy collector (all forms)",
+    ),
+    CollectorSpec(
+        name="Alpha Vantage",
+        target="collectors.alpha_vantage_collector:AlphaVantageCollector",
+        enabled=lambda s: s.enable_alpha_vantage and bool(s.alpha_vantage_api_key),
+        options=lambda s: {
+            "api_key": s.alpha_vantage_api_key,
+            "topics": "technology,earnings,ipo,mergers_and_acquisitions",
+            "limit": 50,
+            "budget": _budget("Alpha Vantage", s.alpha_vantage_daily_limit, s),
+        },
+        description="Alpha Vantage API",
+    ),
+    CollectorSpec(
+        name="TheNewsAPI",
+        target="collectors.thenewsapi_collector:TheNewsAPICollector",
+        enabled=lambda s: s.enable_thenewsapi and bool(s.thenewsapi_token),
+        options=lambda s: {
+            "api_token": s.thenewsapi_token,
+            "categories": "business,tech",
+            "limit": 50,
+            "budget": _budget("TheNewsAPI", s.thenewsapi_daily_limit, s),
+        },
+        description="TheNewsAPI",
+    ),
+    CollectorSpec(
+        name="NewsAPI.ai",
+        target="collectors.newsapi_ai_collector:NewsAPIaiCollector",
+        enabled=lambda s: s.enable_newsapi_ai and bool(s.newsapi_ai_key),
+        options=lambda s: {
+            "api_key": s.newsapi_ai_key,
+            "category_uri": "news/Business",
+            "limit": 50,
+            "budget": _budget(
+                "NewsAPI.ai", s.newsapi_ai_daily_tokens, s, cost_per_call=s.newsapi_ai_tokens_per_call
+            ),
+        },
+        description="NewsAPI.ai",
+    ),
+]
+
+
+def load_registry(path: Union[str, Path] = DEFAULT_SOURCES_FILE) -> CollectorRegistry:
+    """Registry with the built-in collectors and the feeds from a sources file."""
+    return CollectorRegistry.from_file(path, BUILTIN_COLLECTORS)
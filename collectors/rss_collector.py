@@ -1,82 +1,251 @@
 from __future__ import annotations
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Collection, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
 import logging
+import threading
 import time
 
-import feedparser
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-
+from collectors.conditional_get import conditional_get, cache_counters
+from collectors.feed_parser import iter_entries
+from collectors.ingest import DEFAULT_SUMMARY_LIMIT, normalize_item
+from collectors.watermark import Batch, Watermark
 from core.models import NewsItem
+from storage.feed_state import FeedStateStore, get_feed_state
+from utils.circuit_breaker import get_breakers
+from utils.date_utils import parse_datetime_utc
+from utils.http_client import get_http_client
 
 logger = logging.getLogger("market_radar.rss")
 
 
-def _build_session() -> requests.Session:
-    s = requests.Session()
-    retry = Retry(
-        total=4,
-        connect=4,
-        read=4,
-        backoff_factor=0.8,
-        status_forcelist=(429, 500, 502, 503, 504),
-        allowed_methods=frozenset(["GET"]),
-        raise_on_status=False,
-    )
-    adapter = HTTPAdapter(max_retries=retry, pool_connections=10, pool_maxsize=10)
-    s.mount("http://", adapter)
-    s.mount("https://", adapter)
-    return s
-
-
 class RSSCollector:
-    def __init__(self, sources: List[Tuple[str, str]]):
+    """
+    Fetches a list of (name, url) RSS sources.
+
+    By default sources are fetched concurrently in a bounded thread pool,
+    with at most `max_per_host` parallel requests to the same host, so a
+    poll takes roughly as long as the slowest feed instead of the sum of
+    all feeds. fetch() returns items in source order; iter_fetch() yields
+    each source's items as soon as that source completes.
+
+    Requests are conditional (ETag / Last-Modified, body-hash fallback),
+    so feeds that did not change since the last poll are not parsed.
+    A per-feed high-water mark stops iteration at already-seen entries,
+    so only genuinely new entries become NewsItems. Entries are streamed
+    by the lxml fast path, falling back to feedparser per feed on error.
+    Each feed has a circuit breaker, so a dead feed is skipped instead of
+    timing out on every poll. Items leave as plain text with a bounded
+    summary (collectors.ingest; `summary_limits` per source name).
+
+    Each source's items are a watermark.Batch; with auto_ack off the
+    caller acks a batch once its items were processed, and only then
+    are that feed's watermark and validators advanced.
+    """
+
+    def __init__(
+        self,
+        sources: List[Tuple[str, str]],
+        concurrent: bool = True,
+        max_workers: int = 8,
+        max_per_host: int = 2,
+        state_store: Optional[FeedStateStore] = None,
+        fast_parse: bool = True,
+        parsers: Optional[Dict[str, str]] = None,
+        summary_limit: int = DEFAULT_SUMMARY_LIMIT,
+        summary_limits: Optional[Dict[str, int]] = None,
+    ):
         self.sources = sources
-        self.session = _build_session()
-
-    def fetch(self) -> List[NewsItem]:
-        out: List[NewsItem] = []
-
-        for name, url in self.sources:
-            try:
-                headers = {
-                    "User-Agent": "MarketRadar/1.0 (+https://example.com)",
-                    "Accept": "application/rss+xml, application/xml;q=0.9, */*;q=0.8",
-                    "Accept-Encoding": "gzip, deflate",
-                    "Connection": "close",
-                }
-
-                resp = self.session.get(url, headers=headers, timeout=25)
-                if resp.status_code >= 400:
-                    raise RuntimeError(f"HTTP {resp.status_code}")
-
-                # Feedparser parses bytes/text better than it fetches sometimes
-                d = feedparser.parse(resp.content)
-
-                entries = getattr(d, "entries", []) or []
-                for e in entries:
-                    title = getattr(e, "title", "").strip()
-                    link = getattr(e, "link", "").strip()
-                    published = getattr(e, "published", "") or getattr(e, "updated", "")
-                    summary = getattr(e, "summary", "") or getattr(e, "description", "")
-                    out.append(
-                        NewsItem(
-                            source=name,
-                            title=title,
-                            link=link,
-                            published=published,
-                            summary=summary,
-                            raw={"feed": url},
-                        )
-                    )
-
-                logger.debug(f"📰 {name}: fetched {len(entries)} items")
+        self.fast_parse = fast_parse
+        # per-source parser override: name -> "feedparser" skips the lxml fast path
+        self.parsers = parsers or {}
+        # summary length cap (collectors.ingest), with per-source overrides
+        self.summary_limit = summary_limit
+        self.summary_limits = summary_limits or {}
+        self.session = get_http_client()
+        self.state_store = state_store or get_feed_state()
+        self.concurrent = concurrent
+        self.max_workers = max(1, max_workers)
+        self.max_per_host = max(1, max_per_host)
+        # False: batches are acked by the caller after processing (watermark.Batch)
+        self.auto_ack = True
+
+        # wall-clock seconds per source for the last fetch()
+        self.last_timings: Dict[str, float] = {}
+        # sources skipped because the feed did not change (304 / same body)
+        self.last_unchanged: List[str] = []
+        # sources skipped because their circuit breaker is open
+        self.last_circuit_open: List[str] = []
+
+        self._host_limits: Dict[str, threading.Semaphore] = {}
+        self._host_lock = threading.Lock()
+
+    def fetch(self, names: Optional[Collection[str]] = None) -> List[NewsItem]:
+        """
+        Fetch all sources, or only the sources listed in `names`
+        (used by the per-source poll scheduler). Items are returned in
+        source order.
+        """
+        by_name = dict(self.iter_fetch(names))
+        out = Batch()
+        for name, _url in self._select(names):
+            batch = by_name.get(name, Batch())
+            out.extend(batch)
+            out.defer(batch.ack)
+        return out
 
+    def iter_fetch(self, names: Optional[Collection[str]] = None) -> Iterator[Tuple[str, Batch]]:
+        """
+        Like fetch(), but yield (source name, new items) as each source
+        completes, so the first feed can be processed while the slowest
+        one is still downloading. Every requested source is yielded once
+        (with an empty list if nothing is new).
+        """
+        started = time.perf_counter()
+        self.last_timings = {}
+        self.last_unchanged = []
+        self.last_circuit_open = []
+
+        sources = self._select(names)
+        total = 0
+
+        if self.concurrent and len(sources) > 1:
+            workers = min(self.max_workers, len(sources))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rss") as pool:
+                futures = {
+                    pool.submit(self._fetch_source_limited, name, url): name
+                    for name, url in sources
+                }
+                for fut in as_completed(futures):
+                    items = fut.result()
+                    total += len(items)
+                    if self.auto_ack:
+                        items.ack()
+                    yield futures[fut], items
+        else:
+            for name, url in sources:
+                items = self._fetch_source(name, url)
+                total += len(items)
+                if self.auto_ack:
+                    items.ack()
+                yield name, items
                 # tiny sleep to be nice to RSS servers (especially PRN)
                 time.sleep(0.2)
 
-            except Exception as e:
-                logger.error(f"❌ Error fetching from {name}: {e}")
-
+        self.state_store.save()
+
+        elapsed = time.perf_counter() - started
+        if self.last_timings:
+            slowest = max(self.last_timings, key=self.last_timings.get)
+            logger.info(
+                f"📰 RSS: {total} items from {len(sources)} sources in {elapsed:.2f}s "
+                f"(slowest: {slowest} {self.last_timings[slowest]:.2f}s, unchanged: {len(self.last_unchanged)}, "
+                f"circuit open: {len(self.last_circuit_open)})"
+            )
+
+    def _select(self, names: Optional[Collection[str]]) -> List[Tuple[str, str]]:
+        return self.sources if names is None else [s for s in self.sources if s[0] in names]
+
+    def get_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-feed conditional GET counters (304s, body-hash hits, bytes saved)."""
+        return {
+            name: cache_counters(self.state_store.get(url))
+            for name, url in self.sources
+        }
+
+    def _host_limit(self, url: str) -> threading.Semaphore:
+        host = (urlsplit(url).hostname or "").lower()
+        with self._host_lock:
+            sem = self._host_limits.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.max_per_host)
+                self._host_limits[host] = sem
+            return sem
+
+    def _fetch_source_limited(self, name: str, url: str) -> Batch:
+        with self._host_limit(url):
+            return self._fetch_source(name, url)
+
+    def _fetch_source(self, name: str, url: str) -> Batch:
+        out = Batch()
+        started = time.perf_counter()
+
+        breaker = get_breakers().get(f"rss:{name}")
+        if not breaker.allow():
+            self.last_circuit_open.append(name)
+            logger.debug(f"📰 {name}: circuit open, skipped (retry in {breaker.retry_in():.0f}s)")
+            return out
+
+        try:
+            headers = {
+                "User-Agent": "MarketRadar/1.0 (+https://example.com)",
+                "Accept": "application/rss+xml, application/xml;q=0.9, */*;q=0.8",
+                "Accept-Encoding": "gzip, deflate",
+            }
+
+            state = self.state_store.get(url)
+            # validators are committed with the watermark, when the batch is acked
+            result = conditional_get(self.session, url, headers, state, timeout=25, defer=True)
+            breaker.record_success()
+            if result.unchanged:
+                self.last_unchanged.append(name)
+                logger.debug(f"📰 {name}: unchanged ({result.unchanged_reason}), skipped parse")
+                self.last_timings[name] = time.perf_counter() - started
+                return out
+
+            entries = iter_entries(
+                result.content,
+                fast=(
+                    self.fast_parse
+                    and self.parsers.get(name) != "feedparser"
+                    and state.get("parser") != "feedparser"
+                ),
+                on_fallback=lambda err: self._disable_fast_parse(name, state, err),
+            )
+
+            summary_limit = self.summary_limits.get(name, self.summary_limit)
+            wm = Watermark(state)
+            for e in entries:
+                link = e.link
+                guid = e.guid or link
+                published = e.published or e.updated
+                published_dt = parse_datetime_utc(published) if published else None
+
+                if wm.seen(guid):
+                    if wm.reached(published_dt):
+                        break  # the rest of the feed is older than what we already have
+                    continue
+
+                out.append(normalize_item(
+                    NewsItem(
+                        source=name,
+                        title=e.title,
+                        link=link,
+                        published=published,
+                        summary=e.summary,
+                        raw={"feed": url, "guid": guid},
+                    ),
+                    summary_limit,
+                ))
+                wm.add(guid, published_dt)
+            out.defer(wm.commit)
+            out.defer(partial(result.commit, state))
+
+            elapsed = time.perf_counter() - started
+            logger.debug(
+                f"📰 {name}: {len(out)} new entries ({wm.skipped} already seen) in {elapsed:.2f}s"
+            )
+
+        except Exception as e:
+            breaker.record_failure()
+            logger.error(f"❌ Error fetching from {name}: {e}")
+
+        self.last_timings[name] = time.perf_counter() - started
         return out
+
+    @staticmethod
+    def _disable_fast_parse(name: str, state: dict, err: Exception) -> None:
+        """Remember that this feed needs feedparser (kept across restarts)."""
+        state["parser"] = "feedparser"
+        logger.info(f"📰 {name}: fast parser failed ({err}), using feedparser for this feed")
@@ -1,11 +1,26 @@
 from __future__ import annotations
-from typing import List
+from functools import partial
+from typing import List, Optional
 import logging
-import feedparser
+from collectors.conditional_get import conditional_get, cache_counters
+from collectors.feed_parser import iter_entries
+from collectors.ingest import DEFAULT_SUMMARY_LIMIT, normalize_item
+from collectors.watermark import Batch, Watermark
 from core.models import NewsItem
+from storage.feed_state import FeedStateStore, get_feed_state
+from utils.circuit_breaker import get_breakers
+from utils.http_client import get_http_client
+from utils.date_utils import parse_datetime_utc
 
 logger = logging.getLogger("market_radar.sec")
 
+# SEC fair-access policy asks for a descriptive User-Agent
+SEC_HEADERS = {
+    "User-Agent": "MarketRadar/1.0 (contact@example.com)",
+    "Accept": "application/atom+xml, application/xml;q=0.9, */*;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+}
+
 class SECRSSCollector:
     """
     SEC EDGAR RSS – can be tuned to specific forms later.
@@ -13,30 +28,70 @@ class SECRSSCollector:
     """
     SEC_LATEST_FILINGS_RSS = "https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&CIK=&type=&company=&dateb=&owner=include&start=0&count=100&output=atom"
 
+    def __init__(self, state_store: Optional[FeedStateStore] = None, summary_limit: int = DEFAULT_SUMMARY_LIMIT):
+        self.session = get_http_client()
+        self.state_store = state_store or get_feed_state()
+        self.summary_limit = summary_limit
+        # False: the caller acks the returned batch after processing (watermark.Batch)
+        self.auto_ack = True
+
     def fetch(self) -> List[NewsItem]:
+        breaker = get_breakers().get("SEC")
+        if not breaker.allow():
+            logger.debug(f"🏛️  SEC EDGAR: circuit open, skipped (retry in {breaker.retry_in():.0f}s)")
+            return []
+
         try:
-            d = feedparser.parse(self.SEC_LATEST_FILINGS_RSS)
-            out: List[NewsItem] = []
-            entries = getattr(d, "entries", [])
-            count = len(entries)
+            url = self.SEC_LATEST_FILINGS_RSS
+            state = self.state_store.get(url)
+            result = conditional_get(self.session, url, SEC_HEADERS, state, timeout=25, defer=True)
+            breaker.record_success()
+            if result.unchanged:
+                self.state_store.save()
+                logger.debug(f"🏛️  SEC EDGAR: unchanged ({result.unchanged_reason}), skipped parse")
+                return []
 
+            out = Batch()
+            entries = iter_entries(
+                result.content,
+                fast=state.get("parser") != "feedparser",
+                on_fallback=lambda err: state.update(parser="feedparser"),
+            )
+
+            wm = Watermark(state)
             for e in entries:
-                title = getattr(e, "title", "").strip()
-                link = getattr(e, "link", "").strip()
-                published = getattr(e, "published", "") or getattr(e, "updated", "")
-                summary = getattr(e, "summary", "") or getattr(e, "description", "")
-                out.append(NewsItem(
+                link = e.link
+                guid = e.guid or link
+                published = e.published or e.updated
+                published_dt = parse_datetime_utc(published) if published else None
+                if wm.seen(guid):
+                    if wm.reached(published_dt):
+                        break
+                    continue
+
+                out.append(normalize_item(NewsItem(
                     source="SEC EDGAR",
-                    title=title,
+                    title=e.title,
                     link=link,
                     published=published,
-                    summary=summary,
-                    raw={"feed": "SEC_LATEST_FILINGS"},
-                ))
+                    summary=e.summary,
+                    raw={"feed": "SEC_LATEST_FILINGS", "guid": guid},
+                ), self.summary_limit))
+                wm.add(guid, published_dt)
+            out.defer(wm.commit)
+            out.defer(partial(result.commit, state))
+            if self.auto_ack:
+                out.ack()
+            self.state_store.save()
             
-            logger.debug(f"🏛️  SEC EDGAR: fetched {count} filings")
+            logger.debug(f"🏛️  SEC EDGAR: {len(out)} new filings ({wm.skipped} already seen)")
             return out
             
         except Exception as e:
+            breaker.record_failure()
             logger.error(f"❌ Error fetching from SEC: {e}")
             return []
+
+    def get_cache_stats(self) -> dict:
+        """Conditional GET counters for the SEC feed."""
+        return cache_counters(self.state_store.get(self.SEC_LATEST_FILINGS_RSS))
@@ -7,19 +7,38 @@ Collects only high-impact SEC filings:
 
 Also identifies clinical trial and vaccine-related filings which can significantly impact stock prices.
 
+EDGAR's "latest filings" feed is queried once per form type and paged
+backwards (start=N) until the last seen accession number, so a burst of
+filings larger than one page between polls is not silently dropped.
+
 Author: Market Radar Team
 """
 
 from __future__ import annotations
 import logging
 import re
-from typing import List, Set
-import feedparser
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
+from collectors.conditional_get import conditional_get, cache_counters
+from collectors.feed_parser import FeedEntry, iter_entries
+from collectors.ingest import DEFAULT_SUMMARY_LIMIT, normalize_item
+from collectors.sec_collector import SEC_HEADERS
+from collectors.watermark import Batch, Watermark
+from core.aho_corasick import AhoCorasick
 from core.models import NewsItem
-from utils.date_utils import parse_date
+from storage.feed_state import FeedStateStore, get_feed_state
+from utils.circuit_breaker import get_breakers
+from utils.http_client import get_http_client
+from utils.date_utils import parse_date, parse_datetime_utc
 
 logger = logging.getLogger(__name__)
 
+_ACCESSION_RE = re.compile(r"\d{10}-\d{2}-\d{6}")
+
 
 class SECFilteredCollector:
     """
@@ -43,132 +62,339 @@ class SECFilteredCollector:
         "S-4/A",  # Amended S-4
     }
     
-    # Clinical trial and pharma keywords that significantly impact stock prices
+    # Clinical trial and pharma keywords that significantly impact stock prices.
+    # (phrase, \b before, \b after), matched in one pass over the lowercased
+    # text with whitespace runs collapsed - "phase 3" also covers "Phase\n3"
     CLINICAL_KEYWORDS = [
         # Clinical trials
-        r"\bphase\s+[I1]\b",
-        r"\bphase\s+[I2]\b", 
-        r"\bphase\s+[I3]\b",
-        r"\bphase\s+1\b",
-        r"\bphase\s+2\b",
-        r"\bphase\s+3\b",
-        r"\bclinical\s+trial",
-        r"\bclinical\s+study",
-        r"\btrial\s+results?",
-        r"\bstudy\s+results?",
+        ("phase i", True, True),
+        ("phase 1", True, True),
+        ("phase 2", True, True),
+        ("phase 3", True, True),
+        ("clinical trial", True, False),
+        ("clinical study", True, False),
+        ("trial result", True, False),
+        ("study result", True, False),
         
         # FDA and approvals
-        r"\bFDA\s+approval",
-        r"\bFDA\s+clearance",
-        r"\bFDA\s+granted",
-        r"\bFDA\s+accepted",
-        r"\bbreakthrough\s+therapy",
-        r"\bfast\s+track",
-        r"\borphan\s+drug",
-        r"\bpriority\s+review",
-        r"\bEMA\s+approval",
+        ("fda approval", True, False),
+        ("fda clearance", True, False),
+        ("fda granted", True, False),
+        ("fda accepted", True, False),
+        ("breakthrough therapy", True, False),
+        ("fast track", True, False),
+        ("orphan drug", True, False),
+        ("priority review", True, False),
+        ("ema approval", True, False),
         
         # Vaccines
-        r"\bvaccine",
-        r"\bimmunization",
-        r"\bimmunotherapy",
-        r"\bantibody",
-        r"\bmonoclonal",
+        ("vaccine", True, False),
+        ("immunization", True, False),
+        ("immunotherapy", True, False),
+        ("antibody", True, False),
+        ("monoclonal", True, False),
         
         # Drug development
-        r"\bdrug\s+candidate",
-        r"\btherapeutic",
-        r"\btreatment\s+candidate",
-        r"\binvestigational\s+drug",
-        r"\bIND\s+application",
-        r"\bNDA\s+submission",
-        r"\bBLA\s+submission",
+        ("drug candidate", True, False),
+        ("therapeutic", True, False),
+        ("treatment candidate", True, False),
+        ("investigational drug", True, False),
+        ("ind application", True, False),
+        ("nda submission", True, False),
+        ("bla submission", True, False),
         
         # Success indicators
-        r"\bprimary\s+endpoint",
-        r"\bstatistically\s+significant",
-        r"\bpositive\s+results?",
-        r"\bsuccessful\s+completion",
-        r"\bmeets?\s+endpoint",
+        ("primary endpoint", True, False),
+        ("statistically significant", True, False),
+        ("positive result", True, False),
+        ("successful completion", True, False),
+        ("meet endpoint", True, False),
+        ("meets endpoint", True, False),
     ]
+    CLINICAL_MATCHER = AhoCorasick(CLINICAL_KEYWORDS)
+    
+    # Per-form query mode: EDGAR returns only these forms (plus amendments)
+    FORM_QUERIES = ("8-K", "S-4")
+    
+    EDGAR_CURRENT_URL = (
+        "https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&CIK=&type={form}"
+        "&company=&dateb=&owner=include&start=0&count={count}&output=atom"
+    )
     
-    def __init__(self, rss_url: str = "https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&CIK=&type=&company=&dateb=&owner=include&start=0&count=100&output=atom"):
+    def __init__(
+        self,
+        rss_url: Optional[str] = None,
+        forms: Optional[Sequence[str]] = None,
+        page_size: int = 100,
+        max_pages: int = 5,
+        min_request_interval: float = 0.15,
+        state_store: Optional[FeedStateStore] = None,
+        summary_limit: int = DEFAULT_SUMMARY_LIMIT,
+    ):
         """
         Initialize the SEC Filtered Collector.
         
         Args:
-            rss_url: SEC EDGAR RSS feed URL (default: latest 100 filings)
+            rss_url: Single EDGAR Atom URL to page through instead of per-form
+                     queries (e.g. the unfiltered latest-filings feed)
+            forms: Forms to query separately (default: FORM_QUERIES)
+            page_size: Filings per page (EDGAR max: 100)
+            max_pages: Max pages to walk back per stream in one poll
+            min_request_interval: Seconds between SEC requests (fair access: <10 req/s)
+            state_store: Persistent per-feed state (validators, body hash, cursor)
+            summary_limit: Max summary characters kept for analysis (collectors.ingest)
         """
-        self.rss_url = rss_url
-        self.clinical_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.CLINICAL_KEYWORDS]
+        if rss_url:
+            self.stream_urls = [rss_url]
+        else:
+            self.stream_urls = [
+                self.EDGAR_CURRENT_URL.format(form=quote(f), count=page_size)
+                for f in (forms or self.FORM_QUERIES)
+            ]
+        self.rss_url = self.stream_urls[0]
+        self.max_pages = max(1, max_pages)
+        self.min_request_interval = min_request_interval
+        self.session = get_http_client()
+        self.state_store = state_store or get_feed_state()
+        self.summary_limit = summary_limit
+        # False: the caller acks the returned batch after processing (watermark.Batch)
+        self.auto_ack = True
+        
+        self._throttle_lock = threading.Lock()
+        self._last_request = 0.0
         
     def fetch(self) -> List[NewsItem]:
         """
         Fetch filtered SEC filings.
         
+        Each stream (one per form query) is paged backwards with start=
+        until the last seen accession number is reached, so bursts of more
+        than one page between polls are not lost. Streams run concurrently
+        but share one request throttle.
+        
         Returns:
             List of NewsItem objects for high-impact SEC filings
         """
+        breaker = get_breakers().get("SEC")
+        if not breaker.allow():
+            logger.debug(f"🏛️  SEC Filtered: circuit open, skipped (retry in {breaker.retry_in():.0f}s)")
+            return []
+        
         try:
-            feed = feedparser.parse(self.rss_url)
-            news_items: List[NewsItem] = []
+            if len(self.stream_urls) > 1:
+                with ThreadPoolExecutor(max_workers=len(self.stream_urls), thread_name_prefix="sec") as pool:
+                    results = list(pool.map(self._try_stream, self.stream_urls))
+            else:
+                results = [self._try_stream(self.stream_urls[0])]
             
-            filtered_count = 0
-            clinical_count = 0
+            # One failed stream doesn't drop the others' items (their cursors advance on ack)
+            failed = sum(1 for r in results if r is None)
+            if failed == len(results):
+                self.state_store.save()
+                breaker.record_failure()
+                return []
+            breaker.record_success()
             
-            for entry in feed.entries:
-                # Extract filing type from title
-                # Title format: "8-K - COMPANY NAME (0001234567) (Filer)"
-                title = entry.get("title", "")
-                form_type = self._extract_form_type(title)
-                
-                # Filter: only allow specific forms
-                if form_type not in self.ALLOWED_FORMS:
-                    filtered_count += 1
-                    continue
-                
-                # Extract ticker from entry (SEC provides CIK, we'll extract from title)
-                ticker = self._extract_ticker_from_title(title)
-                
-                # Get summary and link
-                summary = entry.get("summary", "")
-                link = entry.get("link", "")
-                published = entry.get("published", "")
-                
-                # Parse date
-                published_dt = parse_date(published)
-                published_str = published_dt.isoformat() if published_dt else ""
-                
-                # Check for clinical trial / vaccine keywords
-                is_clinical = self._is_clinical_related(title, summary)
-                if is_clinical:
-                    clinical_count += 1
-                
-                # Create NewsItem with enhanced raw data
-                news_items.append(NewsItem(
-                    source=f"SEC ({form_type})",
-                    title=title,
-                    link=link,
-                    published=published_str,
-                    summary=summary,
-                    ticker=ticker,
-                    raw={
-                        "form_type": form_type,
-                        "is_clinical": is_clinical,
-                        "filing_url": link,
-                    }
-                ))
+            news_items = Batch()
+            seen_guids: Set[str] = set()
+            totals = {"filtered": 0, "clinical": 0, "skipped": 0, "pages": 0}
+            for items, counts in filter(None, results):
+                news_items.defer(items.ack)
+                for item in items:
+                    guid = item.raw.get("guid", "")
+                    if guid in seen_guids:
+                        continue
+                    seen_guids.add(guid)
+                    news_items.append(item)
+                for k in totals:
+                    totals[k] += counts[k]
+            if self.auto_ack:
+                news_items.ack()
+            self.state_store.save()
             
             logger.info(
                 f"🏛️  SEC Filtered: fetched {len(news_items)} items "
-                f"(filtered out {filtered_count}, {clinical_count} clinical/pharma)"
+                f"(filtered out {totals['filtered']}, {totals['clinical']} clinical/pharma, "
+                f"{totals['skipped']} already seen, {totals['pages']} pages"
+                + (f", {failed} streams failed)" if failed else ")")
             )
             return news_items
             
         except Exception as e:
+            breaker.record_failure()
             logger.exception(f"Error fetching SEC filings: {e}")
             return []
     
+    def _try_stream(self, url: str) -> Optional[Tuple[Batch, Dict[str, int]]]:
+        """_fetch_stream(), or None if the stream failed (its state is left as it was)."""
+        try:
+            return self._fetch_stream(url)
+        except Exception as e:
+            logger.error(f"❌ SEC Filtered: error fetching {url}: {e}")
+            return None
+    
+    def _fetch_stream(self, url: str) -> Tuple[Batch, Dict[str, int]]:
+        """
+        Fetch one EDGAR stream, walking back pages until a known filing.
+        
+        Page 0's validators / body hash and the high-water mark are written
+        to the stream state only after every page succeeded, when the batch
+        is acked; if a later page fails, the next poll refetches page 0 and
+        walks back again.
+        """
+        counts = {"filtered": 0, "clinical": 0, "skipped": 0, "pages": 0}
+        items = Batch()
+        state = self.state_store.get(url)
+        page_size = self._page_size(url)
+        
+        # High-water mark: stop at filings we already returned, or at the
+        # newest accession of the last poll (the cursor), whichever comes first
+        wm = Watermark(state)
+        cursor = state.get("last_accession", "")
+        this_poll: Set[str] = set()
+        newest_guid = ""
+        
+        # First poll of a stream: take the latest page only, don't backfill history
+        max_pages = self.max_pages if wm.newest is not None else 1
+        
+        for page in range(max_pages):
+            self._throttle()
+            if page == 0:
+                result = conditional_get(self.session, url, SEC_HEADERS, state, timeout=25, defer=True)
+                if result.unchanged:
+                    logger.debug(f"🏛️  SEC Filtered: {url} unchanged ({result.unchanged_reason}), skipped parse")
+                    return items, counts
+                content = result.content
+            else:
+                resp = self.session.get(self._page_url(url, page * page_size), headers=SEC_HEADERS, timeout=25)
+                if resp.status_code >= 400:
+                    raise RuntimeError(f"HTTP {resp.status_code}")
+                content = resp.content
+            counts["pages"] += 1
+            
+            entries = iter_entries(
+                content,
+                fast=state.get("parser") != "feedparser",
+                on_fallback=lambda err: state.update(parser="feedparser"),
+            )
+            
+            reached_known = False
+            on_page = 0
+            for entry in entries:
+                on_page += 1
+                link = entry.link
+                guid = entry.guid or link
+                if guid in this_poll:
+                    continue  # shifted down from the previous page
+                if cursor and self._accession_number(guid) == cursor:
+                    reached_known = True
+                    break
+                entry_dt = parse_datetime_utc(entry.updated or entry.published)
+                if wm.seen(guid):
+                    if wm.reached(entry_dt):
+                        reached_known = True
+                        break
+                    continue
+                wm.add(guid, entry_dt)
+                this_poll.add(guid)
+                newest_guid = newest_guid or guid
+                
+                item = self._entry_to_item(entry, guid)
+                if item is None:
+                    counts["filtered"] += 1
+                    continue
+                if item.raw["is_clinical"]:
+                    counts["clinical"] += 1
+                items.append(item)
+            
+            # Stop when we reached the cursor, or the page wasn't full (end of feed)
+            if reached_known or on_page < page_size:
+                break
+        else:
+            if max_pages > 1:
+                logger.warning(f"🏛️  SEC Filtered: hit max_pages={max_pages} before reaching last seen filing ({url})")
+        
+        counts["skipped"] = wm.skipped
+        items.defer(wm.commit)
+        items.defer(partial(result.commit, state))
+        if newest_guid:
+            items.defer(partial(state.update, last_accession=self._accession_number(newest_guid) or newest_guid))
+        return items, counts
+    
+    def _entry_to_item(self, entry: FeedEntry, guid: str) -> Optional[NewsItem]:
+        """Build a NewsItem for an allowed form, or None if filtered out."""
+        link = entry.link
+        
+        # Extract filing type from title
+        # Title format: "8-K - COMPANY NAME (0001234567) (Filer)"
+        title = entry.title
+        form_type = self._extract_form_type(title)
+        
+        # Filter: only allow specific forms
+        if form_type not in self.ALLOWED_FORMS:
+            return None
+        
+        # Extract ticker from entry (SEC provides CIK, we'll extract from title)
+        ticker = self._extract_ticker_from_title(title)
+        
+        published = entry.published
+        
+        # Parse date
+        published_dt = parse_date(published)
+        published_str = published_dt.isoformat() if published_dt else ""
+        
+        # Create NewsItem with enhanced raw data (plain-text, bounded summary)
+        item = normalize_item(NewsItem(
+            source=f"SEC ({form_type})",
+            title=title,
+            link=link,
+            published=published_str,
+            summary=entry.summary,
+            ticker=ticker,
+            raw={
+                "form_type": form_type,
+                "filing_url": link,
+                "guid": guid,
+            }
+        ), self.summary_limit)
+        
+        # Check for clinical trial / vaccine keywords
+        item.raw["is_clinical"] = self._is_clinical_related(item.title, item.summary)
+        return item
+    
+    def _throttle(self) -> None:
+        """Space out SEC requests across all streams (SEC fair-access policy)."""
+        with self._throttle_lock:
+            wait = self._last_request + self.min_request_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request = time.monotonic()
+    
+    @staticmethod
+    def _page_size(url: str) -> int:
+        query = dict(parse_qsl(urlsplit(url).query, keep_blank_values=True))
+        try:
+            return int(query.get("count", 100))
+        except ValueError:
+            return 100
+    
+    @staticmethod
+    def _page_url(url: str, start: int) -> str:
+        parts = urlsplit(url)
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != "start"]
+        query.append(("start", str(start)))
+        return urlunsplit(parts._replace(query=urlencode(query)))
+    
+    @staticmethod
+    def _accession_number(guid: str) -> str:
+        """'urn:tag:sec.gov,2008:accession-number=0001234567-26-000001' -> '0001234567-26-000001'"""
+        match = _ACCESSION_RE.search(guid or "")
+        return match.group(0) if match else ""
+    
+    def get_cache_stats(self) -> dict:
+        """Conditional GET counters per EDGAR stream (304s, body-hash hits)."""
+        return {url: cache_counters(self.state_store.get(url)) for url in self.stream_urls}
+    
     def _extract_form_type(self, title: str) -> str:
         """
         Extract form type from SEC filing title.
@@ -219,11 +445,10 @@ class SECFilteredCollector:
         Returns:
             True if filing contains clinical/pharma keywords
         """
-        combined_text = f"{title} {summary}".lower()
+        combined_text = " ".join(f"{title} {summary}".lower().split())
         
-        for pattern in self.clinical_patterns:
-            if pattern.search(combined_text):
-                return True
+        for _ in self.CLINICAL_MATCHER.finditer(combined_text):
+            return True
         
         return False
 
@@ -6,11 +6,21 @@ Documentation: https://www.thenewsapi.com/documentation
 """
 
 from __future__ import annotations
-from typing import List
+from typing import List, Optional
 import logging
 import requests
 from datetime import datetime, timedelta, timezone
+from collectors.ingest import DEFAULT_SUMMARY_LIMIT, normalize_item
+from collectors.watermark import Batch, Watermark
 from core.models import NewsItem
+from core.quota_budget import QuotaBudget
+from storage.feed_state import FeedStateStore, get_feed_state
+from utils.circuit_breaker import get_breakers
+from utils.date_utils import parse_datetime_utc
+from utils.http_client import get_http_client
+
+# Re-request a few minutes before the cursor: articles are sometimes indexed late
+CURSOR_OVERLAP = timedelta(minutes=5)
 
 logger = logging.getLogger("market_radar.thenewsapi")
 
@@ -26,7 +36,7 @@ class TheNewsAPICollector:
     - Source filtering
     
     Rate Limits:
-    - Free: 100 requests/day
+    - Free: 100 requests/day, spread over the day by a QuotaBudget
     - Results: up to 100 articles per request
     """
     
@@ -38,6 +48,9 @@ class TheNewsAPICollector:
         categories: str = "business,tech",
         language: str = "en",
         limit: int = 50,
+        budget: Optional[QuotaBudget] = None,
+        state_store: Optional[FeedStateStore] = None,
+        summary_limit: int = DEFAULT_SUMMARY_LIMIT,
     ):
         """
         Initialize TheNewsAPI collector
@@ -47,12 +60,21 @@ class TheNewsAPICollector:
             categories: Comma-separated categories (business, tech, sports, etc.)
             language: Language code (en, es, fr, etc.)
             limit: Number of articles to fetch (max 100)
+            budget: Daily request budget (default: 100 requests/day)
+            state_store: Persistent state (cursor, budget usage)
+            summary_limit: Max summary characters kept for analysis (collectors.ingest)
         """
         self.api_token = api_token
         self.categories = categories
         self.language = language
         self.limit = limit
         self._last_fetch_time = None
+        self.http = get_http_client()
+        self.state_store = state_store or get_feed_state()
+        # False: the caller acks the returned batch after processing (watermark.Batch)
+        self.auto_ack = True
+        self.summary_limit = summary_limit
+        self.budget = budget or QuotaBudget("TheNewsAPI", daily_limit=100, state_store=self.state_store)
     
     def fetch(self) -> List[NewsItem]:
         """
@@ -65,9 +87,20 @@ class TheNewsAPICollector:
             logger.warning("TheNewsAPI token not configured")
             return []
         
+        if not self.budget.can_call():
+            logger.debug(f"TheNewsAPI: daily budget paced, next call at {self.budget.next_call_time():%H:%M %Z}")
+            return []
+        
+        breaker = get_breakers().get("TheNewsAPI")
+        if not breaker.allow():
+            logger.debug(f"TheNewsAPI: circuit open, skipped (retry in {breaker.retry_in():.0f}s)")
+            return []
+        
         try:
-            # Get news from last 24 hours
-            published_after = (datetime.now(timezone.utc) - timedelta(hours=24)).strftime("%Y-%m-%d")
+            # Incremental cursor (minute precision); first run: last 24 hours
+            wm = Watermark(self.state_store.get("api:TheNewsAPI"))
+            since = wm.since(CURSOR_OVERLAP) or (datetime.now(timezone.utc) - timedelta(hours=24)).replace(second=0, microsecond=0)
+            published_after = since.strftime("%Y-%m-%dT%H:%M:%S")
             
             params = {
                 "api_token": self.api_token,
@@ -75,18 +108,25 @@ class TheNewsAPICollector:
                 "language": self.language,
                 "limit": self.limit,
                 "published_after": published_after,
+                "sort": "published_at",
             }
             
             logger.debug(f"Fetching from TheNewsAPI: categories={self.categories}, limit={self.limit}")
             
-            response = requests.get(
+            self.budget.record()
+            response = self.http.get(
                 self.BASE_URL,
                 params=params,
                 timeout=30,
             )
+            if response.status_code in (402, 429):
+                logger.warning(f"TheNewsAPI usage limit reached (HTTP {response.status_code})")
+                self.budget.exhaust()
+                return []
             response.raise_for_status()
             
             data = response.json()
+            breaker.record_success()
             
             # Check for errors
             if "error" in data:
@@ -95,26 +135,39 @@ class TheNewsAPICollector:
             
             # Parse articles
             articles = data.get("data", [])
-            items = []
+            items = Batch()
             
             for article in articles:
                 try:
                     item = self._parse_article(article)
-                    if item:
-                        items.append(item)
+                    if not item:
+                        continue
+                    key = article.get("uuid") or item.link
+                    published_dt = parse_datetime_utc(item.published)
+                    if wm.seen(key):
+                        continue
+                    wm.add(key, published_dt)
+                    items.append(item)
                 except Exception as e:
                     logger.warning(f"Failed to parse article: {e}")
                     continue
             
-            logger.info(f"📰 TheNewsAPI: fetched {len(items)} news items")
+            items.defer(wm.commit)
+            if self.auto_ack:
+                items.ack()
+            self.state_store.save()
+            
+            logger.info(f"📰 TheNewsAPI: fetched {len(items)} news items ({len(articles) - len(items)} already seen)")
             self._last_fetch_time = datetime.now(timezone.utc)
             
             return items
             
         except requests.exceptions.RequestException as e:
+            breaker.record_failure()
             logger.error(f"TheNewsAPI request failed: {e}")
             return []
         except Exception as e:
+            breaker.record_failure()
             logger.error(f"TheNewsAPI collector error: {e}", exc_info=True)
             return []
     
@@ -137,7 +190,7 @@ class TheNewsAPICollector:
         published = article.get("published_at", "")
         
         # Create NewsItem
-        item = NewsItem(
+        item = normalize_item(NewsItem(
             source=f"TheNewsAPI ({article.get('source', 'Unknown')})",
             title=article.get("title", ""),
             link=article.get("url", ""),
@@ -151,7 +204,7 @@ class TheNewsAPICollector:
                     "image_url": article.get("image_url"),
                 }
             }
-        )
+        ), self.summary_limit)
         
         return item
     
@@ -163,5 +216,6 @@ class TheNewsAPICollector:
             "rate_limit": "100 requests/day (free tier)",
             "categories": self.categories,
             "limit_per_request": self.limit,
+            **self.budget.get_usage_info(),
         }
 
@@ -0,0 +1,115 @@
+"""
+Per-Feed High-Water Marks
+=========================
+Remembers, per feed, the newest published timestamp seen plus a bounded
+list of recent entry keys (guid / id / link). Collectors consult it while
+walking a feed's entries so already-seen entries are never turned into
+NewsItems:
+
+    wm = Watermark(state_store.get(url))
+    for entry in entries:
+        key = ...
+        published_dt = ...
+        if wm.seen(key):
+            if wm.reached(published_dt):
+                break          # everything below is older
+            continue
+        ...build NewsItem...
+        wm.add(key, published_dt)
+    return Batch(items, [wm.commit])
+
+The mark is stored inside the feed's state dict (storage.feed_state), so
+it survives restarts together with the HTTP validators.
+
+A fetch returns its items as a Batch that carries the mark's commit (and
+the feed's staged validators). Standalone, collectors ack() the batch
+before returning it; the pipeline turns that off (auto_ack = False) and
+acks each batch only after all of its items were scored, stored and
+alerted, so a crash or error mid-batch refetches those entries next poll
+instead of skipping them (the store drops the ones that were handled).
+
+API collectors use the same mark as an incremental cursor: since() is sent
+as the API's "published after" parameter (with a small overlap for late
+indexing) and seen() drops the articles returned again.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+DEFAULT_MAX_KEYS = 500
+
+
+class Watermark:
+    def __init__(self, state: Dict[str, Any], max_keys: int = DEFAULT_MAX_KEYS):
+        self._state = state
+        self.max_keys = max_keys
+
+        raw = state.get("watermark") or {}
+        self.newest: Optional[float] = raw.get("newest")
+        self._keys: List[str] = list(raw.get("keys") or [])[-max_keys:]
+        self._key_set = set(self._keys)
+        self.skipped = 0
+
+    def seen(self, key: str) -> bool:
+        hit = bool(key) and key in self._key_set
+        if hit:
+            self.skipped += 1
+        return hit
+
+    def reached(self, published: Optional[datetime]) -> bool:
+        """True if `published` is at or below the high-water mark (or unknown)."""
+        if self.newest is None:
+            return False
+        if published is None:
+            return True
+        return published.timestamp() <= self.newest
+
+    def since(self, overlap: timedelta = timedelta(0)) -> Optional[datetime]:
+        """
+        The mark as a UTC datetime floored to the minute, minus `overlap`
+        (API cursor), or None if nothing was seen yet.
+        """
+        if self.newest is None:
+            return None
+        dt = datetime.fromtimestamp(self.newest, tz=timezone.utc) - overlap
+        return dt.replace(second=0, microsecond=0)
+
+    def add(self, key: str, published: Optional[datetime] = None) -> None:
+        if key and key not in self._key_set:
+            self._keys.append(key)
+            self._key_set.add(key)
+        if published is not None:
+            ts = published.timestamp()
+            if self.newest is None or ts > self.newest:
+                self.newest = ts
+
+    def commit(self) -> None:
+        """Trim to max_keys (oldest first) and write back into the state dict."""
+        if len(self._keys) > self.max_keys:
+            drop = self._keys[: len(self._keys) - self.max_keys]
+            self._keys = self._keys[-self.max_keys:]
+            self._key_set.difference_update(drop)
+        self._state["watermark"] = {"newest": self.newest, "keys": list(self._keys)}
+
+
+class Batch(list):
+    """
+    New items of one fetch, plus the state updates (watermark commit,
+    staged validators) that mark them as handled. ack() applies the
+    updates once; until then the next fetch returns the items again.
+    """
+
+    def __init__(self, items: Iterable[Any] = (), commits: Iterable[Callable[[], None]] = ()):
+        super().__init__(items)
+        self._commits: List[Callable[[], None]] = list(commits)
+
+    def defer(self, commit: Callable[[], None]) -> None:
+        """Add a state update to apply on ack()."""
+        self._commits.append(commit)
+
+    def ack(self) -> None:
+        commits, self._commits = self._commits, []
+        for commit in commits:
+            commit()
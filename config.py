@@ -13,7 +13,36 @@ def _get_bool(key: str, default: bool = False) -> bool:
 class Settings:
     poll_seconds: int = int(os.getenv("POLL_SECONDS", "30"))
     min_impact_score: int = int(os.getenv("MIN_IMPACT_SCORE", "70"))
+
+    # Per-source adaptive scheduling (intervals in seconds)
+    sched_min_seconds: int = int(os.getenv("SCHED_MIN_SECONDS", "15"))  # Fastest poll for any source
+    sched_max_seconds: int = int(os.getenv("SCHED_MAX_SECONDS", "300"))  # Slowest poll for quiet sources
+    sched_priority_max_seconds: int = int(os.getenv("SCHED_PRIORITY_MAX_SECONDS", "30"))  # Ceiling for SEC / wire services
+
+    # Sources: RSS feeds + collector overrides (JSON, or an OPML export)
+    sources_file: str = os.getenv("SOURCES_FILE", "data/sources.json")
+
+    # RSS fetching
+    rss_concurrent: bool = _get_bool("RSS_CONCURRENT", True)  # Fetch RSS sources in parallel
+    rss_max_workers: int = int(os.getenv("RSS_MAX_WORKERS", "8"))  # Thread pool size
+    rss_max_per_host: int = int(os.getenv("RSS_MAX_PER_HOST", "2"))  # Parallel requests per host
+    fast_feed_parser: bool = _get_bool("FAST_FEED_PARSER", True)  # lxml streaming parser (falls back to feedparser)
+    collector_deadline_seconds: float = float(os.getenv("COLLECTOR_DEADLINE_SECONDS", "40"))  # Per-collector fetch deadline per poll
+    summary_max_chars: int = int(os.getenv("SUMMARY_MAX_CHARS", "1000"))  # Summary chars kept for analysis (0 = no cap)
+    http_warm_up: bool = _get_bool("HTTP_WARM_UP", True)  # Pre-connect due sources' hosts before each poll
+    http_capture_file: str = os.getenv("HTTP_CAPTURE_FILE", "")  # Record every HTTP response to this archive
+    http_replay_file: str = os.getenv("HTTP_REPLAY_FILE", "")  # Answer HTTP requests from this archive (offline)
+    http_replay_speed: float = float(os.getenv("HTTP_REPLAY_SPEED", "0"))  # Recorded latency: 1 = real time, 0 = none
     
+    # Cross-source near-duplicates (same story syndicated under different links)
+    enable_near_dup: bool = _get_bool("ENABLE_NEAR_DUP", True)
+    near_dup_max_distance: int = int(os.getenv("NEAR_DUP_MAX_DISTANCE", "7"))  # SimHash bits (of 64) that may differ
+    near_dup_window_hours: float = float(os.getenv("NEAR_DUP_WINDOW_HOURS", "6"))  # How long an event stays matchable
+
+    # Event clustering (several articles about one ticker + topic = one alert)
+    enable_event_clustering: bool = _get_bool("ENABLE_EVENT_CLUSTERING", True)
+    event_cluster_window_minutes: float = float(os.getenv("EVENT_CLUSTER_WINDOW_MINUTES", "60"))  # Open after the last article
+
     # Logging
     verbose_logging: bool = _get_bool("VERBOSE_LOGGING", False)
     
@@ -35,18 +64,26 @@ class Settings:
     # SEC Filtered Collector
     enable_sec_filtered: bool = _get_bool("ENABLE_SEC_FILTERED", True)  # Use filtered SEC (8-K, S-4)
     enable_sec_legacy: bool = _get_bool("ENABLE_SEC_LEGACY", False)  # Use old SEC collector (all forms)
+    sec_max_pages: int = int(os.getenv("SEC_MAX_PAGES", "5"))  # Pages (100 filings each) to catch up per form after a burst
     
     # Alpha Vantage API
     enable_alpha_vantage: bool = _get_bool("ENABLE_ALPHA_VANTAGE", False)
     alpha_vantage_api_key: str = os.getenv("ALPHA_VANTAGE_API_KEY", "")
     
+    # Daily quota pacing for the premium APIs ("HH:MM-HH:MM=weight", US/Eastern, later windows win)
+    api_quota_schedule: str = os.getenv("API_QUOTA_SCHEDULE", "00:00-24:00=0.25,04:00-09:30=2,09:30-16:00=3,16:00-20:00=1")
+    alpha_vantage_daily_limit: int = int(os.getenv("ALPHA_VANTAGE_DAILY_LIMIT", "25"))  # Requests/day
+    
     # TheNewsAPI
     enable_thenewsapi: bool = _get_bool("ENABLE_THENEWSAPI", False)
     thenewsapi_token: str = os.getenv("THENEWSAPI_TOKEN", "")
+    thenewsapi_daily_limit: int = int(os.getenv("THENEWSAPI_DAILY_LIMIT", "100"))  # Requests/day
     
     # NewsAPI.ai
     enable_newsapi_ai: bool = _get_bool("ENABLE_NEWSAPI_AI", False)
     newsapi_ai_key: str = os.getenv("NEWSAPI_AI_KEY", "")
+    newsapi_ai_daily_tokens: int = int(os.getenv("NEWSAPI_AI_DAILY_TOKENS", "2000"))  # Tokens/day
+    newsapi_ai_tokens_per_call: int = int(os.getenv("NEWSAPI_AI_TOKENS_PER_CALL", "10"))
 
     # Validation
     min_gap_pct: float = float(os.getenv("MIN_GAP_PCT", "4.0"))
@@ -0,0 +1,128 @@
+"""
+Aho-Corasick Keyword Automaton
+==============================
+Finds every occurrence of a set of phrases in one left-to-right pass over
+the text: cost grows with the text length (and the number of hits), not
+with the number of phrases, so keyword dictionaries can grow to thousands
+of entries without slowing scoring down.
+
+- Case-insensitive: phrases and text are lowercased.
+- Per-phrase word boundaries: a phrase added with whole_word=True only
+  matches where r"\\b" + re.escape(phrase) + r"\\b" would; other
+  phrases match anywhere, like `phrase in text`. (phrase, left, right)
+  sets the two edges separately (r"\\bvaccine" = ("vaccine", True, False)).
+- Built once (trie + failure links, BFS); searches are read-only, so one
+  automaton can be shared between threads.
+
+    ac = AhoCorasick([("merger", False), ("nda", True)])
+    for start, end, pid in ac.finditer(text):
+        ac.patterns[pid]
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple, Union
+
+PatternSpec = Union[str, Tuple[str, bool], Tuple[str, bool, bool]]
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class AhoCorasick:
+    def __init__(self, patterns: Iterable[PatternSpec] = (), whole_word: bool = False):
+        """
+        Args:
+            patterns: Phrases, (phrase, whole_word) or (phrase, left, right) boundary
+                      specs; a phrase's id is its position
+            whole_word: Default boundary mode for plain-string phrases
+        """
+        self.patterns: List[str] = []
+        self.whole_word: List[bool] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        # (length, left / right boundary, first / last char is a word char)
+        self._meta: List[Tuple[int, bool, bool, bool, bool]] = []
+        for spec in patterns:
+            if isinstance(spec, str):
+                self._insert(spec, whole_word, whole_word)
+            elif len(spec) == 2:
+                self._insert(spec[0], spec[1], spec[1])
+            else:
+                self._insert(*spec)
+        self._build()
+
+    def _insert(self, phrase: str, left: bool, right: bool) -> None:
+        phrase = phrase.lower()
+        if not phrase:
+            raise ValueError("empty phrase")
+        pid = len(self.patterns)
+        self.patterns.append(phrase)
+        self.whole_word.append(left and right)
+        self._meta.append((len(phrase), left, right, _is_word(phrase[0]), _is_word(phrase[-1])))
+        state = 0
+        for ch in phrase:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] += (pid,)
+
+    def _build(self) -> None:
+        """Failure links by BFS; each state's outputs include its failure chain's."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def finditer(self, text: str, lowered: bool = False) -> Iterator[Tuple[int, int, int]]:
+        """
+        Args:
+            lowered: `text` is already lowercased
+
+        Yields:
+            (start, end, phrase id) for each match in the lowercased text,
+            in order of `end`
+        """
+        if not lowered:
+            text = text.lower()
+        goto, fail, out, meta = self._goto, self._fail, self._out, self._meta
+        n = len(text)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            for pid in out[state]:
+                length, left, right, first_word, last_word = meta[pid]
+                start = end - length
+                # \b: word / non-word transition at the edge
+                if left and (start > 0 and _is_word(text[start - 1])) == first_word:
+                    continue
+                if right and (end < n and _is_word(text[end])) == last_word:
+                    continue
+                yield start, end, pid
+
+    def matches(self, text: str, lowered: bool = False) -> Set[int]:
+        """Ids of the phrases that occur in `text` (each once)."""
+        return {pid for _, _, pid in self.finditer(text, lowered)}
+
+    def __len__(self) -> int:
+        return len(self.patterns)
@@ -5,8 +5,13 @@ Loads:
 - Built-in seed mappings (small, curated)
 - Optional large JSON mapping: data/company_to_ticker.json (generated automatically)
 
+The merged maps live in the security master (core.security_master),
+which loads them from its compiled artifact; the getters below are
+views of it.
+
 Provides:
 - normalize_company_name()
+- normalized_tokens()
 - get_company_to_ticker()
 - get_aliases()
 - get_all_tickers()
@@ -16,7 +21,7 @@ Provides:
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, Set, Optional
+from typing import Dict, List, Set, Tuple
 import json
 import re
 
@@ -91,10 +96,8 @@ BLACKLIST: Set[str] = {
 # ============================================================
 DEFAULT_JSON_PATH = Path("data") / "company_to_ticker.json"
 
-_COMPANY_TO_TICKER: Optional[Dict[str, str]] = None
-_ALIASES: Optional[Dict[str, str]] = None
-
 _PUNCT_RE = re.compile(r"[^\w\s]+", re.UNICODE)
+_TOKEN_RE = re.compile(r"\S+")
 
 
 # ============================================================
@@ -109,23 +112,31 @@ def normalize_company_name(name: str) -> str:
     - remove stop words
     - collapse spaces
     """
-    if not name:
-        return ""
+    return " ".join(w for w, _ in normalized_tokens(name))
+
+
+def normalized_tokens(text: str) -> List[Tuple[str, int]]:
+    """
+    The words of normalize_company_name(text), each with its offset in
+    the lowercased text.
+    """
+    if not text:
+        return []
 
-    name = name.lower()
-    name = _PUNCT_RE.sub(" ", name)
+    text = _PUNCT_RE.sub(" ", text.lower())
 
     words = []
-    for w in name.split():
+    for m in _TOKEN_RE.finditer(text):
+        w = m.group()
         if w in STOP_WORDS:
             continue
         if w in BLACKLIST:
             continue
         if len(w) <= 1:
             continue
-        words.append(w)
+        words.append((w, m.start()))
 
-    return " ".join(words)
+    return words
 
 
 def _load_json_mapping(path: Path) -> Dict[str, str]:
@@ -165,41 +176,21 @@ def get_company_to_ticker(json_path: Path = DEFAULT_JSON_PATH) -> Dict[str, str]
     - seed (manual, overrides)
     - JSON mapping (NASDAQ + S&P500)
     """
-    global _COMPANY_TO_TICKER
-    if _COMPANY_TO_TICKER is not None:
-        return _COMPANY_TO_TICKER
-
-    merged: Dict[str, str] = {}
-
-    # Seed first (highest priority)
-    for k, v in SEED_COMPANY_TO_TICKER.items():
-        merged[normalize_company_name(k)] = v.upper().strip()
+    from .security_master import get_security_master
 
-    # Auto JSON (lower priority)
-    merged.update(_load_json_mapping(json_path))
-
-    _COMPANY_TO_TICKER = merged
-    return _COMPANY_TO_TICKER
+    return get_security_master(json_path).company_to_ticker
 
 
 def get_aliases() -> Dict[str, str]:
-    global _ALIASES
-    if _ALIASES is not None:
-        return _ALIASES
+    from .security_master import get_security_master
 
-    _ALIASES = {
-        normalize_company_name(k): v.upper().strip()
-        for k, v in SEED_ALIASES.items()
-    }
-    return _ALIASES
+    return get_security_master().aliases
 
 
 def get_all_tickers(json_path: Path = DEFAULT_JSON_PATH) -> Set[str]:
-    m = get_company_to_ticker(json_path)
-    a = get_aliases()
-    tickers = set(m.values())
-    tickers.update(a.values())
-    return tickers
+    from .security_master import get_security_master
+
+    return set(get_security_master(json_path).known)
 
 
 def get_company_names(json_path: Path = DEFAULT_JSON_PATH) -> Set[str]:
@@ -0,0 +1,159 @@
+"""
+Event Clustering (per ticker)
+=============================
+Five articles about the same deal within minutes are one event: the
+first article (the lead) opens a cluster keyed by (ticker, topic); later
+articles with the same ticker and topic join it while it is open.
+
+- The lead gets the only market validation, signal evaluation and
+  notification; members inherit its validation result.
+- Notifiers that can edit a sent message (Telegram) update the lead's
+  alert with the sources that joined, instead of sending a new one.
+- A cluster stays open for `window` seconds after its last article.
+- The index is keyed by ticker (a handful of clusters per ticker), plus
+  member uid -> cluster so syndicated copies of a member can join too.
+- SQLiteStore persists clusters; on startup the open ones are loaded
+  back, so a restart doesn't split an event.
+
+    clusters = EventClusterIndex(window=3600)
+    cluster = clusters.find(item.ticker, topic)
+    if cluster is None:
+        cluster = clusters.open(item, topic)   # validate + notify
+    else:
+        clusters.join(cluster, item)           # update the alert
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from core.models import NewsItem
+
+
+@dataclass
+class EventCluster:
+    cluster_id: str  # uid of the lead article
+    ticker: str
+    topic: str
+    started: float
+    updated: float
+    impact_score: int = 0
+    validated: bool = False
+    validation_reason: str = ""
+    members: List[Dict[str, str]] = field(default_factory=list)  # {uid, source, title, link}, lead first
+    messages: Dict[str, Any] = field(default_factory=dict)  # notifier -> sent message ref (for edits)
+
+    @property
+    def size(self) -> int:
+        return len(self.members)
+
+    @property
+    def sources(self) -> List[str]:
+        """Distinct member sources, in arrival order."""
+        return list(dict.fromkeys(m["source"] for m in self.members))
+
+    def add_member(self, item: NewsItem) -> None:
+        self.members.append({"uid": item.uid, "source": item.source, "title": item.title, "link": item.link})
+
+
+class EventClusterIndex:
+    def __init__(self, window: float = 3600, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            window: Seconds a cluster stays open after its last article
+            clock: Wall clock (injectable for tests)
+        """
+        self.window = window
+        self.clock = clock
+        self._by_ticker: Dict[str, List[EventCluster]] = {}
+        self._by_member: Dict[str, EventCluster] = {}
+        self._lock = threading.Lock()
+
+        self.opened = 0
+        self.joined = 0
+
+    def _open_clusters(self, ticker: str, now: float) -> List[EventCluster]:
+        """Open clusters for `ticker`, dropping the expired ones."""
+        clusters = self._by_ticker.get(ticker)
+        if not clusters:
+            return []
+        cutoff = now - self.window
+        alive = [c for c in clusters if c.updated >= cutoff]
+        if len(alive) != len(clusters):
+            for c in clusters:
+                if c.updated < cutoff:
+                    for m in c.members:
+                        self._by_member.pop(m["uid"], None)
+            if alive:
+                self._by_ticker[ticker] = alive
+            else:
+                del self._by_ticker[ticker]
+        return alive
+
+    def find(self, ticker: str, topic: str) -> Optional[EventCluster]:
+        """The open cluster for this ticker and topic (None if there is none)."""
+        if not ticker:
+            return None
+        with self._lock:
+            for c in self._open_clusters(ticker.upper(), self.clock()):
+                if c.topic == topic:
+                    return c
+        return None
+
+    def cluster_of(self, uid: str) -> Optional[EventCluster]:
+        """The open cluster `uid` belongs to (None if none)."""
+        with self._lock:
+            c = self._by_member.get(uid)
+            if c is None or c.updated < self.clock() - self.window:
+                return None
+            return c
+
+    def open(self, item: NewsItem, topic: str) -> EventCluster:
+        """Start a cluster with `item` as its lead."""
+        now = self.clock()
+        cluster = EventCluster(
+            cluster_id=item.uid,
+            ticker=(item.ticker or "").upper(),
+            topic=topic,
+            started=now,
+            updated=now,
+            impact_score=item.impact_score,
+        )
+        cluster.add_member(item)
+        with self._lock:
+            self._by_ticker.setdefault(cluster.ticker, []).append(cluster)
+            self._by_member[item.uid] = cluster
+            self.opened += 1
+        return cluster
+
+    def join(self, cluster: EventCluster, item: NewsItem) -> None:
+        """Add `item` to `cluster` (keeps it open for another window)."""
+        with self._lock:
+            cluster.add_member(item)
+            cluster.updated = self.clock()
+            cluster.impact_score = max(cluster.impact_score, item.impact_score)
+            self._by_member[item.uid] = cluster
+            self.joined += 1
+
+    def load(self, clusters: Iterable[EventCluster]) -> int:
+        """Restore persisted clusters (expired ones are ignored). Returns the count kept."""
+        now = self.clock()
+        kept = 0
+        with self._lock:
+            for c in clusters:
+                if c.updated < now - self.window:
+                    continue
+                self._by_ticker.setdefault(c.ticker, []).append(c)
+                for m in c.members:
+                    self._by_member[m["uid"]] = c
+                kept += 1
+        return kept
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._by_ticker.values())
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"clusters": len(self), "opened": self.opened, "joined": self.joined}
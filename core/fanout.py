@@ -0,0 +1,210 @@
+"""
+Parallel Collector Fan-Out
+==========================
+Starts every due collector at once instead of one after another, and
+streams their results back as they arrive.
+
+- A task returns an iterable of batches (a generator, e.g. one batch per
+  RSS feed). Batches go through a bounded queue, so the poll loop can
+  score and notify the first feed while the slowest is still downloading,
+  and a burst can't pile up more than `max_queued` batches in memory -
+  producers wait until the loop catches up.
+- Each task has its own deadline. A task that misses it keeps running in
+  the background and the poll goes on without it (`last_missed`).
+- A task still running when the next poll starts is not started again
+  (`last_busy`). Whatever it produced after its deadline is delivered
+  with the next poll (`last_late`), and so is whatever was still queued
+  when the caller stopped early (an error while processing a batch) -
+  nothing a collector returned is dropped.
+
+    fanout = FanOut(max_workers=8)
+    for key, batch in fanout.run({"RSS": (rss_batches, 30.0), "SEC": (sec_batches, 20.0)}):
+        ...
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+logger = logging.getLogger("market_radar.fanout")
+
+Task = Tuple[Callable[[], Iterable[Any]], float]  # (batch producer, deadline in seconds)
+
+_DONE = object()
+
+
+class _Stream:
+    """One running task: where its batches go, and whether anyone still waits for them."""
+
+    def __init__(self, key: str, deadline: float):
+        self.key = key
+        self.deadline = deadline
+        self.lock = threading.Lock()
+        self.detached = False  # past its deadline: batches go to `late`
+        self.late: List[Any] = []
+        self.finished = False
+        self.elapsed = 0.0
+
+
+class FanOut:
+    def __init__(
+        self,
+        max_workers: int = 8,
+        max_queued: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_workers: Collectors that may run at the same time
+            max_queued: Batches buffered between collectors and the poll loop
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.clock = clock
+        self.max_queued = max(1, max_queued)
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="collect")
+        self._detached: Dict[str, _Stream] = {}  # missed their deadline, may still be running
+        self._lock = threading.Lock()
+
+        self.last_timings: Dict[str, float] = {}
+        self.last_missed: List[str] = []
+        self.last_busy: List[str] = []
+        self.last_late: List[str] = []
+
+    def run(self, tasks: Dict[str, Task]) -> Iterator[Tuple[str, Any]]:
+        """
+        Start all `tasks` and yield (task key, batch) as batches arrive.
+
+        Batches a task produced after an earlier poll's deadline are
+        yielded first. A task that raises is logged; batches it produced
+        before that are still delivered.
+        """
+        self.last_timings = {}
+        self.last_missed = []
+        self.last_busy = []
+        self.last_late = []
+
+        busy = set()
+        late: List[Tuple[str, Any]] = []
+        with self._lock:
+            for key, stream in list(self._detached.items()):
+                with stream.lock:
+                    late.extend((key, b) for b in stream.late)
+                    stream.late = []
+                    if stream.finished:
+                        del self._detached[key]
+                    else:
+                        busy.add(key)
+        for key, batch in late:
+            if key not in self.last_late:
+                self.last_late.append(key)
+            yield key, batch
+
+        q: "queue.Queue[Tuple[_Stream, Any]]" = queue.Queue(maxsize=self.max_queued)
+        started = self.clock()
+        active: Dict[str, _Stream] = {}
+        for key, (fn, deadline) in tasks.items():
+            if key in busy:
+                self.last_busy.append(key)
+                logger.info(f"⏳ {key}: previous fetch still running, skipped this poll")
+                continue
+            stream = _Stream(key, started + deadline)
+            active[key] = stream
+            self._pool.submit(self._drive, stream, fn, q, started)
+
+        try:
+            while active:
+                next_deadline = min(s.deadline for s in active.values())
+                try:
+                    stream, batch = q.get(timeout=max(0.0, next_deadline - self.clock()))
+                except queue.Empty:
+                    stream, batch = None, None
+                if stream is not None:
+                    if batch is _DONE:
+                        active.pop(stream.key, None)
+                        self.last_timings[stream.key] = stream.elapsed
+                    else:
+                        yield stream.key, batch
+
+                now = self.clock()
+                for key, s in list(active.items()):
+                    if s.deadline <= now:
+                        del active[key]
+                        self._detach(s)
+                        if not s.finished:
+                            self.last_missed.append(key)
+                            logger.warning(
+                                f"⏱️  {key}: missed its {s.deadline - started:.0f}s deadline, "
+                                f"results will be picked up next poll"
+                            )
+
+            # batches queued before a stream was detached (nothing is added after)
+            while True:
+                try:
+                    stream, batch = q.get_nowait()
+                except queue.Empty:
+                    break
+                if batch is not _DONE:
+                    yield stream.key, batch
+        finally:
+            # caller stopped early (error while processing): don't lose what's still
+            # running, nor what is already queued - both go out with the next poll
+            for s in active.values():
+                self._detach(s)
+            self._requeue(q)
+
+    def _detach(self, stream: _Stream) -> None:
+        with stream.lock:
+            stream.detached = True
+        with self._lock:
+            self._detached[stream.key] = stream
+
+    @staticmethod
+    def _requeue(q: queue.Queue) -> None:
+        """Move batches left in the queue to their (detached) streams' `late`, ahead of newer ones."""
+        queued: Dict[_Stream, List[Any]] = {}
+        while True:
+            try:
+                stream, batch = q.get_nowait()
+            except queue.Empty:
+                break
+            if batch is not _DONE:
+                queued.setdefault(stream, []).append(batch)
+        for stream, batches in queued.items():
+            with stream.lock:
+                stream.late[:0] = batches
+
+    def _drive(self, stream: _Stream, fn: Callable[[], Iterable[Any]], q: queue.Queue, started: float) -> None:
+        """Worker: run one task, pushing its batches to the poll's queue (or `late` once detached)."""
+        try:
+            for batch in fn():
+                self._emit(stream, batch, q)
+        except Exception as e:
+            logger.error(f"❌ {stream.key}: collector failed: {e}", exc_info=True)
+        finally:
+            stream.elapsed = self.clock() - started
+            with stream.lock:
+                stream.finished = True
+            self._emit(stream, _DONE, q)
+
+    @staticmethod
+    def _emit(stream: _Stream, batch: Any, q: queue.Queue) -> None:
+        while True:
+            with stream.lock:
+                if stream.detached:
+                    if batch is not _DONE:
+                        stream.late.append(batch)
+                    return
+                try:
+                    q.put_nowait((stream, batch))
+                    return
+                except queue.Full:
+                    pass
+            time.sleep(0.01)  # the poll loop is busy with earlier batches: back-pressure
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
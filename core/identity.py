@@ -0,0 +1,208 @@
+"""
+Canonical Article Identity
+==========================
+One id per article, however it was fetched. make_uid() hashes the raw
+title|link|published, so tracking parameters, AMP / mobile variants,
+trailing slashes and a republished timestamp each produced a new uid -
+and a new round of scoring, validation calls and alerts.
+
+- canonical_url(): lowercased host without www. / m. / amp. prefixes,
+  no default port, fragment, tracking parameters (utm_*, fbclid, ...),
+  AMP path markers or trailing slash; remaining query sorted.
+- identity_keys(): an item's alternate keys - the feed guid / API id
+  (scoped to its feed) and the canonical URL.
+- IdentityIndex: maps every alternate key to one canonical id. The id is
+  derived from the preferred key (guid, else canonical URL, else the
+  normalized title). An item sharing its guid with a known article gets
+  that article's id; failing that, one sharing its canonical URL does (the
+  same story in another feed, or an event stored before guids were
+  linked), unless that article already has another guid from the same
+  feed - a feed whose items all point at one page. The item's other keys
+  are linked to the id.
+
+SQLiteStore persists the key -> id links (identity_keys table) and
+resolves uids through its index.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from core.models import NewsItem
+
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "yclid",
+    "ref", "ref_src", "cmpid", "ncid", "soc_src", "soc_trk", "yptr", "__source",
+    "guccounter", "guce_referrer", "guce_referrer_sig", "tsrc", ".tsrc",
+    "tpcc", "taid", "sr_share", "smid", "outputtype", "amp",
+})
+_TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "hsa_", "__hs")
+_HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_AMP_SUFFIX_RE = re.compile(r"(?:/amp|\.amp)(?=/?$|\.html?$)", re.I)
+_AMP_SEGMENT_RE = re.compile(r"/amp(?=/)", re.I)
+_TITLE_RE = re.compile(r"[a-z0-9]+")
+
+
+def canonical_url(url: str) -> str:
+    """Normalize `url` so variants of the same article compare equal ("" if not a URL)."""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    parts = urlsplit(url)
+    scheme = (parts.scheme or "https").lower()
+    if scheme not in ("http", "https"):
+        return url
+    host = (parts.hostname or "").lower()
+    if not host:
+        return ""
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+            break
+    port = parts.port
+    netloc = host if port in (None, _DEFAULT_PORTS.get(scheme)) else f"{host}:{port}"
+
+    path = _AMP_SEGMENT_RE.sub("", parts.path)
+    path = _AMP_SUFFIX_RE.sub("", path)
+    path = re.sub(r"/{2,}", "/", path).rstrip("/") or "/"
+
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(_TRACKING_PREFIXES)
+    )
+    # http and https copies of an article are the same article
+    return urlunsplit(("https", netloc, path, urlencode(query), ""))
+
+
+def _guid(item: NewsItem) -> Tuple[str, str]:
+    """(scope, guid) for the item's feed guid / API article id, or ("", "")."""
+    raw = item.raw or {}
+    if raw.get("guid"):
+        return raw.get("feed") or item.source, str(raw["guid"])
+    for api, field in (("newsapi_ai", "uri"), ("thenewsapi", "uuid")):
+        value = (raw.get(api) or {}).get(field)
+        if value:
+            return api, str(value)
+    return "", ""
+
+
+def normalized_title(title: str) -> str:
+    return " ".join(_TITLE_RE.findall((title or "").lower()))
+
+
+def identity_keys(item: NewsItem) -> List[Tuple[str, str]]:
+    """
+    Alternate keys for `item`, preferred first:
+    ("guid", scope|guid), ("url", canonical url), ("title", normalized title).
+    A guid that is itself a URL counts as a URL.
+    """
+    keys: List[Tuple[str, str]] = []
+    scope, guid = _guid(item)
+    urls = [item.link]
+    if guid:
+        if guid.startswith(("http://", "https://")):
+            urls.insert(0, guid)
+        else:
+            keys.append(("guid", f"{scope}|{guid}"))
+    for u in urls:
+        cu = canonical_url(u)
+        if cu and ("url", cu) not in keys:
+            keys.append(("url", cu))
+    if not keys:
+        title = normalized_title(item.title)
+        if title:
+            keys.append(("title", f"{item.source}|{title}"))
+    return keys
+
+
+def _digest(kind: str, value: str) -> bytes:
+    return hashlib.blake2b(f"{kind}:{value}".encode("utf-8"), digest_size=16).digest()
+
+
+def _scope(guid_key: str) -> str:
+    """The feed / API part of a "scope|guid" key."""
+    return guid_key.partition("|")[0]
+
+
+def canonical_id(kind: str, value: str) -> str:
+    return hashlib.sha1(f"{kind}:{value}".encode("utf-8")).hexdigest()
+
+
+class IdentityIndex:
+    def __init__(self) -> None:
+        self._ids: Dict[bytes, str] = {}  # key digest -> canonical id
+        self._guid_scopes: Dict[str, Set[str]] = {}  # canonical id -> feeds that gave it a guid
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.repeats = 0  # same keys as a known article (plain re-fetch)
+        self.collapsed = 0  # a new variant (URL / guid) of a known article
+        self.collapsed_by: Dict[str, int] = {}  # ... by the kind of key that matched
+
+    def link(self, kind: str, value: str, uid: str) -> None:
+        """Map one alternate key to `uid` (loading stored links)."""
+        with self._lock:
+            self._ids.setdefault(_digest(kind, value), uid)
+            if kind == "guid":
+                self._guid_scopes.setdefault(uid, set()).add(_scope(value))
+
+    def resolve(self, item: NewsItem) -> Tuple[str, List[Tuple[str, str]]]:
+        """
+        Canonical id for `item`; all of its keys are linked to that id.
+
+        Returns:
+            (canonical id, keys that were not linked before) - the new keys
+            are what the store needs to persist
+        """
+        keys = identity_keys(item)
+        if not keys:
+            return "", []
+        digests = [_digest(k, v) for k, v in keys]
+        with self._lock:
+            self.lookups += 1
+            uid: Optional[str] = None
+            matched = ""
+            scope = _scope(keys[0][1]) if keys[0][0] == "guid" else None
+            # guid first, then the URL keys
+            for (kind, _), d in zip(keys, digests):
+                found = self._ids.get(d)
+                if found is None:
+                    continue
+                if scope is not None and kind != "guid" and scope in self._guid_scopes.get(found, ()):
+                    # another guid of the same feed owns this URL: a different article
+                    continue
+                uid, matched = found, kind
+                break
+            if uid is None:
+                uid = canonical_id(*keys[0])
+            new = []
+            for key, d in zip(keys, digests):
+                if d not in self._ids:
+                    self._ids[d] = uid
+                    new.append(key)
+            if scope is not None:
+                self._guid_scopes.setdefault(uid, set()).add(scope)
+            if matched and new:
+                self.collapsed += 1
+                self.collapsed_by[matched] = self.collapsed_by.get(matched, 0) + 1
+            elif matched:
+                self.repeats += 1
+            return uid, new
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "keys": len(self._ids),
+            "lookups": self.lookups,
+            "repeats": self.repeats,
+            "collapsed": self.collapsed,
+            "collapsed_by": dict(self.collapsed_by),
+        }
+
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import Optional, Dict, Any
 
 class NewsItem(BaseModel):
@@ -21,4 +21,9 @@ class NewsItem(BaseModel):
     validation_reason: str = ""
 
     uid: str = Field(default="", description="Dedup hash")
+    duplicate_of: str = Field(default="", description="uid of the event this is a syndicated copy of")
+    cluster_id: str = Field(default="", description="uid of the lead article of this item's event cluster")
     raw: Dict[str, Any] = Field(default_factory=dict)
+
+    # core.text_prep.PreparedText for title + summary (not stored)
+    _prepared: Any = PrivateAttr(default=None)
@@ -0,0 +1,273 @@
+"""
+Near-Duplicate Detection (SimHash + LSH)
+========================================
+Recognises the same story syndicated across sources (PR Newswire, Yahoo
+Finance, Seeking Alpha, the premium APIs) under different links, so a
+copy is attached to the first event instead of being scored, validated
+and alerted again.
+
+- Signature: 64-bit SimHash over the normalized title (unigrams and
+  bigrams, weighted up) and the start of the summary. Exchange tags are
+  removed, and so is a " - Site" suffix when it names the item's own
+  source, a known publisher or a domain - not any text after a dash,
+  which would merge "Acme Q3 earnings - revenue up 10%" with every other
+  "Acme Q3 earnings - ..." headline.
+- Direction veto: a one-word flip ("beats" / "misses", "upgraded" /
+  "downgraded") moves only a few signature bits, so two headlines whose
+  direction words contradict each other are never matched.
+- Index: the signature is split into `max_distance + 1` bands; two
+  signatures within `max_distance` bits must agree on at least one band
+  (pigeonhole), so a lookup only compares against items sharing a band.
+- Sliding window: entries older than `window` seconds are dropped. The
+  index lives in memory only; after a restart the window starts empty.
+
+    index = NearDupIndex()
+    original = index.observe(item.uid, item.source, item.title, item.summary)
+    if original is not None:
+        ...  # syndicated copy of original.uid
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+BITS = 64
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_TAG_RE = re.compile(r"<[^>]+>")
+# "(NASDAQ: ACME)" and " - Yahoo Finance" style decorations vary between copies
+_EXCHANGE_TAG_RE = re.compile(r"\((?:nasdaq|nyse|amex|otc\w*|tsx\w*|cboe)\s*:\s*[\w.]+\)", re.I)
+_SITE_SUFFIX_RE = re.compile(r"\s+[-|\u2013\u2014]\s+([^-|\u2013\u2014]{1,40}?)\s*$")
+_DOMAIN_RE = re.compile(r"^(?:[a-z0-9-]+\.)+[a-z]{2,}$")
+_PAREN_RE = re.compile(r"\(([^)]+)\)")
+KNOWN_SITES = frozenset({
+    "ap", "associated press", "barron's", "benzinga", "bloomberg", "business insider",
+    "business wire", "businesswire", "cnbc", "cnn", "cnn business", "dow jones", "financial times",
+    "forbes", "fox business", "ft", "globenewswire", "investing.com", "investopedia", "investor's business daily",
+    "marketbeat", "marketwatch", "morningstar", "nasdaq", "pr newswire", "prnewswire", "reuters",
+    "seeking alpha", "the motley fool", "motley fool", "the street", "thestreet", "the wall street journal",
+    "wall street journal", "wsj", "yahoo finance", "yahoo", "zacks",
+})
+# Direction words per group: opposite signs within a group contradict each other
+_DIRECTIONS = {
+    word: (group, sign)
+    for group, up, down in (
+        ("result", "beat beats tops topped", "miss misses missed"),
+        ("outlook", "raise raises raised hike hikes boost boosts lift lifts", "cut cuts lower lowers lowered slash slashes"),
+        ("price", "rise rises rose jump jumps gain gains surge surges soar soars rally rallies",
+         "fall falls fell drop drops slide slides plunge plunges sink sinks tumble tumbles"),
+        ("rating", "upgrade upgrades upgraded", "downgrade downgrades downgraded"),
+        ("decision", "approve approves approved approval", "reject rejects rejected rejection"),
+    )
+    for sign, words in ((1, up), (-1, down))
+    for word in words.split()
+}
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in inc is it its of on or that the to was will with".split()
+)
+
+
+@lru_cache(maxsize=65536)
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _tokens(text: str) -> List[str]:
+    text = _TAG_RE.sub(" ", text.lower())
+    return [t for t in _WORD_RE.findall(text) if t not in _STOPWORDS]
+
+
+def strip_site_suffix(title: str, source: str = "") -> str:
+    """
+    Drop a trailing " - Site" / " | Site" if it names `source` (or the
+    publisher in "TheNewsAPI (cnbc.com)"), a KNOWN_SITES publisher or a
+    domain; any other text after a dash is part of the headline.
+    """
+    m = _SITE_SUFFIX_RE.search(title)
+    if m is None:
+        return title
+    suffix = m.group(1).lower()
+    source = source.lower().strip()
+    sources = {source, _PAREN_RE.sub("", source).strip(), *_PAREN_RE.findall(source)}
+    if suffix in KNOWN_SITES or suffix in sources or _DOMAIN_RE.match(suffix):
+        return title[: m.start()]
+    return title
+
+
+def directions(title: str) -> Dict[str, int]:
+    """Direction group -> +1 / -1 for the title's direction words (groups with both signs are left out)."""
+    signs: Dict[str, int] = {}
+    for word in _WORD_RE.findall(title.lower()):
+        hit = _DIRECTIONS.get(word)
+        if hit is not None:
+            group, sign = hit
+            signs[group] = sign if signs.get(group, sign) == sign else 0
+    return {group: sign for group, sign in signs.items() if sign}
+
+
+def _contradicts(a: Dict[str, int], b: Dict[str, int]) -> bool:
+    return any(b.get(group) == -sign for group, sign in a.items())
+
+
+def simhash(title: str, summary: str = "", summary_tokens: int = 40, source: str = "") -> Tuple[int, int]:
+    """
+    Args:
+        source: The item's source name; a " - <source>" title suffix is ignored
+
+    Returns:
+        (64-bit signature, number of features used)
+    """
+    weights: Dict[str, int] = {}
+    title = strip_site_suffix(_EXCHANGE_TAG_RE.sub(" ", title), source)
+    words = _tokens(title)
+    for w in words:
+        weights[w] = weights.get(w, 0) + 3
+    for a, b in zip(words, words[1:]):
+        bigram = f"{a} {b}"
+        weights[bigram] = weights.get(bigram, 0) + 2
+    for w in _tokens(summary)[:summary_tokens]:
+        weights[w] = weights.get(w, 0) + 1
+
+    counts = [0] * BITS
+    for feature, weight in weights.items():
+        h = _feature_hash(feature)
+        for bit in range(BITS):
+            if h >> bit & 1:
+                counts[bit] += weight
+            else:
+                counts[bit] -= weight
+
+    sig = 0
+    for bit, c in enumerate(counts):
+        if c > 0:
+            sig |= 1 << bit
+    return sig, len(weights)
+
+
+@dataclass
+class NearDupEntry:
+    uid: str
+    source: str
+    title: str
+    signature: int
+    added: float
+    directions: Dict[str, int] = field(default_factory=dict)
+    copies: List[str] = field(default_factory=list)  # sources of attached copies
+
+
+class NearDupIndex:
+    def __init__(
+        self,
+        max_distance: int = 7,
+        window: float = 6 * 3600,
+        min_features: int = 6,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            max_distance: Max differing signature bits for a near-duplicate
+            window: Seconds an event stays matchable
+            min_features: Texts with fewer features aren't indexed (too short to tell apart)
+            clock: Wall clock (injectable for tests)
+        """
+        self.max_distance = max_distance
+        self.window = window
+        self.min_features = min_features
+        self.clock = clock
+
+        bands = max_distance + 1
+        width = BITS // bands
+        self._bands = [(i * width, (1 << width) - 1) for i in range(bands)]
+        self._buckets: Dict[Tuple[int, int], List[NearDupEntry]] = {}
+        self._entries: Deque[NearDupEntry] = deque()
+        self._lock = threading.Lock()
+
+        self.matches = 0
+        self.lookups = 0
+
+    def _band_keys(self, sig: int):
+        for i, (shift, mask) in enumerate(self._bands):
+            yield i, (sig >> shift) & mask
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window
+        while self._entries and self._entries[0].added < cutoff:
+            old = self._entries.popleft()
+            for key in self._band_keys(old.signature):
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.remove(old)
+                    if not bucket:
+                        del self._buckets[key]
+
+    def _find(self, sig: int, dirs: Dict[str, int]) -> Optional[NearDupEntry]:
+        best: Optional[NearDupEntry] = None
+        best_dist = self.max_distance + 1
+        for key in self._band_keys(sig):
+            for entry in self._buckets.get(key, ()):
+                dist = (entry.signature ^ sig).bit_count()
+                if dist < best_dist and not _contradicts(entry.directions, dirs):
+                    best, best_dist = entry, dist
+        return best
+
+    def match(self, title: str, summary: str = "", source: str = "") -> Optional[NearDupEntry]:
+        """The earlier event this text is a near-duplicate of (None if new)."""
+        sig, n_features = simhash(title, summary, source=source)
+        if n_features < self.min_features:
+            return None
+        with self._lock:
+            self.lookups += 1
+            self._expire(self.clock())
+            entry = self._find(sig, directions(title))
+            if entry is not None:
+                self.matches += 1
+            return entry
+
+    def add(self, uid: str, source: str, title: str, summary: str = "") -> Optional[NearDupEntry]:
+        """Index an event (None if the text is too short to index)."""
+        sig, n_features = simhash(title, summary, source=source)
+        if n_features < self.min_features:
+            return None
+        with self._lock:
+            return self._add(uid, source, title, sig, directions(title))
+
+    def observe(self, uid: str, source: str, title: str, summary: str = "") -> Optional[NearDupEntry]:
+        """
+        match() + add() with one signature: returns the earlier event if
+        this is a near-duplicate (recording `source` as a copy), otherwise
+        indexes it as a new event and returns None.
+        """
+        sig, n_features = simhash(title, summary, source=source)
+        if n_features < self.min_features:
+            return None
+        dirs = directions(title)
+        with self._lock:
+            self.lookups += 1
+            self._expire(self.clock())
+            entry = self._find(sig, dirs)
+            if entry is not None:
+                self.matches += 1
+                entry.copies.append(source)
+                return entry
+            self._add(uid, source, title, sig, dirs)
+            return None
+
+    def _add(self, uid: str, source: str, title: str, sig: int, dirs: Dict[str, int]) -> NearDupEntry:
+        entry = NearDupEntry(uid, source, title, sig, self.clock(), dirs)
+        self._entries.append(entry)
+        for key in self._band_keys(sig):
+            self._buckets.setdefault(key, []).append(entry)
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "lookups": self.lookups, "matches": self.matches}
@@ -0,0 +1,211 @@
+"""
+Daily Quota Budget
+==================
+Spreads a daily-limited API's quota (Alpha Vantage 25 req/day, TheNewsAPI
+100 req/day, NewsAPI.ai 2,000 tokens/day) over the day instead of burning
+it in the first minutes of polling.
+
+The day (in `tz_name`, default US/Eastern) is split into weighted windows,
+e.g. pre-market and regular session weigh more than the night. A call may
+start at minute m if what was already spent today is within
+
+    usable * (cumulative weight up to m) / (total weight)
+
+so calls land roughly where the weight is. Weekends use a flat schedule. Usage is kept in the feed state store and
+survives restarts; it resets when the local date changes.
+
+    budget = QuotaBudget("Alpha Vantage", daily_limit=25)
+    if budget.can_call():
+        budget.record()
+        ...call the API...
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Callable, Dict, List, Optional, Tuple
+
+from storage.feed_state import FeedStateStore, get_feed_state
+
+try:
+    from zoneinfo import ZoneInfo
+except Exception:
+    ZoneInfo = None
+
+logger = logging.getLogger("market_radar.quota_budget")
+
+MINUTES_PER_DAY = 24 * 60
+
+# "HH:MM-HH:MM=weight", later windows override earlier ones (US/Eastern)
+DEFAULT_SCHEDULE = "00:00-24:00=0.25,04:00-09:30=2,09:30-16:00=3,16:00-20:00=1"
+
+
+def parse_schedule(spec: str) -> List[float]:
+    """Turn a schedule spec into per-minute weights (1440 floats)."""
+    weights = [1.0] * MINUTES_PER_DAY
+    for part in (p.strip() for p in (spec or "").split(",")):
+        if not part:
+            continue
+        window, _, weight = part.partition("=")
+        start, _, end = window.partition("-")
+        lo, hi = _minute_of_day(start), _minute_of_day(end)
+        w = float(weight or 1)
+        if w < 0:
+            raise ValueError(f"negative weight in schedule: {part!r}")
+        for m in range(lo, hi):
+            weights[m] = w
+    if not any(weights):
+        raise ValueError("schedule has zero total weight")
+    return weights
+
+
+def _minute_of_day(hhmm: str) -> int:
+    h, _, m = hhmm.strip().partition(":")
+    minute = int(h) * 60 + int(m or 0)
+    if not 0 <= minute <= MINUTES_PER_DAY:
+        raise ValueError(f"bad time of day: {hhmm!r}")
+    return minute
+
+
+class QuotaBudget:
+    def __init__(
+        self,
+        name: str,
+        daily_limit: float,
+        cost_per_call: float = 1.0,
+        reserve: float = 0.0,
+        schedule: str = DEFAULT_SCHEDULE,
+        tz_name: str = "America/New_York",
+        state_store: Optional[FeedStateStore] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            name: API name (also the state store key)
+            daily_limit: Units per day (requests or tokens); 0 = unlimited
+            cost_per_call: Units one call consumes
+            reserve: Units kept back for manual / ad-hoc use
+            schedule: Weighted windows, see DEFAULT_SCHEDULE
+            tz_name: Timezone that defines the day and the windows
+            state_store: Where usage is persisted (default: shared feed state)
+            clock: Wall clock in epoch seconds (injectable for tests)
+        """
+        self.name = name
+        self.daily_limit = daily_limit
+        self.cost_per_call = cost_per_call
+        self.reserve = reserve
+        self.tz = ZoneInfo(tz_name) if ZoneInfo else timezone.utc
+        self.clock = clock
+        self.state_store = state_store or get_feed_state()
+        self._state = self.state_store.get(f"quota:{name}")
+
+        self._cum_weekday = self._cumulative(parse_schedule(schedule))
+        self._cum_weekend = self._cumulative([1.0] * MINUTES_PER_DAY)
+
+    @staticmethod
+    def _cumulative(weights: List[float]) -> List[float]:
+        total = sum(weights)
+        return [0.0] + [c / total for c in accumulate(weights)]
+
+    @property
+    def usable(self) -> float:
+        return max(0.0, self.daily_limit - self.reserve)
+
+    def _now(self) -> datetime:
+        return datetime.fromtimestamp(self.clock(), tz=self.tz)
+
+    def _rollover(self, now: datetime) -> None:
+        day = now.date().isoformat()
+        if self._state.get("day") != day:
+            self._state.update(day=day, used=0.0, calls=0, exhausted=False)
+
+    def _allowed_by(self, now: datetime) -> Tuple[float, List[float]]:
+        """(units allowed to be spent by `now`, cumulative weight curve)."""
+        cum = self._cum_weekend if now.weekday() >= 5 else self._cum_weekday
+        minute = now.hour * 60 + now.minute + now.second / 60.0
+        i = min(int(minute), MINUTES_PER_DAY - 1)
+        frac = cum[i] + (cum[i + 1] - cum[i]) * (minute - i)
+        return self.usable * frac, cum
+
+    def used(self) -> float:
+        self._rollover(self._now())
+        return float(self._state.get("used", 0.0))
+
+    def remaining(self) -> float:
+        if not self.daily_limit:
+            return math.inf
+        if self._state.get("exhausted"):
+            return 0.0
+        return max(0.0, self.usable - self.used())
+
+    def can_call(self, cost: Optional[float] = None) -> bool:
+        """True if a call now stays within both the daily limit and the spread."""
+        if not self.daily_limit:
+            return True
+        cost = self.cost_per_call if cost is None else cost
+        now = self._now()
+        self._rollover(now)
+        if self._state.get("exhausted"):
+            return False
+        used = float(self._state.get("used", 0.0))
+        if used + cost > self.usable:
+            return False
+        allowed, _cum = self._allowed_by(now)
+        return used <= allowed + 1e-9
+
+    def record(self, cost: Optional[float] = None) -> None:
+        """Count one call against today's budget and persist it."""
+        cost = self.cost_per_call if cost is None else cost
+        now = self._now()
+        self._rollover(now)
+        self._state["used"] = float(self._state.get("used", 0.0)) + cost
+        self._state["calls"] = int(self._state.get("calls", 0)) + 1
+        self._state["last_call"] = now.astimezone(timezone.utc).isoformat()
+        self.state_store.save()
+
+    def exhaust(self) -> None:
+        """The API reported its limit reached - stop calling until tomorrow."""
+        self._rollover(self._now())
+        self._state["exhausted"] = True
+        self.state_store.save()
+        logger.warning(f"{self.name}: provider reports quota exhausted, pausing until tomorrow")
+
+    def next_call_time(self) -> datetime:
+        """When the next call fits the spread (now if it already does)."""
+        now = self._now()
+        if not self.daily_limit or self.can_call():
+            return now
+        used = float(self._state.get("used", 0.0))
+        cost = self.cost_per_call
+        if self._state.get("exhausted") or used + cost > self.usable:
+            return self._next_day_start(now)
+
+        _allowed, cum = self._allowed_by(now)
+        need = used / self.usable
+        i = bisect_left(cum, need - 1e-12)
+        if i > MINUTES_PER_DAY:
+            return self._next_day_start(now)
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return max(now, midnight + timedelta(minutes=i))
+
+    def seconds_until_next_call(self) -> float:
+        return max(0.0, self.next_call_time().timestamp() - self.clock())
+
+    def _next_day_start(self, now: datetime) -> datetime:
+        tomorrow = (now + timedelta(days=1)).date()
+        return datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=self.tz)
+
+    def get_usage_info(self) -> Dict[str, object]:
+        return {
+            "daily_limit": self.daily_limit,
+            "used_today": round(self.used(), 2),
+            "calls_today": int(self._state.get("calls", 0)),
+            "remaining": self.remaining(),
+            "next_call": self.next_call_time().isoformat(),
+            "exhausted": bool(self._state.get("exhausted")),
+        }
@@ -0,0 +1,160 @@
+"""
+Per-Source Poll Scheduler
+=========================
+Gives every source its own next-due time instead of one global
+POLL_SECONDS loop.
+
+- Each source tracks an EWMA of its observed publication rate (new items/sec).
+- The poll interval follows that rate (about one new item per poll),
+  clamped to [min_interval, max_interval]. Quiet feeds back off, busy
+  feeds get polled more often.
+- Priority sources (SEC, wire services) keep a tight ceiling so they are
+  never polled less often than `priority_max_interval`.
+- Due times advance from the *scheduled* time, not from when processing
+  finished, so the cadence does not drift.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class SourceSchedule:
+    name: str
+    interval: float
+    min_interval: float
+    max_interval: float
+    priority: bool = False
+    next_due: float = 0.0
+    last_poll: Optional[float] = None
+    rate: float = 0.0  # EWMA of new items per second
+    polls: int = 0
+    new_items: int = 0
+
+
+class PollScheduler:
+    def __init__(
+        self,
+        default_interval: float = 30.0,
+        min_interval: float = 15.0,
+        max_interval: float = 300.0,
+        priority_max_interval: float = 30.0,
+        smoothing: float = 0.3,
+        backoff: float = 1.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            default_interval: Starting interval for new sources (seconds)
+            min_interval: Fastest allowed polling (seconds)
+            max_interval: Slowest allowed polling (seconds)
+            priority_max_interval: Ceiling for priority sources (seconds)
+            smoothing: EWMA weight of the latest observation (0..1)
+            backoff: Interval multiplier when a source has no observed activity
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.priority_max_interval = priority_max_interval
+        self.smoothing = smoothing
+        self.backoff = backoff
+        self.clock = clock
+        self.sources: Dict[str, SourceSchedule] = {}
+
+    def add(
+        self,
+        name: str,
+        interval: Optional[float] = None,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        priority: bool = False,
+    ) -> SourceSchedule:
+        lo = self.min_interval if min_interval is None else min_interval
+        hi = self.max_interval if max_interval is None else max_interval
+        if priority:
+            hi = min(hi, self.priority_max_interval)
+        hi = max(hi, lo)
+
+        start = self.default_interval if interval is None else interval
+        sched = SourceSchedule(
+            name=name,
+            interval=min(max(start, lo), hi),
+            min_interval=lo,
+            max_interval=hi,
+            priority=priority,
+            next_due=self.clock(),  # poll everything once on startup
+        )
+        self.sources[name] = sched
+        return sched
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Names of sources whose next-due time has passed (priority first)."""
+        now = self.clock() if now is None else now
+        ready = [s for s in self.sources.values() if s.next_due <= now]
+        ready.sort(key=lambda s: (not s.priority, s.next_due))
+        return [s.name for s in ready]
+
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        if not self.sources:
+            return self.default_interval
+        now = self.clock() if now is None else now
+        nxt = min(s.next_due for s in self.sources.values())
+        return max(0.0, nxt - now)
+
+    def record(self, name: str, new_items: int, now: Optional[float] = None) -> float:
+        """
+        Record the result of polling `name` and schedule its next poll.
+
+        Returns:
+            The new interval (seconds)
+        """
+        sched = self.sources[name]
+        now = self.clock() if now is None else now
+
+        elapsed = (now - sched.last_poll) if sched.last_poll is not None else sched.interval
+        elapsed = max(elapsed, 1e-6)
+        observed = new_items / elapsed
+        if sched.polls == 0:
+            sched.rate = observed
+        else:
+            sched.rate = self.smoothing * observed + (1 - self.smoothing) * sched.rate
+
+        if new_items > 0 and sched.rate > 0:
+            target = 1.0 / sched.rate  # ~one new item per poll
+        else:
+            target = sched.interval * self.backoff
+        sched.interval = min(max(target, sched.min_interval), sched.max_interval)
+
+        sched.last_poll = now
+        sched.polls += 1
+        sched.new_items += new_items
+
+        # Advance from the scheduled time so processing time doesn't cause drift;
+        # re-anchor only if we fell behind by a whole interval
+        nxt = sched.next_due + sched.interval
+        if nxt <= now:
+            nxt = now + sched.interval
+        sched.next_due = nxt
+        return sched.interval
+
+    def defer(self, name: str, seconds: float, now: Optional[float] = None) -> None:
+        """Push `name`'s next poll out to at least `seconds` from now (e.g. quota pacing)."""
+        sched = self.sources[name]
+        now = self.clock() if now is None else now
+        sched.next_due = max(sched.next_due, now + seconds)
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            s.name: {
+                "interval": round(s.interval, 1),
+                "rate_per_min": round(s.rate * 60, 2),
+                "polls": s.polls,
+                "new_items": s.new_items,
+                "priority": s.priority,
+            }
+            for s in self.sources.values()
+        }
@@ -1,5 +1,8 @@
 from __future__ import annotations
-from typing import Tuple
+from typing import List, Optional, Tuple
+
+from core.aho_corasick import AhoCorasick
+from core.text_prep import PreparedText
 
 KEYWORDS = {
     # M&A
@@ -21,6 +24,24 @@ KEYWORDS = {
     "convertible notes": 25, "dilution": 25,
 }
 
+# Keyword -> event topic (the groups above); event clustering keys on it
+TOPICS = {
+    "merger": "m&a", "acquisition": "m&a", "acquire": "m&a", "definitive agreement": "m&a",
+    "tender offer": "m&a", "s-4": "m&a", "business combination": "m&a",
+
+    "phase 3": "clinical", "phase iii": "clinical", "phase 2": "clinical", "phase ii": "clinical",
+    "topline": "clinical", "primary endpoint": "clinical", "met its primary endpoint": "clinical",
+    "statistically significant": "clinical", "fda approval": "clinical", "fda accepts": "clinical",
+    "nda": "clinical", "bla": "clinical", "pdufa": "clinical", "fast track": "clinical",
+    "breakthrough therapy": "clinical",
+
+    "bankruptcy": "risk", "going concern": "risk", "restatement": "risk",
+    "investigation": "risk", "8-k": "filing",
+
+    "public offering": "dilution", "registered direct offering": "dilution", "atm offering": "dilution",
+    "convertible notes": "dilution", "dilution": "dilution",
+}
+
 SOURCE_BONUS = {
     "SEC EDGAR": 25,
     "GlobeNewswire": 10,
@@ -28,16 +49,43 @@ SOURCE_BONUS = {
     "Business Wire": 10,
 }
 
-def score(source: str, title: str, summary: str) -> Tuple[int, str]:
-    text = f"{title} {summary}".lower()
-    score_val = SOURCE_BONUS.get(source, 0)
-    hits = []
+# Compiled once: one pass over the text whatever the size of KEYWORDS.
+# Substring semantics (like `k in text`), so "acquire" still hits "acquired".
+_KEYWORD_LIST = list(KEYWORDS)
+_AUTOMATON = AhoCorasick(_KEYWORD_LIST)
+
 
-    for k, w in KEYWORDS.items():
-        if k in text:
-            score_val += w
-            hits.append(k)
+def keyword_hits(text: str) -> List[str]:
+    """KEYWORDS found in `text`, each once, in KEYWORDS order."""
+    return [_KEYWORD_LIST[i] for i in sorted(_AUTOMATON.matches(text))]
+
+
+def _hits(title: str, summary: str, prepared: Optional[PreparedText]) -> List[str]:
+    """keyword_hits() of "title summary"; computed once per prepared text (score + topic)."""
+    if prepared is None:
+        return keyword_hits(f"{title} {summary}")
+    if prepared.keyword_hits is None:
+        prepared.keyword_hits = [_KEYWORD_LIST[i] for i in sorted(_AUTOMATON.matches(prepared.lower, lowered=True))]
+    return prepared.keyword_hits
+
+
+def score(source: str, title: str, summary: str, prepared: Optional[PreparedText] = None) -> Tuple[int, str]:
+    score_val = SOURCE_BONUS.get(source, 0)
+    hits = _hits(title, summary, prepared)
+    score_val += sum(KEYWORDS[k] for k in hits)
 
     score_val = min(score_val, 100)
     reason = ", ".join(hits[:8]) if hits else "no-keyword-hit"
     return score_val, reason
+
+
+def topic(title: str, summary: str = "", prepared: Optional[PreparedText] = None) -> str:
+    """Event topic: the keyword group with the most weight in the text ("general" if none)."""
+    weights = {}
+    for k in _hits(title, summary, prepared):
+        t = TOPICS.get(k)
+        if t:
+            weights[t] = weights.get(t, 0) + KEYWORDS[k]
+    if not weights:
+        return "general"
+    return max(weights, key=weights.get)
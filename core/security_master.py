@@ -0,0 +1,325 @@
+"""
+Security Master
+===============
+One in-memory record per symbol - display name, normalized company
+names, aliases, exchange, index membership and dot/dash variants -
+shared by ticker extraction, the ticker filter and the notifiers,
+instead of each of them building its own maps and sets.
+
+- Sources: the curated seeds in core.company_tickers, the generated
+  data/company_to_ticker.json and, when compiled by
+  tools/build_company_ticker_db.py, the S&P 500 / NASDAQ listings
+  (exchange, index membership, display names).
+- Artifact: the master is pickled to data/security_master.pkl and comes
+  back in milliseconds with the name map, alias map and name trie ready
+  to use. A missing or stale artifact (the JSON or the seeds changed
+  since it was compiled) is rebuilt from the sources and rewritten;
+  listings from the stale artifact are kept, with the time they were
+  downloaded (`listings_updated`) - consumers expire them by that, not by
+  when the artifact was built.
+
+    master = get_security_master()
+    master.lookup("BRK.B")                     # Security("BRK-B", ...)
+    master.is_major("AAPL")                    # NASDAQ-listed / S&P 500
+    master.match_name("shares of radnet rose") # ("radnet", Security("RDNT", ...))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from core.company_tickers import (
+    DEFAULT_JSON_PATH,
+    SEED_ALIASES,
+    SEED_COMPANY_TO_TICKER,
+    _load_json_mapping,
+    normalize_company_name,
+)
+from core.token_trie import TokenTrie
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_PATH = Path("data") / "security_master.pkl"
+FORMAT_VERSION = 2
+
+# Company names / aliases up to this many words are matched
+MAX_NAME_TOKENS = 6
+
+SP500 = "SP500"
+NASDAQ = "NASDAQ"
+
+# symbol -> {"name": display name, "exchange": "NASDAQ" / ..., "indices": ["SP500", ...]}
+Listings = Mapping[str, Mapping[str, Any]]
+
+
+def symbol_variants(symbol: str) -> Tuple[str, ...]:
+    """The upper-cased symbol and its dot/dash twin (BRK.B <-> BRK-B)."""
+    s = symbol.strip().upper().replace("/", "-")
+    if "." in s:
+        return s, s.replace(".", "-")
+    if "-" in s:
+        return s, s.replace("-", ".")
+    return (s,)
+
+
+@dataclass(frozen=True)
+class Security:
+    symbol: str
+    name: str = ""  # display name from the listings ("" if only known from the name map)
+    names: Tuple[str, ...] = ()  # normalized company names that resolve to it
+    aliases: Tuple[str, ...] = ()
+    exchange: str = ""  # "" if unknown
+    indices: FrozenSet[str] = frozenset()
+    variants: Tuple[str, ...] = ()  # dot/dash spellings, symbol first
+
+    @property
+    def is_major(self) -> bool:
+        """NASDAQ-listed or in the S&P 500 (what the ticker filter lets through)."""
+        return self.exchange == NASDAQ or SP500 in self.indices
+
+
+class SecurityMaster:
+    def __init__(
+        self,
+        company_to_ticker: Dict[str, str],
+        aliases: Dict[str, str],
+        listings: Optional[Listings] = None,
+        source_key: Tuple[Any, ...] = (),
+        listings_updated: Optional[float] = None,
+    ):
+        """
+        Args:
+            company_to_ticker: Normalized company name -> symbol
+            aliases: Normalized alias -> symbol (a company name wins over an alias)
+            listings: Per-symbol exchange / index / display name data
+            source_key: Identifies the sources it was built from (staleness check)
+            listings_updated: When the listings were downloaded (default: now)
+        """
+        self.company_to_ticker = company_to_ticker
+        self.aliases = aliases
+        self.listings: Dict[str, Dict[str, Any]] = {s: dict(v) for s, v in (listings or {}).items()}
+        self.source_key = source_key
+        self.built = time.time()
+        if not self.listings:
+            listings_updated = 0.0
+        self.listings_updated = self.built if listings_updated is None else listings_updated
+
+        names: Dict[str, List[str]] = {}
+        for phrase, sym in company_to_ticker.items():
+            names.setdefault(sym, []).append(phrase)
+        alias_names: Dict[str, List[str]] = {}
+        for phrase, sym in aliases.items():
+            alias_names.setdefault(sym, []).append(phrase)
+
+        # symbol -> Security fields as plain tuples: they unpickle several
+        # times faster than dataclass instances, which are made on lookup
+        self._records: Dict[str, Tuple[Any, ...]] = {}
+        self._by_variant: Dict[str, str] = {}
+        for sym in dict.fromkeys([*company_to_ticker.values(), *aliases.values(), *self.listings]):
+            listing = self.listings.get(sym, {})
+            variants = tuple(dict.fromkeys((sym, *symbol_variants(sym))))
+            self._records[sym] = (
+                str(listing.get("name") or ""),
+                tuple(names.get(sym, ())),
+                tuple(alias_names.get(sym, ())),
+                str(listing.get("exchange") or "").upper(),
+                frozenset(listing.get("indices") or ()),
+                variants,
+            )
+            for v in variants:
+                self._by_variant.setdefault(v, sym)
+        self._securities: Dict[str, Security] = {}
+
+        self.trie = TokenTrie(max_tokens=MAX_NAME_TOKENS)
+        for phrase, sym in company_to_ticker.items():
+            self.trie.insert(phrase.split(), sym)
+        for phrase, sym in aliases.items():
+            self.trie.insert(phrase.split(), sym, overwrite=False)
+
+        # symbols a company name / alias resolves to (what extraction accepts)
+        self.known: FrozenSet[str] = frozenset(company_to_ticker.values()) | frozenset(aliases.values())
+        self.major: FrozenSet[str] = frozenset(
+            v for sym in self._records if self.security(sym).is_major for v in self._records[sym][5]
+        )
+
+    @classmethod
+    def from_sources(
+        cls,
+        json_path: Path = DEFAULT_JSON_PATH,
+        listings: Optional[Listings] = None,
+        listings_updated: Optional[float] = None,
+    ) -> "SecurityMaster":
+        """Build from the seeds and the company -> ticker JSON (the JSON wins on conflicts)."""
+        company_to_ticker: Dict[str, str] = {}
+        for k, v in SEED_COMPANY_TO_TICKER.items():
+            company_to_ticker[normalize_company_name(k)] = v.upper().strip()
+        company_to_ticker.update(_load_json_mapping(json_path))
+        aliases = {normalize_company_name(k): v.upper().strip() for k, v in SEED_ALIASES.items()}
+        return cls(
+            company_to_ticker, aliases, listings,
+            source_key=source_key(json_path), listings_updated=listings_updated,
+        )
+
+    # ----------------------------
+    # Lookups
+    # ----------------------------
+
+    def security(self, symbol: str) -> Security:
+        """The record for a symbol as stored (KeyError if unknown); see lookup()."""
+        sec = self._securities.get(symbol)
+        if sec is None:
+            sec = self._securities[symbol] = Security(symbol, *self._records[symbol])
+        return sec
+
+    @property
+    def securities(self) -> Dict[str, Security]:
+        """Every security, by symbol."""
+        return {sym: self.security(sym) for sym in self._records}
+
+    def lookup(self, symbol: Optional[str]) -> Optional[Security]:
+        """The security for `symbol` in any spelling (BRK.B / BRK-B / brk/b), or None."""
+        if not symbol:
+            return None
+        s = symbol.strip().upper()
+        sym = self._by_variant.get(s) or self._by_variant.get(s.replace("/", "-"))
+        return self.security(sym) if sym else None
+
+    def is_known(self, symbol: Optional[str]) -> bool:
+        return self.lookup(symbol) is not None
+
+    def is_major(self, symbol: Optional[str]) -> bool:
+        return bool(symbol) and symbol.strip().upper() in self.major
+
+    @property
+    def has_listings(self) -> bool:
+        """Whether exchange / index membership is known (compiled from the downloads)."""
+        return bool(self.listings)
+
+    def listings_age(self) -> float:
+        """Seconds since the listings were downloaded (inf without listings)."""
+        if not self.has_listings:
+            return float("inf")
+        return time.time() - self.listings_updated
+
+    def match_name(self, text: str) -> Optional[Tuple[str, Security]]:
+        """Longest company name / alias in `text`: (normalized phrase, security), or None."""
+        return self.match_tokens(normalize_company_name(text).split())
+
+    def match_tokens(self, tokens: List[str]) -> Optional[Tuple[str, Security]]:
+        """match_name() for already normalized words."""
+        m = self.trie.longest_match(tokens)
+        if m is None:
+            return None
+        start, length, sym = m
+        return " ".join(tokens[start:start + length]), self.security(sym)
+
+    # ----------------------------
+    # Artifact
+    # ----------------------------
+
+    def save(self, path: Path = ARTIFACT_PATH) -> None:
+        """Write the compiled artifact (atomically: a reader never sees half a file)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({"version": FORMAT_VERSION, "master": self}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path = ARTIFACT_PATH) -> Optional["SecurityMaster"]:
+        """The compiled artifact, or None if it is missing, unreadable or an older format."""
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Unreadable security master artifact {path}: {e}")
+            return None
+        if not isinstance(data, dict) or data.get("version") != FORMAT_VERSION:
+            return None
+        master = data.get("master")
+        return master if isinstance(master, cls) else None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_securities"] = {}
+        return state
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "securities": len(self._records),
+            "names": len(self.company_to_ticker),
+            "aliases": len(self.aliases),
+            "major": len(self.major),
+            "has_listings": self.has_listings,
+            "age_hours": (time.time() - self.built) / 3600,
+            "listings_age_hours": self.listings_age() / 3600 if self.has_listings else None,
+        }
+
+
+def source_key(json_path: Path = DEFAULT_JSON_PATH) -> Tuple[Any, ...]:
+    """(JSON mtime, JSON size, seed digest) - changes whenever a source does."""
+    try:
+        st = Path(json_path).stat()
+        stamp: Tuple[int, int] = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = (0, 0)
+    seeds = repr((sorted(SEED_COMPANY_TO_TICKER.items()), sorted(SEED_ALIASES.items())))
+    return stamp + (hashlib.sha1(seeds.encode("utf-8")).hexdigest(),)
+
+
+def load_security_master(
+    json_path: Path = DEFAULT_JSON_PATH,
+    artifact: Path = ARTIFACT_PATH,
+    listings: Optional[Listings] = None,
+) -> SecurityMaster:
+    """
+    The compiled artifact if it is current, else a fresh build from the
+    sources (written back as the new artifact, best effort).
+
+    Args:
+        listings: Listing data for a rebuild (default: the stale artifact's)
+    """
+    cached = SecurityMaster.load(artifact)
+    if cached is not None and listings is None and cached.source_key == source_key(json_path):
+        return cached
+
+    listings_updated = None
+    if listings is None and cached is not None:
+        listings, listings_updated = cached.listings, cached.listings_updated
+    master = SecurityMaster.from_sources(json_path, listings, listings_updated)
+    try:
+        master.save(artifact)
+    except OSError as e:
+        logger.debug(f"Could not write security master artifact {artifact}: {e}")
+    return master
+
+
+_MASTER: Optional[SecurityMaster] = None
+_MASTER_LOCK = threading.Lock()
+
+
+def get_security_master(json_path: Path = DEFAULT_JSON_PATH) -> SecurityMaster:
+    """Process-wide master, loaded on first use (`json_path` only matters then)."""
+    global _MASTER
+    master = _MASTER
+    if master is not None:
+        return master
+    with _MASTER_LOCK:
+        if _MASTER is None:
+            _MASTER = load_security_master(json_path)
+        return _MASTER
+
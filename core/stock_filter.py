@@ -2,12 +2,19 @@
 Stock Market Relevance Filter
 ==============================
 Ensures articles are related to stock market and finance.
+
+Indicators and exclusion terms are compiled once into keyword automata
+(core.aho_corasick), so a text is checked in one pass instead of one
+regex search per indicator.
 """
 
 from __future__ import annotations
-from typing import Tuple
+from typing import Optional, Tuple
 import re
 
+from core.aho_corasick import AhoCorasick
+from core.text_prep import PreparedText
+
 STOCK_MARKET_INDICATORS = {
     "stock", "stocks", "share", "shares", "equity", "equities",
     "nasdaq", "nyse", "dow jones", "s&p 500", "s&p500", "russell",
@@ -53,35 +60,42 @@ EXCLUSION_TERMS = {
 _TICKER_PATTERN = re.compile(r'\$[A-Z]{1,5}\b|\([A-Z]{1,5}\)|\b(?:NASDAQ|NYSE|AMEX|OTC):\s*[A-Z]{1,5}\b')
 
 
-def _has_indicator(text: str, indicator: str) -> bool:
+def _whole_word(indicator: str) -> bool:
     """
     Better matching:
     - for multi-word indicators -> substring match (fast + reliable)
     - for single-word -> strict word boundary
     """
-    if " " in indicator or "&" in indicator or "-" in indicator:
-        return indicator in text
-    return re.search(r"\b" + re.escape(indicator) + r"\b", text) is not None
+    return not (" " in indicator or "&" in indicator or "-" in indicator)
+
+
+# Ids follow the set's iteration order, so reasons list indicators in the
+# same order as the old per-indicator loop
+_INDICATOR_LIST = list(STOCK_MARKET_INDICATORS)
+_INDICATORS = AhoCorasick([(i, _whole_word(i)) for i in _INDICATOR_LIST])
+_EXCLUSION_LIST = list(EXCLUSION_TERMS)
+_EXCLUSIONS = AhoCorasick(_EXCLUSION_LIST)
 
 
-def is_stock_market_related(title: str, summary: str) -> Tuple[bool, str]:
-    text = f"{title} {summary}".lower().strip()
+def is_stock_market_related(
+    title: str, summary: str, prepared: Optional[PreparedText] = None
+) -> Tuple[bool, str]:
+    if prepared is None:
+        prepared = PreparedText(title, summary)
+    text = prepared.lower.strip()
     if not text:
         return False, "Empty text"
 
-    found = []
-    for indicator in STOCK_MARKET_INDICATORS:
-        if _has_indicator(text, indicator):
-            found.append(indicator)
+    found = [_INDICATOR_LIST[i] for i in sorted(_INDICATORS.matches(text, lowered=True))]
 
     if found:
         return True, f"Stock market indicators: {', '.join(found[:3])}"
 
     # If it contains a ticker-like mention, keep it
-    if _TICKER_PATTERN.search(title + " " + summary):
+    if _TICKER_PATTERN.search(prepared.raw):
         return True, "Contains ticker symbol"
 
-    exclusion_found = [t for t in EXCLUSION_TERMS if t in text]
+    exclusion_found = [_EXCLUSION_LIST[i] for i in sorted(_EXCLUSIONS.matches(text, lowered=True))]
     if exclusion_found:
         return False, f"Not stock-related: {', '.join(exclusion_found[:2])}"
 
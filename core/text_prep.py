@@ -0,0 +1,58 @@
+"""
+Per-Item Text Preprocessing
+===========================
+The stock filter, ticker extraction, scoring (score() and topic()) and
+the Telegram ticker guess each used to rebuild "title summary" and
+lowercase or normalize it again. PreparedText computes each form once,
+on first use, and prepare() attaches it to the item:
+
+- raw:    "title summary" (what the ticker regexes see)
+- lower:  raw lowercased (keyword automata)
+- words:  normalized company-name words with their offsets
+          (company_tickers.normalized_tokens)
+- tokens: the words alone (company-name trie)
+
+Analyzers take an optional `prepared=`; without it they prepare the text
+themselves, so results are the same either way.
+
+    text = prepare(item)
+    is_stock_market_related(item.title, item.summary, prepared=text)
+    candidates = scan_tickers(item.title, item.summary, prepared=text)
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import List, Optional, Tuple
+
+from core.company_tickers import normalized_tokens
+from core.models import NewsItem
+
+
+class PreparedText:
+    def __init__(self, title: str, summary: str = ""):
+        self.title = title
+        self.summary = summary
+        self.raw = f"{title} {summary}"
+        self.keyword_hits: Optional[List[str]] = None  # filled in by core.scoring
+
+    @cached_property
+    def lower(self) -> str:
+        return self.raw.lower()
+
+    @cached_property
+    def words(self) -> List[Tuple[str, int]]:
+        return normalized_tokens(self.raw)
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        return [w for w, _ in self.words]
+
+
+def prepare(item: NewsItem) -> PreparedText:
+    """The item's PreparedText (made again if its title or summary was replaced)."""
+    text = item._prepared
+    if text is None or text.title is not item.title or text.summary is not item.summary:
+        text = PreparedText(item.title, item.summary)
+        item._prepared = text
+    return text
@@ -1,24 +1,49 @@
+"""
+Ticker Extraction
+=================
+One scan over "title summary" emits typed ticker candidates with
+positions and confidence:
+
+- exchange  "NASDAQ: RDNT" (any case)       0.95
+- paren     "(RDNT)"                         0.90
+- cashtag   "$RDNT"                          0.85
+- delim     "RadNet - RDNT"                  0.70
+- company   company name / alias (trie)      0.60
+- allcaps   any known ALL-CAPS token         0.40
+
+The symbol candidates come from one compiled pattern of zero-width
+lookaheads (one per kind), so overlapping forms - "(AAPL)" is both paren
+and allcaps - are all reported in a single pass. Company names come from
+the token trie over the normalized words (the security master's, loaded from its compiled
+artifact).
+
+extract_ticker() applies the historical priority order to the list;
+extract_all_tickers() ranks every valid ticker, for articles about
+several companies.
+"""
+
 from __future__ import annotations
 
 import re
-from typing import Optional
+import threading
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
 
 from .company_tickers import (
-    get_company_to_ticker,
-    get_aliases,
     BLACKLIST,
     normalize_company_name,
-    get_all_tickers,
 )
+from .security_master import MAX_NAME_TOKENS, get_security_master
+from .text_prep import PreparedText
+from .token_trie import TokenTrie
 
 # Supports: BRK.B, BRK-B, BF.A, etc.
 TICKER_RE = r"[A-Z]{1,6}(?:[.\-][A-Z]{1,2})?"
 
+_EXCHANGE_PREFIX = r"\b(?:NASDAQ|NYSE|AMEX|OTC|NYSE\s+AMERICAN|NASDAQ\s+CM|NASDAQ\s+GM|NASDAQ\s+GS)\s*:\s*"
+
 # ✅ Accept common exchange prefixes (case-insensitive) + variants
-EXCHANGE_TICKER = re.compile(
-    rf"\b(?:NASDAQ|NYSE|AMEX|OTC|NYSE\s+AMERICAN|NASDAQ\s+CM|NASDAQ\s+GM|NASDAQ\s+GS)\s*:\s*({TICKER_RE})\b",
-    re.IGNORECASE,
-)
+EXCHANGE_TICKER = re.compile(rf"{_EXCHANGE_PREFIX}({TICKER_RE})\b", re.IGNORECASE)
 
 # ✅ (RDNT) or ( RDNT )
 PAREN_TICKER = re.compile(rf"\(\s*({TICKER_RE})\s*\)")
@@ -32,58 +57,84 @@ DELIM_TICKER = re.compile(rf"(?:\s[-–|]\s)({TICKER_RE})\b")
 # ✅ Any token fallback
 ALLCAPS_TOKEN = re.compile(rf"\b({TICKER_RE})\b")
 
+# All of the above in one pattern. Each branch is a lookahead (nothing is
+# consumed), so every position is tried and a match of each kind is found
+# where its own regex would find it. Only an exchange prefix can start
+# where an ALL-CAPS token does ("NYSE: X"), hence the optional allcaps
+# lookahead in that branch.
+_SCANNER = re.compile(
+    rf"(?=(?i:{_EXCHANGE_PREFIX}(?P<exchange>{TICKER_RE})\b))(?:(?=\b(?P<exchange_caps>{TICKER_RE})\b))?"
+    rf"|(?=\b(?P<allcaps>{TICKER_RE})\b)"
+    rf"|(?=\(\s*(?P<paren>{TICKER_RE})\s*\))"
+    rf"|(?=\$\s*(?P<cashtag>{TICKER_RE})\b)"
+    rf"|(?=\s[-–|]\s(?P<delim>{TICKER_RE})\b)"
+)
 
-def extract_ticker(title: str, summary: str) -> Optional[str]:
-    text = f"{title} {summary}"
-
-    known_tickers = get_all_tickers()
-    company_map = get_company_to_ticker()
-    aliases = get_aliases()
-
-    # Helper: validate candidate
-    def _valid(cand: str) -> bool:
-        if not cand:
-            return False
-        c = cand.upper().strip()
-        if c.lower() in BLACKLIST:
-            return False
-        return c in known_tickers
-
-    # 1) Explicit exchange (highest confidence)
-    m = EXCHANGE_TICKER.search(text)
-    if m:
-        cand = m.group(1)
-        if _valid(cand):
-            return cand.upper()
-
-    # 2) Parentheses (high confidence)
-    m = PAREN_TICKER.search(text)
-    if m:
-        cand = m.group(1)
-        if _valid(cand):
-            return cand.upper()
-
-    # 3) $TICKER
-    m = DOLLAR_TICKER.search(text)
-    if m:
-        cand = m.group(1)
-        if _valid(cand):
-            return cand.upper()
-
-    # 3.5) Delimiter patterns: " - RDNT" / " | RDNT"
-    m = DELIM_TICKER.search(text)
-    if m:
-        cand = m.group(1)
-        if _valid(cand):
-            return cand.upper()
-
-    # 4) Company-name / alias n-grams (best practical)
-    ticker = _match_company_name_ngrams(text, company_map, aliases)
-    if ticker:
-        return ticker
-
-    # 5) ALL-CAPS fallback (first valid)
-    return _pick_best_allcaps(text, known_tickers)
+CONFIDENCE = {
+    "exchange": 0.95,
+    "paren": 0.90,
+    "cashtag": 0.85,
+    "delim": 0.70,
+    "company": 0.60,
+    "allcaps": 0.40,
+}
+
+# extract_ticker(): the first candidate of each of these kinds, in this order
+EXPLICIT_KINDS = ("exchange", "paren", "cashtag", "delim")
+
+
+@dataclass(frozen=True)
+class TickerCandidate:
+    ticker: str  # upper-cased
+    kind: str  # exchange / paren / cashtag / delim / company / allcaps
+    start: int  # offset in "title summary" (company: in its lowercased form)
+    end: int
+    confidence: float
+    words: int = 1  # company: normalized words matched (longer names win)
+
+
+# (company_map, aliases, trie, known tickers) for the mappings they were built from
+_LEXICON: Optional[Tuple[Dict[str, str], Dict[str, str], TokenTrie, FrozenSet[str]]] = None
+_LEXICON_LOCK = threading.Lock()
+
+
+def _lexicon(company_map: dict[str, str], aliases: dict[str, str]) -> Tuple[TokenTrie, FrozenSet[str]]:
+    """
+    Company trie + set of known tickers: the security master's for its own
+    maps, otherwise built once per mapping.
+    """
+    global _LEXICON
+    master = get_security_master()
+    if company_map is master.company_to_ticker and aliases is master.aliases:
+        return master.trie, master.known
+    cache = _LEXICON
+    if cache is not None and cache[0] is company_map and cache[1] is aliases:
+        return cache[2], cache[3]
+    with _LEXICON_LOCK:
+        cache = _LEXICON
+        if cache is not None and cache[0] is company_map and cache[1] is aliases:
+            return cache[2], cache[3]
+        trie = TokenTrie(max_tokens=MAX_NAME_TOKENS)
+        for phrase, ticker in company_map.items():
+            trie.insert(phrase.split(), ticker)
+        for phrase, ticker in aliases.items():
+            trie.insert(phrase.split(), ticker, overwrite=False)
+        known = frozenset(company_map.values()) | frozenset(aliases.values())
+        _LEXICON = (company_map, aliases, trie, known)
+        return trie, known
+
+
+def get_company_trie(company_map: dict[str, str], aliases: dict[str, str]) -> TokenTrie:
+    """
+    Token trie over company names + aliases (company name wins when both
+    define a phrase).
+    """
+    return _lexicon(company_map, aliases)[0]
+
+
+def _known_tickers() -> FrozenSet[str]:
+    """Same set as get_all_tickers() (the security master's)."""
+    return get_security_master().known
 
 
 def _match_company_name_ngrams(
@@ -92,36 +143,127 @@ def _match_company_name_ngrams(
     aliases: dict[str, str],
 ) -> Optional[str]:
     """
-    Tokenize normalized text and try n-grams (1..6 words).
-    Prefer longest match.
+    Longest company name / alias (up to MAX_NAME_TOKENS words) in the
+    normalized text; leftmost on ties.
     """
     norm = normalize_company_name(text)
     if not norm:
         return None
 
-    tokens = norm.split()
-    if not tokens:
-        return None
+    m = get_company_trie(company_map, aliases).longest_match(norm.split())
+    return m[2] if m else None
+
+
+def _is_valid(cand: str, known_tickers: FrozenSet[str]) -> bool:
+    return bool(cand) and cand.lower() not in BLACKLIST and cand in known_tickers
+
+
+def scan_tickers(title: str, summary: str = "", prepared: Optional[PreparedText] = None) -> List[TickerCandidate]:
+    """
+    Every ticker candidate in "title summary", in text order per kind
+    (symbol candidates first, then company names). Not validated.
+    """
+    if prepared is None:
+        prepared = PreparedText(title, summary)
+    text = prepared.raw
+    out: List[TickerCandidate] = []
+    caps_end = 0  # ALL-CAPS tokens don't overlap (like ALLCAPS_TOKEN.finditer)
+    for m in _SCANNER.finditer(text):
+        for kind in ("exchange", "paren", "cashtag", "delim", "allcaps", "exchange_caps"):
+            cand = m.group(kind)
+            if cand is None:
+                continue
+            start, end = m.span(kind)
+            if kind == "exchange_caps":
+                kind = "allcaps"
+            if kind == "allcaps":
+                if start < caps_end:
+                    continue
+                caps_end = end
+            out.append(TickerCandidate(cand.upper(), kind, start, end, CONFIDENCE[kind]))
+
+    words = prepared.words
+    if words:
+        trie = get_security_master().trie
+        tokens = prepared.tokens
+        covered = 0  # drop names inside a longer one ("american" in "bank of american ...")
+        for i, length, ticker in trie.iter_matches(tokens):
+            if i + length <= covered:
+                continue
+            covered = i + length
+            last_word, last_start = words[i + length - 1]
+            out.append(TickerCandidate(
+                ticker, "company", words[i][1], last_start + len(last_word), CONFIDENCE["company"], length
+            ))
+    return out
+
 
-    max_n = 6
-    for n in range(min(max_n, len(tokens)), 0, -1):
-        for i in range(0, len(tokens) - n + 1):
-            phrase = " ".join(tokens[i : i + n])
-            if phrase in company_map:
-                return company_map[phrase]
-            if phrase in aliases:
-                return aliases[phrase]
+def pick_ticker(candidates: Sequence[TickerCandidate]) -> Optional[str]:
+    """
+    The primary ticker, in the historical priority order:
+    first exchange / paren / cashtag / delim candidate (each only if it
+    is a known ticker), else the longest company name, else the first
+    known ALL-CAPS token.
+    """
+    known = _known_tickers()
+    firsts: Dict[str, TickerCandidate] = {}
+    best_company: Optional[TickerCandidate] = None
+    for c in candidates:
+        if c.kind == "company":
+            if best_company is None or c.words > best_company.words:
+                best_company = c
+        elif c.kind not in firsts:
+            firsts[c.kind] = c
+
+    for kind in EXPLICIT_KINDS:
+        c = firsts.get(kind)
+        if c is not None and _is_valid(c.ticker, known):
+            return c.ticker
+    if best_company is not None:
+        return best_company.ticker
+    for c in candidates:
+        if c.kind == "allcaps" and _is_valid(c.ticker, known):
+            return c.ticker
     return None
 
 
-def _pick_best_allcaps(text: str, known_tickers: set[str]) -> Optional[str]:
+def extract_ticker(title: str, summary: str) -> Optional[str]:
+    return pick_ticker(scan_tickers(title, summary))
+
+
+def rank_tickers(
+    candidates: Sequence[TickerCandidate],
+    title_len: int = 0,
+) -> List[Tuple[str, float]]:
     """
-    Scan tokens and return the first valid ticker that is not blacklisted.
+    Every valid ticker among `candidates` with a relevance score: its best
+    candidate's confidence, +0.05 per extra mention (up to +0.15), +0.1 if
+    it appears in the title (the first `title_len` characters). The primary
+    ticker (pick_ticker) always comes first; ties keep text order.
     """
-    for m in ALLCAPS_TOKEN.finditer(text):
-        cand = m.group(1).upper().strip()
-        if cand.lower() in BLACKLIST:
+    known = _known_tickers()
+    scores: Dict[str, float] = {}
+    mentions: Dict[str, int] = {}
+    in_title: Dict[str, bool] = {}
+    first_at: Dict[str, int] = {}
+    for c in candidates:
+        if c.kind != "company" and not _is_valid(c.ticker, known):
             continue
-        if cand in known_tickers:
-            return cand
-    return None
+        t = c.ticker
+        scores[t] = max(scores.get(t, 0.0), c.confidence)
+        mentions[t] = mentions.get(t, 0) + 1
+        in_title[t] = in_title.get(t, False) or c.start < title_len
+        first_at[t] = min(first_at.get(t, c.start), c.start)
+
+    ranked = {
+        t: round(s + min(0.15, 0.05 * (mentions[t] - 1)) + (0.1 if in_title[t] else 0.0), 3)
+        for t, s in scores.items()
+    }
+    primary = pick_ticker(candidates)
+    order = sorted(ranked, key=lambda t: (t != primary, -ranked[t], first_at[t]))
+    return [(t, ranked[t]) for t in order]
+
+
+def extract_all_tickers(title: str, summary: str = "") -> List[str]:
+    """Every ticker the article mentions, most relevant first (extract_ticker's pick leads)."""
+    return [t for t, _ in rank_tickers(scan_tickers(title, summary), title_len=len(title))]
@@ -2,7 +2,11 @@
 Ticker Filter - NASDAQ & S&P 500
 =================================
 Filters tickers to only major US indices (NASDAQ & S&P 500) to reduce noise.
-If NASDAQ is blocked, falls back to local data/company_to_ticker.json.
+The list comes from the security master when it was compiled with
+listings (tools/build_company_ticker_db.py) downloaded within the cache
+TTL; otherwise it is downloaded and cached here. If NASDAQ is blocked,
+falls back to the security master's symbols (data/company_to_ticker.json
++ seeds).
 """
 
 from __future__ import annotations
@@ -13,9 +17,10 @@ import re
 import time
 from io import StringIO
 from pathlib import Path
-from typing import Optional, Set
+from typing import Iterable, Optional, Set
 
-import requests
+from core.security_master import get_security_master, symbol_variants
+from utils.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -54,14 +59,28 @@ class TickerFilter:
         self.cache_file = cache_file or self.CACHE_FILE
         self.tickers: Set[str] = set()
         self.last_update: float = 0.0
+        self.source = ""
         self._load_or_refresh()
 
     def _load_or_refresh(self) -> None:
+        master = get_security_master()
+        if master.has_listings:
+            age = master.listings_age()
+            if age < self.CACHE_TTL_SECONDS:
+                self.tickers = self._clean(master.major)
+                self.last_update = master.listings_updated
+                self.source = "security_master"
+                logger.info(f"✅ Loaded {len(self.tickers)} tickers from the security master "
+                            f"(age: {age/3600:.1f}h)")
+                return
+            logger.info(f"⏰ Security master listings expired (age: {age/3600:.1f}h), using the download cache")
+
         if self.cache_file.exists():
             try:
                 data = json.loads(self.cache_file.read_text(encoding="utf-8"))
                 self.tickers = set(data.get("tickers", []))
                 self.last_update = float(data.get("timestamp", 0))
+                self.source = "cache"
 
                 age = time.time() - self.last_update
                 if age < self.CACHE_TTL_SECONDS and len(self.tickers) > 0:
@@ -109,28 +128,9 @@ class TickerFilter:
             new_tickers = set(self.FALLBACK_TICKERS)
 
         # 5) Clean + normalize + add dot/dash variants
-        cleaned: Set[str] = set()
-        for t in new_tickers:
-            t2 = str(t).strip().upper().replace("/", "-")
-            if _VALID_TICKER_RE.match(t2):
-                cleaned.add(t2)
-
-                # add paired versions
-                if "." in t2:
-                    cleaned.add(t2.replace(".", "-"))
-                if "-" in t2:
-                    cleaned.add(t2.replace("-", "."))
-
-        # 6) Always allow safety net
-        for t in self.ALWAYS_ALLOW:
-            cleaned.add(t)
-            if "." in t:
-                cleaned.add(t.replace(".", "-"))
-            if "-" in t:
-                cleaned.add(t.replace("-", "."))
-
-        self.tickers = cleaned
+        self.tickers = self._clean(new_tickers)
         self.last_update = time.time()
+        self.source = "download"
 
         try:
             cache_data = {
@@ -143,22 +143,28 @@ class TickerFilter:
         except Exception as e:
             logger.error(f"Failed to save cache: {e}")
 
+    @classmethod
+    def _clean(cls, tickers: Iterable[str]) -> Set[str]:
+        """Valid symbols with their dot/dash variants, plus ALWAYS_ALLOW."""
+        cleaned: Set[str] = set()
+        for t in tickers:
+            variants = symbol_variants(str(t))
+            if _VALID_TICKER_RE.match(variants[0]):
+                cleaned.update(variants)
+
+        # Always allow safety net
+        for t in cls.ALWAYS_ALLOW:
+            cleaned.update(symbol_variants(t))
+        return cleaned
+
     def _load_local_company_db_tickers(self) -> Set[str]:
         """
-        Loads tickers from data/company_to_ticker.json (company -> ticker)
+        Symbols of the security master (data/company_to_ticker.json + seeds)
         """
         try:
-            if not self.LOCAL_COMPANY_DB.exists():
-                return set()
-            data = json.loads(self.LOCAL_COMPANY_DB.read_text(encoding="utf-8"))
-            if not isinstance(data, dict):
-                return set()
-
             out: Set[str] = set()
-            for _, t in data.items():
-                if not t:
-                    continue
-                sym = str(t).strip().upper().replace("/", "-")
+            for sym in get_security_master().securities:
+                sym = symbol_variants(sym)[0]
                 if _VALID_TICKER_RE.match(sym):
                     out.add(sym)
             return out
@@ -171,7 +177,7 @@ class TickerFilter:
 
             url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
             headers = {"User-Agent": "Mozilla/5.0"}
-            r = requests.get(url, headers=headers, timeout=30)
+            r = get_http_client().get(url, headers=headers, timeout=30)
             r.raise_for_status()
 
             tables = pd.read_html(StringIO(r.text))
@@ -193,7 +199,7 @@ class TickerFilter:
         }
 
         try:
-            r = requests.get(url, headers=headers, timeout=30)
+            r = get_http_client().get(url, headers=headers, timeout=30)
             r.raise_for_status()
             rows = r.json().get("data", {}).get("rows", []) or []
 
@@ -214,7 +220,7 @@ class TickerFilter:
         try:
             url = "https://ftp.nasdaqtrader.com/symboldirectory/nasdaqlisted.txt"
             headers = {"User-Agent": "Mozilla/5.0"}
-            r = requests.get(url, headers=headers, timeout=30)
+            r = get_http_client().get(url, headers=headers, timeout=30)
             r.raise_for_status()
 
             tickers = set()
@@ -242,6 +248,7 @@ class TickerFilter:
             "cache_age_hours": age_hours,
             "cache_valid": age_hours < (self.CACHE_TTL_SECONDS / 3600),
             "cache_file": str(self.cache_file),
+            "source": self.source,
             "local_company_db": str(self.LOCAL_COMPANY_DB),
         }
 
@@ -0,0 +1,80 @@
+"""
+Token Trie (longest phrase match)
+=================================
+Word-level trie over normalized company names / aliases. Scanning a
+tokenized text walks the trie once from each start position, with no
+n-gram strings built - instead of joining and looking up every n-gram
+from 6 words down to 1.
+
+Match order is the same as the longest-first n-gram scan it replaces:
+the longest phrase wins; among equally long phrases, the leftmost.
+
+    trie = TokenTrie(max_tokens=6)
+    trie.insert("radnet".split(), "RDNT")
+    trie.longest_match("shares of radnet rose".split())  # (2, 1, "RDNT")
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+_VALUE = ""  # key for a node's value: tokens are never empty, and a str key survives pickling
+
+
+class TokenTrie:
+    def __init__(self, max_tokens: int = 6):
+        """
+        Args:
+            max_tokens: Longest phrase (in tokens) that is matched; longer phrases are not indexed
+        """
+        self.max_tokens = max_tokens
+        self._root: Dict[Any, Any] = {}
+        self._size = 0
+
+    def insert(self, tokens: Sequence[str], value: Any, overwrite: bool = True) -> bool:
+        """Add a phrase. Returns False if it is empty, too long, or exists and overwrite=False."""
+        if not tokens or len(tokens) > self.max_tokens:
+            return False
+        node = self._root
+        for tok in tokens:
+            node = node.setdefault(tok, {})
+        if _VALUE in node:
+            if not overwrite:
+                return False
+        else:
+            self._size += 1
+        node[_VALUE] = value
+        return True
+
+    def match_at(self, tokens: Sequence[str], start: int) -> Optional[Tuple[int, Any]]:
+        """Longest phrase starting at tokens[start]: (length in tokens, value), or None."""
+        node = self._root
+        best = None
+        end = min(len(tokens), start + self.max_tokens)
+        for i in range(start, end):
+            node = node.get(tokens[i])
+            if node is None:
+                break
+            if _VALUE in node:
+                best = (i - start + 1, node[_VALUE])
+        return best
+
+    def iter_matches(self, tokens: Sequence[str]) -> Iterator[Tuple[int, int, Any]]:
+        """(start, length, value) of the longest phrase at each start position that has one."""
+        for start in range(len(tokens)):
+            m = self.match_at(tokens, start)
+            if m is not None:
+                yield start, m[0], m[1]
+
+    def longest_match(self, tokens: Sequence[str]) -> Optional[Tuple[int, int, Any]]:
+        """The longest phrase in `tokens` (leftmost on ties): (start, length, value), or None."""
+        best = None
+        for start, length, value in self.iter_matches(tokens):
+            if best is None or length > best[1]:
+                best = (start, length, value)
+                if length == self.max_tokens:
+                    break
+        return best
+
+    def __len__(self) -> int:
+        return self._size
@@ -18,6 +18,8 @@ def validate_market_impact(
         return False, "no-ticker"
 
     snap = md.get_snapshot(item.ticker)
+    if snap is None:
+        return False, "no-market-data"
     if snap.price is None or snap.prev_close is None or snap.prev_close == 0:
         return False, "no-price-or-prev-close"
 
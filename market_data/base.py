@@ -9,6 +9,7 @@ class MarketSnapshot:
     prev_close: Optional[float]
     volume: Optional[float]
     avg_volume_10d: Optional[float]
+    error: Optional[str] = None  # set when the request failed (vs. no data for the symbol)
 
 class MarketDataProvider(Protocol):
     def get_snapshot(self, symbol: str) -> MarketSnapshot: ...
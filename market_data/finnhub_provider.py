@@ -20,6 +20,7 @@ import time
 from typing import Dict, Any, Optional
 import requests
 from market_data.base import MarketDataProvider, MarketSnapshot
+from utils.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -50,8 +51,8 @@ class FinnhubProvider(MarketDataProvider):
         self.api_key = api_key
         self.rate_limit_delay = rate_limit_delay
         self.last_request_time = 0.0
-        self.session = requests.Session()
-        self.session.headers.update({"X-Finnhub-Token": api_key})
+        self.session = get_http_client()
+        self._headers = {"X-Finnhub-Token": api_key}
         
     def get_snapshot(self, ticker: str) -> MarketSnapshot:
         """
@@ -69,6 +70,7 @@ class FinnhubProvider(MarketDataProvider):
             response = self.session.get(
                 f"{self.BASE_URL}/quote",
                 params={"symbol": ticker},
+                headers=self._headers,
                 timeout=5
             )
             response.raise_for_status()
@@ -103,6 +105,7 @@ class FinnhubProvider(MarketDataProvider):
                 prev_close=None,
                 volume=None,
                 avg_volume_10d=None,
+                error=str(e),
             )
         except Exception as e:
             logger.exception(f"Unexpected error in Finnhub provider for {ticker}: {e}")
@@ -112,6 +115,7 @@ class FinnhubProvider(MarketDataProvider):
                 prev_close=None,
                 volume=None,
                 avg_volume_10d=None,
+                error=str(e),
             )
     
     def get_company_profile(self, ticker: str) -> Optional[Dict[str, Any]]:
@@ -130,6 +134,7 @@ class FinnhubProvider(MarketDataProvider):
             response = self.session.get(
                 f"{self.BASE_URL}/stock/profile2",
                 params={"symbol": ticker},
+                headers=self._headers,
                 timeout=5
             )
             response.raise_for_status()
@@ -9,6 +9,8 @@ Features:
 - Provider priority configuration
 - Caching for performance
 - Rate limit management
+- Per-provider circuit breakers (a failing provider is skipped, then probed;
+  the last provider in priority order is always tried as the last resort)
 
 Author: Market Radar Team
 """
@@ -18,6 +20,8 @@ import logging
 from typing import Dict, Any, Optional, List
 from enum import Enum
 
+from utils.circuit_breaker import CircuitBreaker, get_breakers
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,12 +81,23 @@ class MarketDataManager:
             "requests": 0,
             "successes": 0,
             "failures": 0,
+            "circuit_skips": 0,
         }
         
         logger.info(
             f"✅ Added {provider_type.value} provider (priority: {priority})"
         )
     
+    def _breaker(self, provider_type: ProviderType) -> CircuitBreaker:
+        return get_breakers().get(f"provider:{provider_type.value}")
+    
+    def _available(self, provider_type: ProviderType) -> bool:
+        """False (and counted) while the provider's circuit is open; the last resort is always tried."""
+        if self._breaker(provider_type).allow() or provider_type == self.provider_priority[-1]:
+            return True
+        self.provider_stats[provider_type]["circuit_skips"] += 1
+        return False
+    
     def get_snapshot(self, ticker: str) -> Optional[Any]:
         """
         Get market snapshot from the first available provider.
@@ -94,7 +109,10 @@ class MarketDataManager:
             MarketSnapshot or None if all providers fail
         """
         for provider_type in self.provider_priority:
+            if not self._available(provider_type):
+                continue
             provider = self.providers[provider_type]["instance"]
+            breaker = self._breaker(provider_type)
             stats = self.provider_stats[provider_type]
             stats["requests"] += 1
             
@@ -102,13 +120,20 @@ class MarketDataManager:
                 snap = provider.get_snapshot(ticker)
                 if snap and snap.price is not None:
                     stats["successes"] += 1
+                    breaker.record_success()
                     logger.debug(f"✅ {provider_type.value}: Got snapshot for {ticker}")
                     return snap
+                stats["failures"] += 1
+                if snap is not None and getattr(snap, "error", None):
+                    # providers swallow their HTTP errors and report them on the snapshot
+                    breaker.record_failure()
                 else:
-                    stats["failures"] += 1
-                    logger.debug(f"⚠️  {provider_type.value}: No snapshot for {ticker}, trying next provider...")
+                    # the provider answered, it just has no data (unknown / delisted symbol)
+                    breaker.record_success()
+                logger.debug(f"⚠️  {provider_type.value}: No snapshot for {ticker}, trying next provider...")
             except Exception as e:
                 stats["failures"] += 1
+                breaker.record_failure()
                 logger.warning(
                     f"❌ {provider_type.value}: Error for {ticker}: {e}, trying next provider..."
                 )
@@ -135,6 +160,8 @@ class MarketDataManager:
             True if significant movement detected
         """
         for provider_type in self.provider_priority:
+            if not self._available(provider_type):
+                continue
             provider = self.providers[provider_type]["instance"]
             
             try:
@@ -143,11 +170,13 @@ class MarketDataManager:
                     min_gap_pct=min_gap_pct,
                     min_vol_spike=min_vol_spike
                 )
+                self._breaker(provider_type).record_success()
                 logger.debug(
                     f"✅ {provider_type.value}: Validated {ticker} = {result}"
                 )
                 return result
             except Exception as e:
+                self._breaker(provider_type).record_failure()
                 logger.warning(
                     f"❌ {provider_type.value}: Validation error for {ticker}: {e}, trying next provider..."
                 )
@@ -168,17 +197,22 @@ class MarketDataManager:
         """
         for provider_type in self.provider_priority:
             provider = self.providers[provider_type]["instance"]
+            # providers without profiles must not take the breaker's half-open probe
+            if not hasattr(provider, "get_company_profile"):
+                continue
+            if not self._available(provider_type):
+                continue
             
             try:
-                # Check if provider has get_company_profile method
-                if hasattr(provider, "get_company_profile"):
-                    profile = provider.get_company_profile(ticker)
-                    if profile:
-                        logger.debug(
-                            f"✅ {provider_type.value}: Got profile for {ticker}"
-                        )
-                        return profile
+                profile = provider.get_company_profile(ticker)
+                self._breaker(provider_type).record_success()
+                if profile:
+                    logger.debug(
+                        f"✅ {provider_type.value}: Got profile for {ticker}"
+                    )
+                    return profile
             except Exception as e:
+                self._breaker(provider_type).record_failure()
                 logger.debug(
                     f"⚠️  {provider_type.value}: Profile error for {ticker}: {e}"
                 )
@@ -206,6 +240,8 @@ class MarketDataManager:
                 "failures": failure,
                 "success_rate": f"{success_rate:.1f}%",
                 "priority": self.providers[provider_type]["priority"],
+                "circuit": self._breaker(provider_type).state,
+                "circuit_skips": provider_stats["circuit_skips"],
             }
         
         return stats
@@ -220,7 +256,8 @@ class MarketDataManager:
                 f"   {provider_name}: {provider_stats['requests']} requests, "
                 f"{provider_stats['successes']} success, "
                 f"{provider_stats['failures']} failures "
-                f"({provider_stats['success_rate']} success rate)"
+                f"({provider_stats['success_rate']} success rate, "
+                f"circuit {provider_stats['circuit']}, {provider_stats['circuit_skips']} skipped)"
             )
 
 
@@ -20,6 +20,7 @@ import time
 from typing import Dict, Any, Optional
 import requests
 from market_data.base import MarketDataProvider, MarketSnapshot
+from utils.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -52,7 +53,7 @@ class PolygonProvider(MarketDataProvider):
         self.api_key = api_key
         self.rate_limit_delay = rate_limit_delay
         self.last_request_time = 0.0
-        self.session = requests.Session()
+        self.session = get_http_client()
         
     def get_snapshot(self, ticker: str) -> MarketSnapshot:
         """
@@ -131,6 +132,7 @@ class PolygonProvider(MarketDataProvider):
                 prev_close=None,
                 volume=None,
                 avg_volume_10d=None,
+                error=str(e),
             )
         except Exception as e:
             logger.exception(f"Unexpected error in Polygon provider for {ticker}: {e}")
@@ -140,6 +142,7 @@ class PolygonProvider(MarketDataProvider):
                 prev_close=None,
                 volume=None,
                 avg_volume_10d=None,
+                error=str(e),
             )
     
     def get_company_profile(self, ticker: str) -> Optional[Dict[str, Any]]:
@@ -1,8 +1,10 @@
 from __future__ import annotations
+from typing import Any, Dict
+from core.event_cluster import EventCluster
 from core.models import NewsItem
 
 class ConsoleNotifier:
-    def notify(self, item: NewsItem) -> None:
+    def notify(self, item: NewsItem) -> Dict[str, Any]:
         print("\n" + "=" * 100)
         print(f"SOURCE: {item.source}")
         print(f"TICKER: {item.ticker or 'N/A'}")
@@ -15,3 +17,9 @@ class ConsoleNotifier:
         print(f"TIME  : {item.published}")
         print(f"TITLE : {item.title}")
         print(f"LINK  : {item.link}")
+        # printed: later articles of the event are shown as update lines
+        return {"uid": item.uid}
+
+    def update_cluster(self, cluster: EventCluster, ref=None) -> None:
+        latest = cluster.members[-1]
+        print(f"  + {cluster.ticker} [{cluster.topic}] {cluster.size} articles - {latest['source']}: {latest['title']}")
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+import re
+from typing import Any, Dict, Optional
 from urllib.parse import quote
 
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-import requests
 from requests.exceptions import RequestException, Timeout
 
+from core.event_cluster import EventCluster
 from core.models import NewsItem
+from core.text_prep import prepare
+from utils.http_client import get_http_client
 
 logger = logging.getLogger("market_radar.telegram")
 
+_TAG_RE = re.compile(r"<(/?)([a-zA-Z]+)[^<>]*>")
+
 
 class TelegramNotifier:
     """
@@ -24,6 +29,7 @@ class TelegramNotifier:
     - Message length validation
     - Better "NO TICKER" UX + optional company/ticker guess
     - Safer HTML escaping (including URLs)
+    - Event clusters: the alert is edited as more sources report the event
     """
 
     MAX_MESSAGE_LENGTH = 4096
@@ -44,20 +50,45 @@ class TelegramNotifier:
         self.retry_attempts = retry_attempts
         self.retry_delay = retry_delay
         self.api_url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        self.edit_url = f"https://api.telegram.org/bot{self.bot_token}/editMessageText"
+        self.http = get_http_client()
 
         logger.info(
             f"TelegramNotifier initialized: chat_id={chat_id}, "
             f"silent={silent}, thread_id={thread_id or 'None'}"
         )
 
-    def notify(self, item: NewsItem) -> None:
-        """Send notification for a NewsItem"""
+    def notify(self, item: NewsItem) -> Optional[Dict[str, Any]]:
+        """
+        Send notification for a NewsItem
+
+        Returns:
+            {"message_id", "text"} of the sent message (for update_cluster), None on failure
+        """
         try:
             text = self._format_message(item)
-            self._send_message(text)
+            message_id = self._send_message(text)
             logger.info(f"Notification sent successfully for {item.ticker or 'N/A'}: {item.title[:50]}...")
+            return {"message_id": message_id, "text": text} if message_id else None
         except Exception as e:
             logger.error(f"Failed to send notification for {item.ticker or 'N/A'}: {e}", exc_info=True)
+            return None
+
+    def update_cluster(self, cluster: EventCluster, ref: Optional[Dict[str, Any]]) -> None:
+        """Edit the cluster's alert (`ref` from notify) to list the sources that joined it."""
+        if not ref or not ref.get("message_id"):
+            return
+        try:
+            text = ref["text"] + "\n\n" + self._format_cluster_footer(cluster)
+            if len(text) > self.MAX_MESSAGE_LENGTH:
+                text = (
+                    self._truncate_html(ref["text"], self.MAX_MESSAGE_LENGTH - 200)
+                    + "\n\n" + self._format_cluster_footer(cluster, limit=2)
+                )
+            self._edit_message(ref["message_id"], text)
+            logger.info(f"Alert updated for {cluster.ticker}: {cluster.size} articles")
+        except Exception as e:
+            logger.error(f"Failed to update alert for {cluster.ticker}: {e}", exc_info=True)
 
     def send_html(self, html_message: str) -> None:
         """Send pre-formatted HTML message (for trading signals)."""
@@ -143,45 +174,47 @@ class TelegramNotifier:
 
         # Truncate if too long
         if len(message) > self.MAX_MESSAGE_LENGTH:
-            message = message[: self.MAX_MESSAGE_LENGTH - 120] + "\n\n... (truncated)"
+            message = self._truncate_html(message, self.MAX_MESSAGE_LENGTH - 120) + "\n\n... (truncated)"
             logger.warning(f"Message truncated for {item.ticker or 'N/A'}")
 
         return message
 
+    def _format_cluster_footer(self, cluster: EventCluster, limit: int = 8) -> str:
+        """'More coverage' section: the articles that joined after the lead."""
+        joined = cluster.members[1:]
+        parts = [f"🧷 <b>More coverage ({len(joined)}):</b> {self._escape_html(', '.join(cluster.sources[1:]))}"]
+        for m in joined[-limit:]:
+            parts.append(
+                f"• <a href=\"{self._escape_url(m['link'])}\">{self._escape_html(m['source'])}</a>: "
+                f"{self._escape_html(m['title'][:80])}"
+            )
+        if len(joined) > limit:
+            parts.append(f"... and {len(joined) - limit} earlier")
+        return "\n".join(parts)
+
     def _guess_company_or_ticker(self, item: NewsItem) -> Optional[str]:
         """
         Best-effort guess for missing ticker:
-        - tries to use your mapping tables (company_tickers.py)
+        - looks up the longest company name / alias in the security master
         - falls back to detecting well-known pharma patterns (e.g., GlaxoSmithKline -> GSK)
         """
-        text = f"{item.title} {item.summary}".strip()
-        if not text:
+        text = prepare(item)
+        if not text.raw.strip():
             return None
 
-        # Try your mapping logic without changing core flow:
         try:
-            # 1) Check aliases/company mapping by normalized name
-            from core.company_tickers import COMPANY_TO_TICKER, ALIASES, normalize_company_name
-
-            norm = normalize_company_name(text)
-
-            # If any known company key appears in normalized text
-            for company, ticker in COMPANY_TO_TICKER.items():
-                c_norm = normalize_company_name(company)
-                if c_norm and c_norm in norm:
-                    return f"{company.title()} → {ticker}"
-
-            for alias, ticker in ALIASES.items():
-                a_norm = normalize_company_name(alias)
-                if a_norm and a_norm in norm:
-                    return f"{alias.title()} → {ticker}"
+            from core.security_master import get_security_master
 
+            match = get_security_master().match_tokens(text.tokens)
+            if match is not None:
+                phrase, security = match
+                return f"{security.name or phrase.title()} → {security.symbol}"
         except Exception:
-            # don't break telegram formatting if imports fail
+            # don't break telegram formatting if the master can't be loaded
             pass
 
         # Simple heuristic for some common cases (optional)
-        low = text.lower()
+        low = text.lower
         if "glaxosmithkline" in low or "gsk" in low:
             return "GlaxoSmithKline → GSK"
 
@@ -203,6 +236,30 @@ class TelegramNotifier:
             .replace('"', "&quot;")
         )
 
+    @staticmethod
+    def _truncate_html(html: str, limit: int) -> str:
+        """
+        Cut rendered HTML to about `limit` characters without splitting a tag
+        or an entity (Telegram rejects those), closing the tags left open.
+        """
+        if len(html) <= limit:
+            return html
+        cut = html[:limit]
+        lt = cut.rfind("<")
+        if lt > cut.rfind(">"):
+            cut = cut[:lt]
+        amp = cut.rfind("&")  # text is escaped: a bare "&" outside tags starts an entity
+        if amp > max(cut.rfind(";"), cut.rfind(">")):
+            cut = cut[:amp]
+        open_tags = []
+        for m in _TAG_RE.finditer(cut):
+            name = m.group(2).lower()
+            if not m.group(1):
+                open_tags.append(name)
+            elif open_tags and open_tags[-1] == name:
+                open_tags.pop()
+        return cut + "".join(f"</{name}>" for name in reversed(open_tags))
+
     @staticmethod
     def _escape_url(url: str) -> str:
         """
@@ -227,8 +284,8 @@ class TelegramNotifier:
         retry=retry_if_exception_type((RequestException, Timeout)),
         reraise=True,
     )
-    def _send_message(self, text: str) -> None:
-        """Send message to Telegram with retry logic"""
+    def _send_message(self, text: str) -> Optional[int]:
+        """Send message to Telegram with retry logic. Returns the message_id."""
         payload = {
             "chat_id": self.chat_id,
             "text": text,
@@ -240,13 +297,40 @@ class TelegramNotifier:
         if self.thread_id:
             payload["message_thread_id"] = self.thread_id
 
-        response = requests.post(self.api_url, json=payload, timeout=10)
+        response = self.http.post(self.api_url, json=payload, timeout=10)
         response.raise_for_status()
 
         result = response.json()
         if not result.get("ok"):
             error_msg = result.get("description", "Unknown error")
             raise RuntimeError(f"Telegram API error: {error_msg}")
+        return (result.get("result") or {}).get("message_id")
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        retry=retry_if_exception_type((RequestException, Timeout)),
+        reraise=True,
+    )
+    def _edit_message(self, message_id: int, text: str) -> None:
+        """Replace the text of a sent message (editMessageText)"""
+        payload = {
+            "chat_id": self.chat_id,
+            "message_id": message_id,
+            "text": text,
+            "parse_mode": "HTML",
+            "disable_web_page_preview": False,
+        }
+
+        response = self.http.post(self.edit_url, json=payload, timeout=10)
+        response.raise_for_status()
+
+        result = response.json()
+        if not result.get("ok"):
+            error_msg = result.get("description", "Unknown error")
+            # editing to identical text is not a failure
+            if "message is not modified" not in error_msg:
+                raise RuntimeError(f"Telegram API error: {error_msg}")
 
     def send_test_message(self) -> bool:
         """Send a test message to verify configuration"""
@@ -349,7 +433,7 @@ class TelegramNotifier:
             if self.thread_id:
                 payload["message_thread_id"] = self.thread_id
 
-            response = requests.post(self.api_url, json=payload, timeout=10)
+            response = self.http.post(self.api_url, json=payload, timeout=10)
             response.raise_for_status()
 
             logger.info("Message with buttons sent successfully")
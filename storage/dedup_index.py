@@ -0,0 +1,82 @@
+"""
+In-Memory Dedup Index
+=====================
+Answers "have we stored this uid?" without a SQLite round-trip.
+
+SQLiteStore loads every uid from the events table on startup, adds each
+saved uid, and drops uids that cleanup removes - so the index is exact
+and a miss needs no DB check. uids are kept as 20-byte SHA-1 digests
+(make_uid output) rather than 40-char strings, about half the memory.
+
+Counters:
+- hits: duplicates answered from memory
+- misses: new items answered from memory
+- db_lookups: checks that still went to SQLite (only while not loaded)
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, Set, Union
+
+Key = Union[bytes, str]
+
+
+def _key(uid: str) -> Key:
+    if len(uid) == 40:
+        try:
+            return bytes.fromhex(uid)
+        except ValueError:
+            pass
+    return uid
+
+
+class DedupIndex:
+    def __init__(self) -> None:
+        self._keys: Set[Key] = set()
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.db_lookups = 0
+
+    def load(self, uids: Iterable[str]) -> int:
+        """Replace the index with `uids` (the whole events table). Returns the count."""
+        keys = {_key(u) for u in uids}
+        with self._lock:
+            self._keys = keys
+            self.loaded = True
+            return len(keys)
+
+    def add(self, uid: str) -> None:
+        with self._lock:
+            self._keys.add(_key(uid))
+
+    def discard(self, uid: str) -> None:
+        with self._lock:
+            self._keys.discard(_key(uid))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+
+    def contains(self, uid: str) -> bool:
+        """Membership check that updates the hit / miss counters."""
+        with self._lock:
+            found = _key(uid) in self._keys
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return found
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._keys),
+            "hits": self.hits,
+            "misses": self.misses,
+            "db_lookups": self.db_lookups,
+        }
@@ -0,0 +1,126 @@
+"""
+Feed State Store
+================
+Small JSON-backed store for per-feed polling state (HTTP validators,
+body hashes, counters) that has to survive restarts.
+
+Each key (usually a feed URL or a collector name) maps to a dict that
+callers read and update in place, then persist with save(). Collectors do
+that from their own threads: every write to a state dict takes the
+store's lock, and save() serializes a snapshot taken under the same lock,
+so a save never sees a dict mid-update. Values are replaced, not mutated
+in place (e.g. the watermark is written as a new dict on commit).
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_FILE = Path(os.getenv("FEED_STATE_FILE", "feed_state.json"))
+
+
+class FeedState(dict):
+    """One key's state: a dict whose writes hold the store's lock."""
+
+    def __init__(self, lock: threading.RLock, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._lock = lock
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        with self._lock:
+            super().__setitem__(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            super().__delitem__(key)
+
+    def pop(self, *args: Any) -> Any:
+        with self._lock:
+            return super().pop(*args)
+
+    def popitem(self) -> Any:
+        with self._lock:
+            return super().popitem()
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return super().setdefault(key, default)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        with self._lock:
+            super().update(*args, **kwargs)
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+
+    def __ior__(self, other: Any) -> "FeedState":
+        self.update(other)
+        return self
+
+
+class FeedStateStore:
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else DEFAULT_STATE_FILE
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()  # one writer of the file at a time
+        self._data: Dict[str, FeedState] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if isinstance(data, dict):
+                self._data = {k: FeedState(self._lock, v) for k, v in data.items() if isinstance(v, dict)}
+        except Exception as e:
+            logger.warning(f"Failed to load feed state from {self.path}: {e}")
+
+    def get(self, key: str) -> Dict[str, Any]:
+        """Return the (mutable) state dict for a key, creating it if needed."""
+        with self._lock:
+            state = self._data.get(key)
+            if state is None:
+                state = FeedState(self._lock)
+                self._data[key] = state
+            return state
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Deep copy of all state, consistent across keys."""
+        with self._lock:
+            return {k: copy.deepcopy(dict(v)) for k, v in self._data.items()}
+
+    def keys(self):
+        with self._lock:
+            return list(self._data.keys())
+
+    def save(self) -> None:
+        """Persist all state atomically (write temp file, then replace)."""
+        with self._save_lock:
+            try:
+                # the state lock is held for the copy only, not for encoding / the disk write
+                payload = json.dumps(self.snapshot(), indent=2, sort_keys=True)
+                tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+                tmp.write_text(payload, encoding="utf-8")
+                os.replace(tmp, self.path)
+            except Exception as e:
+                logger.error(f"Failed to save feed state to {self.path}: {e}")
+
+
+_global_store: Optional[FeedStateStore] = None
+
+
+def get_feed_state() -> FeedStateStore:
+    global _global_store
+    if _global_store is None:
+        _global_store = FeedStateStore()
+    return _global_store
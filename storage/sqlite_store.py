@@ -1,13 +1,23 @@
 from __future__ import annotations
+import json
 import sqlite3
-from typing import Optional
+from typing import List, Optional
+from core.dedup import make_uid
+from core.event_cluster import EventCluster
+from core.identity import IdentityIndex, canonical_url, identity_keys
 from core.models import NewsItem
+from storage.dedup_index import DedupIndex
 from utils.date_utils import parse_datetime_utc
 
 class SQLiteStore:
     def __init__(self, db_path: str = "market_radar.db"):
         self.db_path = db_path
         self._init()
+        # every stored uid in memory: exists() never has to query SQLite
+        self.index = DedupIndex()
+        # alternate keys (guid, canonical URL) -> canonical uid
+        self.identity = IdentityIndex()
+        self._load_index()
 
     def _conn(self):
         return sqlite3.connect(self.db_path)
@@ -29,6 +39,8 @@ class SQLiteStore:
                 validation_reason TEXT,
                 gap_pct REAL,
                 vol_spike REAL,
+                duplicate_of TEXT,         -- uid of the event this is a syndicated copy of
+                cluster_id TEXT,           -- uid of the lead article of its event cluster
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP
             )
             """)
@@ -39,11 +51,75 @@ class SQLiteStore:
             if "published_utc" not in cols:
                 c.execute("ALTER TABLE events ADD COLUMN published_utc TEXT")
                 c.commit()
+            if "duplicate_of" not in cols:
+                c.execute("ALTER TABLE events ADD COLUMN duplicate_of TEXT")
+                c.commit()
+            if "cluster_id" not in cols:
+                c.execute("ALTER TABLE events ADD COLUMN cluster_id TEXT")
+                c.commit()
+
+            c.execute("""
+            CREATE TABLE IF NOT EXISTS identity_keys (
+                kind TEXT,                 -- guid / url / title
+                value TEXT,
+                uid TEXT,
+                PRIMARY KEY (kind, value)
+            )
+            """)
+            c.execute("""
+            CREATE TABLE IF NOT EXISTS clusters (
+                cluster_id TEXT PRIMARY KEY,
+                ticker TEXT,
+                topic TEXT,
+                started REAL,              -- unix time
+                updated REAL,
+                impact_score INTEGER,
+                validated INTEGER,
+                validation_reason TEXT,
+                members TEXT,              -- JSON [{uid, source, title, link}], lead first
+                messages TEXT              -- JSON {notifier: sent message ref}
+            )
+            """)
+            c.commit()
+
+    def _load_index(self) -> None:
+        try:
+            with self._conn() as c:
+                self.index.load(row[0] for row in c.execute("SELECT uid FROM events"))
+                identity = IdentityIndex()
+                for kind, value, uid in c.execute("SELECT kind, value, uid FROM identity_keys"):
+                    identity.link(kind, value, uid)
+                # events stored before identity_keys existed: link their URLs
+                for uid, link in c.execute(
+                    "SELECT uid, link FROM events WHERE uid NOT IN (SELECT uid FROM identity_keys)"
+                ):
+                    if link:
+                        identity.link("url", canonical_url(link), uid)
+                self.identity = identity
+        except sqlite3.Error:
+            self.index.loaded = False  # exists() falls back to SQLite
+
+    def resolve_uid(self, item: NewsItem) -> str:
+        """Canonical uid for `item` (same article via another URL / guid -> same uid)."""
+        uid, _new_keys = self.identity.resolve(item)
+        return uid or make_uid(item.title, item.link, item.published)
+
+    def get_identity_stats(self) -> dict:
+        """Identity index size and how many variants it collapsed (by key kind)."""
+        return self.identity.get_stats()
+
     def exists(self, uid: str) -> bool:
+        if self.index.loaded:
+            return self.index.contains(uid)
+        self.index.db_lookups += 1
         with self._conn() as c:
             row = c.execute("SELECT 1 FROM events WHERE uid = ? LIMIT 1", (uid,)).fetchone()
             return row is not None
 
+    def get_dedup_stats(self) -> dict:
+        """Dedup index size and hit / miss / DB-lookup counters."""
+        return self.index.get_stats()
+
     def save(self, item: NewsItem) -> None:
         # try to convert item.published -> utc string (best effort)
         published_utc = ""
@@ -58,15 +134,51 @@ class SQLiteStore:
             c.execute("""
             INSERT OR IGNORE INTO events
             (uid, source, title, link, published, published_utc, ticker, impact_score, impact_reason,
-             validated, validation_reason, gap_pct, vol_spike)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+             validated, validation_reason, gap_pct, vol_spike, duplicate_of, cluster_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 item.uid, item.source, item.title, item.link, item.published, published_utc,
                 item.ticker, item.impact_score, item.impact_reason,
                 1 if item.validated else 0, item.validation_reason,
-                item.gap_pct, item.vol_spike
+                item.gap_pct, item.vol_spike, item.duplicate_of or None, item.cluster_id or None
             ))
+            c.executemany(
+                "INSERT OR IGNORE INTO identity_keys (kind, value, uid) VALUES (?, ?, ?)",
+                [(kind, value, item.uid) for kind, value in identity_keys(item)],
+            )
             c.commit()
+        self.index.add(item.uid)
+
+    def save_cluster(self, cluster: EventCluster) -> None:
+        with self._conn() as c:
+            c.execute("""
+            INSERT OR REPLACE INTO clusters
+            (cluster_id, ticker, topic, started, updated, impact_score, validated, validation_reason,
+             members, messages)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                cluster.cluster_id, cluster.ticker, cluster.topic, cluster.started, cluster.updated,
+                cluster.impact_score, 1 if cluster.validated else 0, cluster.validation_reason,
+                json.dumps(cluster.members), json.dumps(cluster.messages),
+            ))
+            c.commit()
+
+    def load_clusters(self, since: float) -> List[EventCluster]:
+        """Clusters updated at or after `since` (unix time)."""
+        with self._conn() as c:
+            rows = c.execute("""
+                SELECT cluster_id, ticker, topic, started, updated, impact_score, validated,
+                       validation_reason, members, messages
+                FROM clusters WHERE updated >= ?
+            """, (since,)).fetchall()
+        return [
+            EventCluster(
+                cluster_id=r[0], ticker=r[1], topic=r[2], started=r[3], updated=r[4],
+                impact_score=r[5] or 0, validated=bool(r[6]), validation_reason=r[7] or "",
+                members=json.loads(r[8] or "[]"), messages=json.loads(r[9] or "{}"),
+            )
+            for r in rows
+        ]
     
     def cleanup_old_news(self, keep_days: int = 1) -> int:
         """
@@ -84,8 +196,12 @@ class SQLiteStore:
                 WHERE created_at < datetime('now', ? || ' days')
             """, (f'-{keep_days}',))
             deleted = result.rowcount
+            c.execute("DELETE FROM identity_keys WHERE uid NOT IN (SELECT uid FROM events)")
+            c.execute("DELETE FROM clusters WHERE cluster_id NOT IN (SELECT uid FROM events)")
             c.commit()
-            return deleted
+        if deleted:
+            self._load_index()
+        return deleted
             
     def get_stats(self) -> dict:
         """Get database statistics"""
@@ -110,4 +226,8 @@ class SQLiteStore:
         """Clear all events from database (use with caution!)"""
         with self._conn() as c:
             c.execute("DELETE FROM events")
-            c.commit()
\ No newline at end of file
+            c.execute("DELETE FROM identity_keys")
+            c.execute("DELETE FROM clusters")
+            c.commit()
+        self.index.clear()
+        self.identity = IdentityIndex()
\ No newline at end of file
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test the Aho-Corasick keyword automaton and keyword scoring built on it
+"""
+
+import re
+
+from collectors.sec_filtered_collector import SECFilteredCollector
+from core.aho_corasick import AhoCorasick
+from core.scoring import KEYWORDS, SOURCE_BONUS, score
+from core.stock_filter import is_stock_market_related
+from tools.bench_filters import legacy_is_clinical_related, legacy_is_stock_market_related
+from tools.bench_keywords import HEADLINES
+
+
+def _legacy_score(source, title, summary):
+    text = f"{title} {summary}".lower()
+    score_val = SOURCE_BONUS.get(source, 0)
+    hits = []
+    for k, w in KEYWORDS.items():
+        if k in text:
+            score_val += w
+            hits.append(k)
+    score_val = min(score_val, 100)
+    return score_val, ", ".join(hits[:8]) if hits else "no-keyword-hit"
+
+
+def test_score_matches_substring_loop():
+    cases = HEADLINES + [
+        ("NASDAQ agenda: Acme ACQUIRED by Globex", "Tablets available; bankruptcy and going concern doubts"),
+        ("", ""),
+        ("S-4 filed; 8-K follows", "phase iii / phase ii / PDUFA date set, fast track and BLA"),
+    ]
+    for source in ("PR Newswire", "SEC EDGAR", "Unknown"):
+        for title, summary in cases:
+            assert score(source, title, summary) == _legacy_score(source, title, summary), title
+
+
+def test_overlapping_phrases_and_word_boundaries():
+    ac = AhoCorasick(["phase 3", "phase", "he", "she", "hers"])
+    found = sorted((s, e, ac.patterns[p]) for s, e, p in ac.finditer("Ushers in PHASE 3"))
+    assert found == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers"), (10, 15, "phase"), (10, 17, "phase 3")]
+
+    bounded = AhoCorasick([("nda", True), ("s-4", True), ("$acme", True), ("merger", False)])
+    for text in ("agenda items", "mergers: S-40 filed", "the NDA was filed", "file s-4.", "buy $ACME now", "x$acme"):
+        expected = {i for i, p in enumerate(bounded.patterns)
+                    if (re.search(r"\b" + re.escape(p) + r"\b", text, re.I) if bounded.whole_word[i] else p in text.lower())}
+        assert bounded.matches(text) == expected, text
+
+
+def test_filters_match_per_pattern_regexes():
+    sec = SECFilteredCollector.__new__(SECFilteredCollector)
+    cases = HEADLINES + [
+        ("", ""),
+        ("Phase\n3 data; phase ii cohort", "meets  endpoint"),
+        ("Pre-market movers: S&P 500 futures", "halted shares"),
+        ("Phase III? no: phase iiI", "Therapeutics Inc files IND\tapplication"),
+        ("Celebrity recipe", "sports and gaming"),
+        ("Ticker $ACME", ""),
+        ("Trial resultant index", "antibodyguard"),
+    ]
+    for title, summary in cases:
+        assert is_stock_market_related(title, summary) == legacy_is_stock_market_related(title, summary), title
+        assert sec._is_clinical_related(title, summary) == legacy_is_clinical_related(title, summary), title
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_score_matches_substring_loop,
+        test_overlapping_phrases_and_word_boundaries,
+        test_filters_match_per_pattern_regexes,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
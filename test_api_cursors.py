@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test incremental cursors for the premium news API collectors (offline)
+"""
+
+import tempfile
+from pathlib import Path
+
+from collectors.alpha_vantage_collector import AlphaVantageCollector
+from collectors.newsapi_ai_collector import NewsAPIaiCollector
+from collectors.thenewsapi_collector import TheNewsAPICollector
+from core.quota_budget import QuotaBudget
+from storage.feed_state import FeedStateStore
+
+
+class _Resp:
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeHttp:
+    """Stands in for the shared HTTP client."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        self.calls.append(params)
+        return _Resp(self.responses.pop(0))
+
+    def post(self, url, json=None, timeout=None, **kwargs):
+        self.calls.append(json)
+        return _Resp(self.responses.pop(0))
+
+
+def _run(collector, *responses):
+    collector.http = FakeHttp(*responses)
+    return [collector.fetch() for _ in responses], collector.http.calls
+
+
+def _kwargs(name):
+    store = FeedStateStore(Path(tempfile.mkdtemp()) / "state.json")
+    return {"state_store": store, "budget": QuotaBudget(name, daily_limit=0, state_store=store)}
+
+
+def _av(url, t):
+    return {"title": url, "url": url, "time_published": t}
+
+
+def test_alpha_vantage_sends_cursor_and_dedupes():
+    c = AlphaVantageCollector("key", **_kwargs("AV"))
+    first = {"feed": [_av("b", "20260107T074512"), _av("a", "20260107T070000")]}
+    second = {"feed": [_av("c", "20260107T080000"), _av("b", "20260107T074512")]}
+    (r1, r2), calls = _run(c, first, second)
+    assert "time_from" not in calls[0]
+    assert calls[1]["time_from"] == "20260107T0740"  # newest minus overlap, minute precision
+    assert [i.link for i in r1] == ["b", "a"]
+    assert [i.link for i in r2] == ["c"]
+
+
+def test_thenewsapi_minute_precision_cursor():
+    c = TheNewsAPICollector("token", **_kwargs("TNA"))
+    art = {"uuid": "u1", "title": "t", "url": "https://x/1", "published_at": "2026-01-07T07:45:30.000000Z"}
+    (r1, r2), calls = _run(c, {"data": [art]}, {"data": [art]})
+    assert len(calls[0]["published_after"]) == len("2026-01-07T07:45:00")
+    assert calls[1]["published_after"] == "2026-01-07T07:40:00"
+    assert len(r1) == 1 and r2 == []
+
+
+def test_newsapi_ai_cursor_and_short_bodies():
+    c = NewsAPIaiCollector("key", **_kwargs("AI"))
+    art = {"uri": "1", "title": "t", "url": "https://x/1", "dateTime": "2026-01-07T07:45:00Z", "body": "b"}
+    (r1, r2), calls = _run(c, {"articles": {"results": [art]}}, {"articles": {"results": [art]}})
+    assert calls[0]["articleBodyLen"] == 500
+    assert {"dateStart": "2026-01-07"} in calls[1]["query"]["$query"]["$and"]
+    assert len(r1) == 1 and r2 == []
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_alpha_vantage_sends_cursor_and_dedupes,
+        test_thenewsapi_minute_precision_cursor,
+        test_newsapi_ai_cursor_and_short_bodies,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Test circuit breakers and the global retry budget (offline)
+"""
+
+import http.server
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from collectors.rss_collector import RSSCollector
+from core.models import NewsItem
+from core.validation import validate_market_impact
+from market_data.base import MarketSnapshot
+from market_data.market_data_manager import MarketDataManager, ProviderType
+from storage.feed_state import FeedStateStore
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, RetryBudget, get_breakers
+from utils.http_client import HttpClient
+
+
+class Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_opens_after_threshold_and_probes_with_backoff():
+    clock = Clock()
+    b = CircuitBreaker("x", failure_threshold=3, cooldown=10, max_cooldown=40, clock=clock)
+    for _ in range(3):
+        assert b.allow()
+        b.record_failure()
+    assert b.state == OPEN and not b.allow()
+
+    clock.t = 10
+    assert b.state == HALF_OPEN
+    assert b.allow() and not b.allow()  # one probe at a time
+    b.record_failure()
+    assert b.state == OPEN and b.retry_in() == 20  # cooldown doubled
+
+    clock.t = 30
+    assert b.allow()
+    b.record_success()
+    assert b.state == CLOSED and b.allow()
+
+
+def test_retry_budget_limits_retries():
+    clock = Clock()
+    budget = RetryBudget(ratio=0.5, min_retries=1, window=60, clock=clock)
+    for _ in range(4):
+        budget.record_request()
+    assert sum(budget.try_spend() for _ in range(10)) == 3  # 1 + 0.5 * 4
+    clock.t = 61
+    assert budget.try_spend()
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = 0
+
+    def do_GET(self):
+        _Handler.hits += 1
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_http_client_stops_retrying_when_budget_is_spent():
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        _Handler.hits = 0
+        client = HttpClient(retries=3, backoff_factor=0, retry_budget=RetryBudget(ratio=0, min_retries=1))
+        resp = client.get(f"http://127.0.0.1:{srv.server_port}/")
+        assert resp.status_code == 503
+        assert _Handler.hits == 2  # one request + the single budgeted retry
+    finally:
+        srv.shutdown()
+
+
+class _DeadSession:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls += 1
+        raise ConnectionError("down")
+
+
+def test_dead_feed_is_skipped():
+    c = RSSCollector([("Dead Feed (test)", "https://dead.invalid/feed")],
+                     state_store=FeedStateStore(Path(tempfile.mkdtemp()) / "s.json"))
+    c.session = _DeadSession()
+    for _ in range(5):
+        c.fetch()
+    assert c.session.calls == get_breakers().get("rss:Dead Feed (test)").failure_threshold
+    assert c.last_circuit_open == ["Dead Feed (test)"]
+
+
+class _BrokenProvider:
+    def __init__(self):
+        self.calls = 0
+
+    def get_snapshot(self, ticker):
+        self.calls += 1
+        raise RuntimeError("provider down")
+
+
+class _GoodProvider:
+    def get_snapshot(self, ticker):
+        return MarketSnapshot(ticker, 10.0, 9.0, None, None)
+
+
+class _UnknownTickerProvider:
+    """Answers fine, but only knows AAPL; `error` simulates a swallowed HTTP error."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    def get_snapshot(self, ticker):
+        self.calls += 1
+        if self.error:
+            return MarketSnapshot(ticker, None, None, None, None, error=self.error)
+        return MarketSnapshot(ticker, 10.0 if ticker == "AAPL" else None, 9.0, None, None)
+
+
+def test_manager_skips_provider_with_open_circuit():
+    get_breakers().get("provider:polygon").record_success()  # fresh state
+    broken = _BrokenProvider()
+    m = MarketDataManager()
+    m.add_provider(ProviderType.POLYGON, broken, priority=1)
+    m.add_provider(ProviderType.YFINANCE, _GoodProvider(), priority=2)
+    for _ in range(6):
+        assert m.get_snapshot("AAPL").price == 10.0
+    stats = m.get_stats()["polygon"]
+    assert broken.calls == 3 and stats["circuit"] == OPEN and stats["circuit_skips"] == 3
+
+
+def test_unknown_tickers_dont_open_circuits():
+    for name in ("provider:finnhub", "provider:yfinance"):
+        get_breakers().get(name).record_success()
+    first, last = _UnknownTickerProvider(), _UnknownTickerProvider()
+    m = MarketDataManager()
+    m.add_provider(ProviderType.FINNHUB, first, priority=1)
+    m.add_provider(ProviderType.YFINANCE, last, priority=2)
+    for _ in range(5):
+        assert m.get_snapshot("DELISTED") is None
+    assert m.get_stats()["finnhub"]["circuit"] == CLOSED
+    assert m.get_snapshot("AAPL").price == 10.0 and first.calls == 6
+
+
+def test_last_resort_is_tried_with_open_circuit():
+    for name in ("provider:finnhub", "provider:yfinance"):
+        get_breakers().get(name).record_success()
+    m = MarketDataManager()
+    m.add_provider(ProviderType.FINNHUB, _UnknownTickerProvider(error="HTTP 503"), priority=1)
+    m.add_provider(ProviderType.YFINANCE, _UnknownTickerProvider(error="HTTP 429"), priority=2)
+    for _ in range(4):
+        assert m.get_snapshot("AAPL") is None
+    stats = m.get_stats()
+    assert stats["finnhub"]["circuit"] == OPEN and stats["yfinance"]["circuit"] == OPEN
+
+    last = m.providers[ProviderType.YFINANCE]["instance"]
+    last.error = None
+    assert m.get_snapshot("AAPL").price == 10.0
+    assert m.get_stats()["yfinance"]["circuit"] == CLOSED
+
+    # no snapshot at all: not validated (instead of an AttributeError letting it through)
+    last.error = "HTTP 429"
+    item = NewsItem(source="test", title="t", link="https://example.com/a", ticker="AAPL")
+    assert validate_market_impact(item, m, 2.0, 1.3) == (False, "no-market-data")
+
+
+class _ProfileProvider(_GoodProvider):
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def get_company_profile(self, ticker):
+        if self.fail:
+            raise RuntimeError("HTTP 503")
+        return {"ticker": ticker, "name": "Apple"}
+
+
+def test_profile_lookups_report_to_the_breaker():
+    breaker = get_breakers().get("provider:polygon")
+    clock = Clock()
+    breaker.clock = clock
+    try:
+        breaker.record_success()  # fresh state
+        provider = _ProfileProvider(fail=True)
+        m = MarketDataManager()
+        m.add_provider(ProviderType.POLYGON, provider, priority=1)
+        m.add_provider(ProviderType.YFINANCE, _GoodProvider(), priority=2)  # no profiles
+        for _ in range(3):
+            assert m.get_company_profile("AAPL") is None
+        assert breaker.state == OPEN
+
+        # the half-open probe reports back instead of leaving the circuit stuck
+        clock.t += breaker.base_cooldown
+        provider.fail = False
+        assert m.get_company_profile("AAPL")["name"] == "Apple"
+        assert breaker.state == CLOSED
+    finally:
+        breaker.clock = time.monotonic
+        breaker.record_success()
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_opens_after_threshold_and_probes_with_backoff,
+        test_retry_budget_limits_retries,
+        test_http_client_stops_retrying_when_budget_is_spent,
+        test_dead_feed_is_skipped,
+        test_manager_skips_provider_with_open_circuit,
+        test_unknown_tickers_dont_open_circuits,
+        test_last_resort_is_tried_with_open_circuit,
+        test_profile_lookups_report_to_the_breaker,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
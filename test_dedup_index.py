@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test the in-memory dedup index in front of SQLiteStore
+"""
+
+import tempfile
+from pathlib import Path
+
+from core.dedup import make_uid
+from core.models import NewsItem
+from storage.sqlite_store import SQLiteStore
+
+
+def _item(n):
+    item = NewsItem(source="Test", title=f"Headline {n}", link=f"https://example.com/{n}", published="", summary="")
+    item.uid = make_uid(item.title, item.link, item.published)
+    return item
+
+
+def test_exists_answers_from_memory():
+    store = SQLiteStore(str(Path(tempfile.mkdtemp()) / "events.db"))
+    a, b = _item(1), _item(2)
+    store.save(a)
+    assert store.exists(a.uid) and not store.exists(b.uid)
+    assert store.get_dedup_stats() == {"size": 1, "hits": 1, "misses": 1, "db_lookups": 0}
+
+
+def test_index_loaded_from_existing_db_and_follows_cleanup():
+    path = str(Path(tempfile.mkdtemp()) / "events.db")
+    first = SQLiteStore(path)
+    for n in range(5):
+        first.save(_item(n))
+
+    restarted = SQLiteStore(path)
+    assert len(restarted.index) == 5
+    assert all(restarted.exists(_item(n).uid) for n in range(5))
+
+    restarted.clear_all()
+    assert not restarted.exists(_item(0).uid)
+    assert restarted.get_dedup_stats()["db_lookups"] == 0
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_exists_answers_from_memory,
+        test_index_loaded_from_existing_db_and_follows_cleanup,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test per-ticker event clustering (one validation / alert per event, updated as articles join)
+"""
+
+import re
+import tempfile
+from pathlib import Path
+
+from core.event_cluster import EventClusterIndex
+from core.models import NewsItem
+from core.scoring import topic
+from notifier.telegram import TelegramNotifier
+from storage.sqlite_store import SQLiteStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _item(uid, title, source="PR Newswire", ticker="ACME"):
+    return NewsItem(source=source, title=title, link=f"https://example.com/{uid}", ticker=ticker, uid=uid, impact_score=70)
+
+
+def test_articles_join_open_cluster_by_ticker_and_topic():
+    clock = Clock()
+    clusters = EventClusterIndex(window=600, clock=clock)
+    lead = _item("a", "Acme to acquire Beta in $2B definitive agreement")
+    t = topic(lead.title)
+    assert t == "m&a" and clusters.find("ACME", t) is None
+    cluster = clusters.open(lead, t)
+
+    clock.now += 300
+    follow = _item("b", "Acme's Beta acquisition: what investors need to know", source="Yahoo Finance")
+    assert clusters.find("acme", topic(follow.title)) is cluster
+    clusters.join(cluster, follow)
+    assert cluster.size == 2 and cluster.sources == ["PR Newswire", "Yahoo Finance"]
+    assert clusters.cluster_of("b") is cluster
+
+    # other topic / other ticker: separate events
+    assert clusters.find("ACME", topic("Acme announces $300M public offering")) is None
+    assert clusters.find("BETA", t) is None
+
+    # the window runs from the last article
+    clock.now += 599
+    assert clusters.find("ACME", t) is cluster
+    clock.now += 2
+    assert clusters.find("ACME", t) is None and clusters.cluster_of("a") is None
+    assert clusters.get_stats() == {"clusters": 0, "opened": 1, "joined": 1}
+
+
+def test_clusters_survive_restart():
+    path = str(Path(tempfile.mkdtemp()) / "events.db")
+    clock = Clock()
+    store = SQLiteStore(path)
+    clusters = EventClusterIndex(window=600, clock=clock)
+    lead = _item("a", "Acme to acquire Beta")
+    cluster = clusters.open(lead, "m&a")
+    cluster.validated, cluster.validation_reason = True, "gap 4.1%"
+    cluster.messages["TelegramNotifier"] = {"message_id": 42, "text": "alert"}
+    lead.cluster_id = cluster.cluster_id
+    store.save(lead)
+    store.save_cluster(cluster)
+
+    restarted = EventClusterIndex(window=600, clock=clock)
+    assert restarted.load(SQLiteStore(path).load_clusters(since=clock.now - 600)) == 1
+    again = restarted.find("ACME", "m&a")
+    assert again.cluster_id == "a" and again.validated and again.messages["TelegramNotifier"]["message_id"] == 42
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+
+class FakeHttp:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, url, json=None, timeout=None):
+        self.posts.append((url.rsplit("/", 1)[-1], json))
+        return FakeResponse({"ok": True, "result": {"message_id": 7}})
+
+
+def test_telegram_alert_is_edited_as_articles_join():
+    tg = TelegramNotifier(bot_token="t", chat_id="c")
+    tg.http = FakeHttp()
+    clusters = EventClusterIndex(window=600)
+    lead = _item("a", "Acme to acquire Beta")
+    cluster = clusters.open(lead, "m&a")
+    ref = tg.notify(lead)
+    assert ref["message_id"] == 7
+
+    clusters.join(cluster, _item("b", "Acme buys Beta", source="Reuters"))
+    tg.update_cluster(cluster, ref)
+    method, payload = tg.http.posts[-1]
+    assert method == "editMessageText" and payload["message_id"] == 7
+    assert payload["text"].startswith(ref["text"]) and "More coverage (1)" in payload["text"]
+    assert len(tg.http.posts) == 2
+
+
+def _well_formed(html):
+    """No split tag / entity, every tag closed (what Telegram's HTML parse mode requires)."""
+    if re.search(r"<[^>]*$", html) or re.search(r"&(?![a-z]+;|#\d+;)", re.sub(r"<[^>]*>", "", html)):
+        return False
+    stack = []
+    for closing, name in re.findall(r"<(/?)([a-z]+)[^>]*>", html):
+        if not closing:
+            stack.append(name)
+        elif not stack or stack.pop() != name:
+            return False
+    return not stack
+
+
+def test_long_alert_is_cut_at_a_safe_boundary():
+    tg = TelegramNotifier(bot_token="t", chat_id="c")
+    tg.http = FakeHttp()
+    lead = _item("a", "Acme & Beta <merger> " * 300)
+    lead.impact_reason = "m&a"
+    ref = tg.notify(lead)
+    assert len(ref["text"]) <= tg.MAX_MESSAGE_LENGTH and _well_formed(ref["text"])
+    for limit in range(0, 200):
+        assert _well_formed(TelegramNotifier._truncate_html(ref["text"], limit)), limit
+
+    ref = {"message_id": 7, "text": ref["text"]}
+    clusters = EventClusterIndex(window=600)
+    cluster = clusters.open(lead, "m&a")
+    clusters.join(cluster, _item("b", "Acme & Beta", source="Reuters"))
+    tg.update_cluster(cluster, ref)
+    text = tg.http.posts[-1][1]["text"]
+    assert len(text) <= tg.MAX_MESSAGE_LENGTH and _well_formed(text) and "More coverage (1)" in text
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_articles_join_open_cluster_by_ticker_and_topic,
+        test_clusters_survive_restart,
+        test_telegram_alert_is_edited_as_articles_join,
+        test_long_alert_is_cut_at_a_safe_boundary,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
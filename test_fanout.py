@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test parallel collector fan-out with per-collector deadlines
+"""
+
+import threading
+
+from core.fanout import FanOut
+
+WAIT = 5  # only bounds a hang if something is broken; no test waits this long
+
+
+def _task(value, wait_for=None, done=None, barrier=None):
+    def fn():
+        if barrier is not None:
+            barrier.wait(WAIT)  # raises unless every task runs at the same time
+        if wait_for is not None:
+            wait_for.wait(WAIT)
+        yield value
+        if done is not None:
+            done.set()
+    return fn
+
+
+def test_results_arrive_in_completion_order_and_run_in_parallel():
+    fanout = FanOut(max_workers=4)
+    running = threading.Barrier(3)
+    fast_done, mid_done = threading.Event(), threading.Event()
+    got = list(fanout.run({
+        "slow": (_task("s", wait_for=mid_done, barrier=running), WAIT),
+        "fast": (_task("f", done=fast_done, barrier=running), WAIT),
+        "mid": (_task("m", wait_for=fast_done, done=mid_done, barrier=running), WAIT),
+    }))
+    assert got == [("fast", "f"), ("mid", "m"), ("slow", "s")]
+    assert fanout.last_missed == []
+
+
+def test_missed_deadline_is_skipped_then_delivered_late():
+    fanout = FanOut(max_workers=4)
+    gate, delivered = threading.Event(), threading.Event()
+    got = list(fanout.run({"stuck": (_task("late", wait_for=gate, done=delivered), 0.1), "ok": (_task("x"), WAIT)}))
+    assert got == [("ok", "x")]
+    assert fanout.last_missed == ["stuck"]
+
+    # still running: not started a second time
+    assert list(fanout.run({"stuck": (_task("again"), WAIT)})) == []
+    assert fanout.last_busy == ["stuck"]
+
+    gate.set()
+    assert delivered.wait(WAIT)  # the batch was handed over (to `late`, the stream is detached)
+    got = list(fanout.run({}))
+    assert got == [("stuck", "late")] and fanout.last_late == ["stuck"]
+
+
+def test_batches_stream_before_task_finishes_with_bounded_queue():
+    pulled = []
+    blocked = threading.Event()
+
+    def feeds():
+        for i in range(20):
+            pulled.append(i)
+            if len(pulled) == 4:
+                blocked.set()
+            yield i
+
+    fanout = FanOut(max_workers=2, max_queued=2)
+    run = fanout.run({"RSS": (feeds, WAIT)})
+    assert next(run) == ("RSS", 0)
+    # slow consumer: the producer waits instead of buffering everything -
+    # one batch consumed, two queued, one waiting for room
+    assert blocked.wait(WAIT)
+    assert len(pulled) == 4
+    assert sum(1 for _ in run) == 19
+    assert fanout.last_missed == []
+
+
+def test_failing_collector_does_not_stop_others():
+    failed = threading.Event()
+
+    def boom():
+        yield "partial"
+        failed.set()
+        raise RuntimeError("down")
+
+    fanout = FanOut(max_workers=2)
+    got = list(fanout.run({"bad": (boom, WAIT), "good": (_task(1, wait_for=failed), WAIT)}))
+    assert got == [("bad", "partial"), ("good", 1)]
+
+
+def test_queued_batches_survive_a_consumer_error():
+    produced = threading.Event()
+
+    def feeds():
+        yield from ("a", "b", "c")
+        produced.set()
+
+    fanout = FanOut(max_workers=2)
+    try:
+        for key, batch in fanout.run({"RSS": (feeds, WAIT)}):
+            assert produced.wait(WAIT)  # "b" and "c" are queued behind "a"
+            raise RuntimeError("pipeline error")
+    except RuntimeError:
+        pass  # like the poll loop: the abandoned run() is closed
+
+    got = list(fanout.run({}))
+    assert got == [("RSS", "b"), ("RSS", "c")] and fanout.last_late == ["RSS"]
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_results_arrive_in_completion_order_and_run_in_parallel,
+        test_missed_deadline_is_skipped_then_delivered_late,
+        test_batches_stream_before_task_finishes_with_bounded_queue,
+        test_failing_collector_does_not_stop_others,
+        test_queued_batches_survive_a_consumer_error,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
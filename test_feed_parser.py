@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test the streaming lxml feed parser against feedparser (offline)
+"""
+
+from collectors import feed_parser
+from collectors.feed_parser import iter_entries
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel><title>Wire</title>
+<item>
+  <title><![CDATA[Acme Corp (NASDAQ: ACME) to Acquire Widget Inc]]></title>
+  <link>https://example.com/acme</link>
+  <guid isPermaLink="false">acme-1</guid>
+  <pubDate>Wed, 07 Jan 2026 07:45:00 GMT</pubDate>
+  <description>Acme announces a definitive agreement.</description>
+</item>
+<item>
+  <title>Beta Therapeutics Phase 3 topline</title>
+  <link>https://example.com/beta</link>
+  <guid>beta-1</guid>
+  <pubDate>Wed, 07 Jan 2026 07:30:00 GMT</pubDate>
+  <description>Met its primary endpoint.</description>
+</item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="ISO-8859-1" ?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+<title>Latest Filings</title>
+<entry>
+  <title>8-K - ACME CORP (0001234567) (Filer)</title>
+  <link rel="alternate" type="text/html" href="https://www.sec.gov/Archives/edgar/data/1234567/0001234567-26-000001-index.htm"/>
+  <summary type="html"> &lt;b&gt;Filed:&lt;/b&gt; 2026-01-07 </summary>
+  <updated>2026-01-07T07:45:00-05:00</updated>
+  <category scheme="https://www.sec.gov/" label="form type" term="8-K"/>
+  <id>urn:tag:sec.gov,2008:accession-number=0001234567-26-000001</id>
+</entry>
+</feed>"""
+
+BROKEN = RSS.replace(b"Met its primary endpoint.", b"Met&nbsp;its primary endpoint.")
+
+
+def _fields(entries):
+    return [(e.title, e.link, e.guid, e.published or e.updated) for e in entries]
+
+
+def test_rss_fast_matches_feedparser():
+    assert _fields(iter_entries(RSS, fast=True)) == _fields(iter_entries(RSS, fast=False))
+
+
+def test_atom_fast_matches_feedparser():
+    fast = list(iter_entries(ATOM, fast=True))
+    slow = list(iter_entries(ATOM, fast=False))
+    assert [(e.title, e.link, e.guid) for e in fast] == [(e.title, e.link, e.guid) for e in slow]
+    assert fast[0].updated == "2026-01-07T07:45:00-05:00"
+
+
+def test_fallback_continues_without_duplicates():
+    errors = []
+    entries = list(iter_entries(BROKEN, fast=True, on_fallback=errors.append))
+    assert [e.guid for e in entries] == ["acme-1", "beta-1"]
+    assert errors
+
+
+def test_early_stop_does_not_parse_rest():
+    it = feed_parser.iter_entries_fast(RSS)
+    first = next(it)
+    it.close()
+    assert first.guid == "acme-1"
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_rss_fast_matches_feedparser,
+        test_atom_fast_matches_feedparser,
+        test_fallback_continues_without_duplicates,
+        test_early_stop_does_not_parse_rest,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test capturing HTTP responses and replaying them offline
+"""
+
+import http.server
+import tempfile
+import threading
+from pathlib import Path
+
+import requests
+
+from collectors.rss_collector import RSSCollector
+from storage.feed_state import FeedStateStore
+from utils.http_archive import HttpArchiveWriter, iter_records
+from utils.http_client import HttpClient
+
+FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Wire</title>
+<item><title>Acme (NASDAQ: ACME) announces FDA approval</title>
+<link>https://example.com/acme</link><guid>acme-1</guid>
+<pubDate>Wed, 07 Jan 2026 12:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = FEED if self.path.startswith("/feed") else b'{"n": 1}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml" if self.path.startswith("/feed") else "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _capture(path):
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_port}"
+    try:
+        client = HttpClient()
+        client.enable_capture(path)
+        client.get(base + "/feed")
+        client.get(base + "/api", params={"time_from": "20260107T0700"})
+        client.close()
+    finally:
+        srv.shutdown()
+    return base
+
+
+def test_capture_then_replay_offline():
+    path = Path(tempfile.mkdtemp()) / "archive.jsonl.gz"
+    base = _capture(path)
+    assert [r["status"] for r in iter_records(path)] == [200, 200]
+
+    # the server is gone - everything below is served from the archive
+    client = HttpClient()
+    replay = client.enable_replay(path)
+    rss = RSSCollector([("Wire", base + "/feed")], concurrent=False,
+                       state_store=FeedStateStore(path.parent / "state.json"))
+    rss.session = client
+    items = rss.fetch()
+    assert [i.title for i in items] == ["Acme (NASDAQ: ACME) announces FDA approval"]
+
+    # different cursor in the query string -> matched on the path
+    assert client.get(base + "/api", params={"time_from": "20260107T0900"}).json() == {"n": 1}
+    # responses ran out -> the last one is served again
+    assert client.get(base + "/api").json() == {"n": 1}
+    assert replay.served == 3 and client.warm_up([base + "/feed"]) == 0
+
+
+def test_unrecorded_request_fails_like_network_error():
+    path = Path(tempfile.mkdtemp()) / "archive.jsonl.gz"
+    base = _capture(path)
+    client = HttpClient()
+    client.enable_replay(path)
+    try:
+        client.get(base + "/unknown")
+        assert False, "expected ConnectionError"
+    except requests.ConnectionError:
+        pass
+    assert client.replay.missed == 1
+
+
+def test_credentials_are_redacted():
+    path = Path(tempfile.mkdtemp()) / "archive.jsonl.gz"
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_port}"
+    try:
+        client = HttpClient()
+        client.enable_capture(path)
+        client.get(base + "/query", params={"function": "NEWS_SENTIMENT", "apikey": "SECRET1"})
+        client.get(base + "/bot123456:SECRET2/getMe")
+        client.get(base + "/v1/news", params={"api_token": "SECRET3", "search": "fda"})
+        client.close()
+    finally:
+        srv.shutdown()
+
+    # notifier traffic isn't recorded at all
+    resp = requests.Response()
+    resp.status_code, resp._content = 200, b"{}"
+    resp.request = requests.Request("POST", "https://api.telegram.org/bot1:SECRET4/sendMessage").prepare()
+    writer = HttpArchiveWriter(path)
+    writer.record(resp, 0.01)
+    writer.close()
+
+    raw = "\n".join(r["url"] for r in iter_records(path))
+    assert "SECRET" not in raw and raw.count("REDACTED") == 3 and "telegram" not in raw
+
+    # replay matches the real (unredacted) request on the redacted form
+    client = HttpClient()
+    client.enable_replay(path)
+    assert client.get(base + "/query", params={"function": "NEWS_SENTIMENT", "apikey": "OTHER"}).json() == {"n": 1}
+    assert client.get(base + "/bot123456:SECRET2/getMe").status_code == 200
+    assert client.replay.missed == 0
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_capture_then_replay_offline,
+        test_unrecorded_request_fails_like_network_error,
+        test_credentials_are_redacted,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test the shared pooled HTTP client against a local server (offline)
+"""
+
+import http.server
+import threading
+
+from utils.http_client import HttpClient, ResponseTooLarge
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    connections = set()
+
+    def do_GET(self):
+        _Handler.connections.add(self.client_address)
+        body = b"x" * (4096 if self.path == "/big" else 16)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        _Handler.connections.add(self.client_address)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def _server():
+    _Handler.connections = set()
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, f"http://127.0.0.1:{srv.server_port}"
+
+
+def test_keep_alive_reuses_connection():
+    srv, base = _server()
+    try:
+        client = HttpClient()
+        for _ in range(3):
+            assert client.get(base + "/a").content == b"x" * 16
+        assert len(_Handler.connections) == 1
+    finally:
+        srv.shutdown()
+
+
+def test_warm_up_preconnects_once():
+    srv, base = _server()
+    try:
+        client = HttpClient()
+        assert client.warm_up([base + "/a", base + "/b"]) == 1
+        assert client.warm_up([base + "/a"]) == 0  # idle connection already pooled
+        assert client.warm_up([base + "/a"], idle=0) == 1
+        client.get(base + "/a")
+        assert len(_Handler.connections) == 1  # the request reuses the warm connection
+    finally:
+        srv.shutdown()
+
+
+def test_size_cap_and_stats():
+    srv, base = _server()
+    try:
+        client = HttpClient(max_bytes=1024)
+        try:
+            client.get(base + "/big")
+            assert False, "expected ResponseTooLarge"
+        except ResponseTooLarge:
+            pass
+        client.get(base + "/a")
+        stats = client.get_stats()["127.0.0.1"]
+        assert stats["requests"] == 2 and stats["errors"] == 1 and stats["bytes"] == 16
+    finally:
+        srv.shutdown()
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_keep_alive_reuses_connection,
+        test_warm_up_preconnects_once,
+        test_size_cap_and_stats,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
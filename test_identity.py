@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test canonical article identity (URL normalization, guid preference, persistence)
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from core.identity import IdentityIndex, canonical_url
+from core.models import NewsItem
+from storage.sqlite_store import SQLiteStore
+
+
+def _item(link, guid="", published="", source="CNBC", feed="https://cnbc.example/rss"):
+    raw = {"feed": feed, "guid": guid} if guid else {}
+    return NewsItem(source=source, title="Acme beats estimates", link=link, published=published, raw=raw)
+
+
+def test_canonical_url_variants():
+    base = "https://cnbc.com/2026/01/07/acme.html"
+    for variant in (
+        "https://www.cnbc.com/2026/01/07/acme.html?utm_source=rss&utm_medium=feed",
+        "http://cnbc.com/2026/01/07/acme.html/",
+        "https://amp.cnbc.com/2026/01/07/acme.amp.html#comments",
+        "https://m.cnbc.com:443/2026/01/07/acme.html?fbclid=abc",
+    ):
+        assert canonical_url(variant) == base, variant
+    assert canonical_url("https://theverge.com/amp/2026/1/7/acme") == "https://theverge.com/2026/1/7/acme"
+    # real query parameters are kept (sorted)
+    assert canonical_url("https://x.com/a?id=2&page=1") == "https://x.com/a?id=2&page=1"
+    assert canonical_url("https://x.com/a?page=1&id=2") == "https://x.com/a?id=2&page=1"
+
+
+def test_variants_collapse_to_one_id():
+    index = IdentityIndex()
+    first, _ = index.resolve(_item("https://www.cnbc.com/a.html", published="Wed, 07 Jan 2026 07:00:00 GMT"))
+    again, new = index.resolve(_item("https://cnbc.com/a.html?utm_campaign=x", published="Wed, 07 Jan 2026 09:00:00 GMT"))
+    assert again == first and new == []
+    assert index.get_stats()["repeats"] == 1
+
+    # same guid, link changed -> same article, new link remembered
+    g1, _ = index.resolve(_item("https://cnbc.com/b.html", guid="108"))
+    g2, new = index.resolve(_item("https://cnbc.com/b-updated.html", guid="108"))
+    assert g1 == g2 and new == [("url", "https://cnbc.com/b-updated.html")]
+    assert index.get_stats()["collapsed_by"] == {"guid": 1}
+
+    # different guids sharing a link stay separate
+    s1, _ = index.resolve(_item("https://cnbc.com/live", guid="201"))
+    s2, _ = index.resolve(_item("https://cnbc.com/live", guid="202"))
+    assert s1 != s2
+
+
+def test_store_persists_identity_and_links_legacy_rows():
+    path = str(Path(tempfile.mkdtemp()) / "events.db")
+    store = SQLiteStore(path)
+    item = _item("https://www.cnbc.com/c.html", guid="300")
+    item.uid = store.resolve_uid(item)
+    store.save(item)
+
+    restarted = SQLiteStore(path)
+    variant = _item("https://cnbc.com/c.html?utm_source=twitter")  # same URL, no guid (e.g. an API copy)
+    assert restarted.resolve_uid(variant) == item.uid
+    assert restarted.exists(item.uid)
+    assert restarted.get_identity_stats()["repeats"] == 1
+
+
+def test_guid_falls_back_to_url_across_feeds():
+    index = IdentityIndex()
+    top, _ = index.resolve(_item("https://www.cnbc.com/d.html?utm_source=top", guid="108000001"))
+    investing, new = index.resolve(_item(
+        "https://www.cnbc.com/d.html?utm_source=investing", guid="108000001", feed="https://cnbc.example/investing",
+    ))
+    assert investing == top and new == [("guid", "https://cnbc.example/investing|108000001")]
+    assert index.get_stats()["collapsed_by"] == {"url": 1}
+    # the investing feed's guid is linked now
+    again, new = index.resolve(_item("https://cnbc.com/d-updated.html", guid="108000001", feed="https://cnbc.example/investing"))
+    assert again == top and new == [("url", "https://cnbc.com/d-updated.html")]
+
+
+def test_legacy_event_without_guid_link_is_not_new():
+    path = str(Path(tempfile.mkdtemp()) / "events.db")
+    store = SQLiteStore(path)
+    legacy = _item("https://www.cnbc.com/e.html")
+    legacy.uid = "legacy-uid"
+    store.save(legacy)
+    with sqlite3.connect(path) as c:  # as stored before identity_keys existed
+        c.execute("DELETE FROM identity_keys")
+
+    restarted = SQLiteStore(path)
+    item = _item("https://www.cnbc.com/e.html?utm_source=rss", guid="108000002")
+    assert restarted.resolve_uid(item) == "legacy-uid"
+    assert restarted.exists("legacy-uid")
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_canonical_url_variants,
+        test_variants_collapse_to_one_id,
+        test_store_persists_identity_and_links_legacy_rows,
+        test_guid_falls_back_to_url_across_feeds,
+        test_legacy_event_without_guid_link_is_not_new,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test ingest-time HTML stripping and summary caps (offline)
+"""
+
+import tempfile
+from pathlib import Path
+
+from collectors.ingest import bound, normalize_item, strip_html
+from collectors.rss_collector import RSSCollector
+from core.models import NewsItem
+from core.ticker_extraction import scan_tickers
+from storage.feed_state import FeedStateStore
+
+FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>t</title>
+<item><title>Acme &amp;amp; Co wins contract</title><link>https://example.com/a</link>
+<pubDate>Wed, 07 Jan 2026 07:45:00 GMT</pubDate>
+<description>&lt;p&gt;Acme &amp;amp; Co &lt;a href="https://x.example/NVDA"&gt;said&lt;/a&gt; revenue rose.&lt;/p&gt;</description></item>
+</channel></rss>"""
+
+
+class _Resp:
+    status_code = 200
+    content = FEED
+
+
+class _Session:
+    def get(self, url, headers=None, timeout=None):
+        return _Resp()
+
+
+def _item(title: str, summary: str) -> NewsItem:
+    return NewsItem(source="test", title=title, link="https://example.com/a", summary=summary)
+
+
+def test_strip_html():
+    assert strip_html('<p>Acme &amp; Co <a href="x">(NASDAQ: ACME)</a></p>') == "Acme & Co (NASDAQ: ACME)"
+    assert strip_html("a<script>var AAPL = 1;</script>b<style>p {}</style><!-- NVDA -->c") == "a b c"
+    # a "<" that doesn't start a tag is text; escaped markup is text too
+    assert strip_html("P<E of 3 < 5, &lt;b&gt;") == "P<E of 3 < 5, <b>"
+    assert strip_html("  plain\n\ttext ") == "plain text"
+    assert strip_html("") == ""
+
+
+def test_bound():
+    assert bound("alpha beta gamma delta", 12) == "alpha beta…"
+    assert bound("abcdefghijklmnop", 10) == "abcdefghi…"
+    assert bound("short", 10) == "short"
+    assert bound("no cap at all", 0) == "no cap at all"
+    assert len(bound("word " * 500, 100)) <= 100
+
+
+def test_normalize_item():
+    html = '<div><a href="https://quote.example/NVDA" title="TSLA">Acme</a> raises guidance</div>'
+    item = normalize_item(_item("AT&amp;T  beats", html), 1000)
+    assert item.title == "AT&T beats" and item.summary == "Acme raises guidance"
+    assert item.raw == {}  # the markup isn't kept alongside
+    # tag / attribute text no longer produces ticker candidates
+    assert not {"NVDA", "TSLA"} & {c.ticker for c in scan_tickers(item.title, item.summary)}
+
+    plain = normalize_item(_item("Plain title", "Plain  summary"), 1000)
+    assert plain.summary == "Plain summary"
+
+
+def test_huge_body_is_bounded():
+    body = "<p>" + "revenue rose " * 100_000 + '</p><a href="x'
+    item = normalize_item(_item("t", body), 200)
+    assert len(item.summary) <= 200 and item.summary.endswith("…")
+    assert "<" not in item.summary and "href" not in item.summary
+    assert len(repr(item.model_dump())) < 1000  # nothing holds on to the body
+
+
+def test_rss_items_are_plain_and_capped_per_source():
+    store = FeedStateStore(Path(tempfile.mkdtemp()) / "state.json")
+    c = RSSCollector([("A", "https://a.example/rss"), ("B", "https://b.example/rss")],
+                     concurrent=False, state_store=store, summary_limit=1000, summary_limits={"B": 11})
+    c.session = _Session()
+    a, b = c.fetch()
+    assert a.title == "Acme & Co wins contract"
+    assert a.summary == "Acme & Co said revenue rose."
+    assert set(a.raw) == {"feed", "guid"}  # no copy of the HTML summary
+    assert b.summary == "Acme & Co…"
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_strip_html,
+        test_bound,
+        test_normalize_item,
+        test_huge_body_is_bounded,
+        test_rss_items_are_plain_and_capped_per_source,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test cross-source near-duplicate detection (SimHash + LSH)
+"""
+
+import time
+
+from core.near_dup import NearDupIndex, simhash
+
+TITLE = "Acme Therapeutics Announces FDA Approval of ACM-101 for Rare Liver Disease"
+PRN = (
+    "NEW YORK, Jan. 7, 2026 /PRNewswire/ -- Acme Therapeutics, Inc. (NASDAQ: ACME) today announced "
+    "that the U.S. Food and Drug Administration has approved ACM-101 for the treatment of adults "
+    "with rare liver disease."
+)
+
+
+class Clock:
+    t = 1_000_000.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_syndicated_copies_attach_to_first_event():
+    index = NearDupIndex()
+    assert index.observe("prn-1", "PR Newswire", TITLE, PRN) is None
+    copies = [
+        ("Yahoo Finance", TITLE + " - Yahoo Finance", ""),
+        ("Seeking Alpha", "Acme Therapeutics announces FDA approval of ACM-101 for rare liver disease (NASDAQ:ACME)", ""),
+        ("TheNewsAPI", TITLE, "Acme Therapeutics (ACME) announced that the FDA approved ACM-101 for rare liver disease."),
+    ]
+    for source, title, summary in copies:
+        original = index.observe(f"{source}-1", source, title, summary)
+        assert original is not None and original.uid == "prn-1", source
+    assert index.get_stats() == {"size": 1, "lookups": 4, "matches": 3}
+    assert index.match(TITLE, PRN).copies == ["Yahoo Finance", "Seeking Alpha", "TheNewsAPI"]
+
+
+def test_related_but_different_events_stay_separate():
+    index = NearDupIndex()
+    index.add("a", "PR Newswire", TITLE, PRN)
+    other_drug = TITLE.replace("ACM-101", "ACM-202").replace("Liver", "Kidney")
+    offering = "Acme Therapeutics Announces Pricing of $150 Million Public Offering of Common Stock"
+    assert index.match(other_drug, PRN.replace("101", "202").replace("liver", "kidney")) is None
+    assert index.match(offering, "Acme Therapeutics, Inc. (NASDAQ: ACME) today announced the pricing") is None
+    assert (simhash(TITLE, PRN)[0] ^ simhash(offering)[0]).bit_count() > 20
+
+
+def test_headlines_sharing_a_prefix_stay_separate():
+    index = NearDupIndex()
+    summary = "Microsoft Corporation reported fiscal third quarter results on Tuesday after the bell."
+    assert index.observe("a", "CNBC", "Microsoft Q3 earnings - revenue up 10%", summary) is None
+    # only a source / publisher / domain suffix is dropped, not the rest of the headline
+    assert index.observe("b", "CNBC", "Microsoft Q3 earnings - CFO to step down", summary) is None
+    assert index.observe("c", "Reuters", "Microsoft Q3 earnings - revenue up 10% - Reuters", summary) is not None
+    # a one-word flip is only a few bits apart: contradicting direction words never match
+    assert index.observe("d", "CNBC", "Meta raises full-year guidance as cloud demand holds", summary) is None
+    assert index.observe("e", "Reuters", "Meta cuts full-year guidance as cloud demand holds", summary) is None
+    assert len(index) == 4
+
+
+def test_window_expiry_and_lookup_speed():
+    clock = Clock()
+    index = NearDupIndex(window=3600, clock=clock)
+    index.add("a", "PR Newswire", TITLE, PRN)
+    for n in range(5000):
+        index.add(str(n), "Wire", f"Company {n} declares quarterly dividend of {n} cents per share payable in March")
+
+    started = time.perf_counter()
+    for _ in range(200):
+        assert index.match(TITLE, PRN) is not None
+    assert (time.perf_counter() - started) / 200 < 0.001  # sub-millisecond per lookup
+
+    clock.t += 3601
+    assert index.match(TITLE, PRN) is None and len(index) == 0
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_syndicated_copies_attach_to_first_event,
+        test_related_but_different_events_stay_separate,
+        test_headlines_sharing_a_prefix_stay_separate,
+        test_window_expiry_and_lookup_speed,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
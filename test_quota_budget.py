@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test daily quota pacing for the premium news APIs (offline)
+"""
+
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from collectors.alpha_vantage_collector import AlphaVantageCollector
+from core.quota_budget import QuotaBudget, parse_schedule
+from storage.feed_state import FeedStateStore
+
+ET = ZoneInfo("America/New_York")
+
+
+class Clock:
+    def __init__(self, *args):
+        self.t = datetime(*args, tzinfo=ET).timestamp()
+
+    def __call__(self):
+        return self.t
+
+    def advance(self, minutes):
+        self.t += minutes * 60
+
+
+def _store():
+    return FeedStateStore(Path(tempfile.mkdtemp()) / "state.json")
+
+
+def _calls_over_day(budget, clock, step_minutes=5):
+    times = []
+    for _ in range(24 * 60 // step_minutes):
+        if budget.can_call():
+            budget.record()
+            times.append(datetime.fromtimestamp(clock(), ET))
+        clock.advance(step_minutes)
+    return times
+
+
+def test_quota_is_spread_and_weighted_to_market_hours():
+    clock = Clock(2026, 1, 7)  # Wednesday 00:00 ET
+    budget = QuotaBudget("AV", daily_limit=25, state_store=_store(), clock=clock)
+    times = _calls_over_day(budget, clock)
+    assert len(times) == 25
+    in_session = [t for t in times if (9, 30) <= (t.hour, t.minute) < (16, 0)]
+    overnight = [t for t in times if t.hour < 4]
+    assert len(in_session) >= 12
+    assert len(overnight) <= 1
+
+
+def test_usage_survives_restart():
+    store = _store()
+    clock = Clock(2026, 1, 7, 12, 0)
+    budget = QuotaBudget("TNA", daily_limit=100, state_store=store, clock=clock)
+    while budget.can_call():
+        budget.record()
+    used = budget.used()
+    assert used > 0
+
+    restarted = QuotaBudget("TNA", daily_limit=100, state_store=FeedStateStore(store.path), clock=clock)
+    assert restarted.used() == used
+    assert not restarted.can_call()
+    assert restarted.next_call_time() > datetime.fromtimestamp(clock(), ET)
+
+
+def test_new_day_resets_and_exhaust_pauses():
+    clock = Clock(2026, 1, 7, 12, 0)
+    budget = QuotaBudget("AI", daily_limit=2000, cost_per_call=10, state_store=_store(), clock=clock)
+    budget.record()
+    budget.exhaust()
+    assert not budget.can_call()
+    assert budget.get_usage_info()["remaining"] == 0
+    assert budget.next_call_time() == datetime(2026, 1, 8, tzinfo=ET)
+
+    clock.advance(24 * 60)
+    assert budget.used() == 0
+    assert budget.can_call()
+
+
+def test_schedule_override_order():
+    weights = parse_schedule("00:00-24:00=0.5,09:30-16:00=3")
+    assert weights[0] == 0.5 and weights[9 * 60 + 30] == 3 and weights[16 * 60] == 0.5
+
+
+def test_collector_skips_request_when_paced():
+    clock = Clock(2026, 1, 7, 0, 0)
+    budget = QuotaBudget("AV", daily_limit=25, state_store=_store(), clock=clock)
+    budget.record()  # the 00:00 call
+    c = AlphaVantageCollector("key", budget=budget)
+    assert c.fetch() == []  # paced - no request sent
+    info = c.get_usage_info()
+    assert info["calls_today"] == 1 and info["next_call"].startswith("2026-01-07T04:")
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_quota_is_spread_and_weighted_to_market_hours,
+        test_usage_survives_restart,
+        test_new_day_resets_and_exhaust_pauses,
+        test_schedule_override_order,
+        test_collector_skips_request_when_paced,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test the config-driven collector registry (offline)
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+from collectors.registry import CollectorRegistry, CollectorSpec, load_opml, load_registry
+from core.scheduler import PollScheduler
+
+OPML = """<?xml version="1.0"?>
+<opml version="2.0"><body>
+  <outline text="Wire">
+    <outline text="PR Newswire" type="rss" xmlUrl="https://pr.example/rss" priority="true"/>
+    <outline title="Biotech Wire" text="bio" type="rss" xmlUrl="https://bio.example/rss" max_interval="600" parser="feedparser"/>
+  </outline>
+  <outline text="Loose" type="rss" xmlUrl="https://loose.example/feed" enabled="false"/>
+</body></opml>"""
+
+
+def _write(name, text):
+    path = Path(tempfile.mkdtemp()) / name
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_opml_feeds_with_options():
+    feeds = load_opml(_write("feeds.opml", OPML))
+    assert [(f.name, f.category) for f in feeds] == [
+        ("PR Newswire", "Wire"), ("Biotech Wire", "Wire"), ("Loose", ""),
+    ]
+    assert feeds[0].priority and feeds[1].max_interval == 600 and feeds[1].parser == "feedparser"
+
+    registry = CollectorRegistry(feeds)
+    assert [f.name for f in registry.enabled_feeds()] == ["PR Newswire", "Biotech Wire"]
+    rss = registry.build_rss(concurrent=False)
+    assert rss.parsers == {"Biotech Wire": "feedparser"}
+
+    scheduler = PollScheduler(max_interval=300, priority_max_interval=30)
+    registry.schedule(scheduler)
+    assert scheduler.sources["PR Newswire"].max_interval == 30
+    assert scheduler.sources["Biotech Wire"].max_interval == 600
+
+
+def test_disabled_collectors_are_not_imported():
+    settings = SimpleNamespace(enable_fake=False)
+    spec = CollectorSpec(name="Fake", target="not_a_real_module_xyz:Collector", enabled=lambda s: s.enable_fake)
+    registry = CollectorRegistry(specs=[spec])
+    assert registry.build(settings) == {}
+    assert "not_a_real_module_xyz" not in sys.modules
+
+
+def test_json_overrides_and_builtin_sources_file():
+    path = _write("sources.json", json.dumps({
+        "feeds": [{"name": "A", "url": "https://a.example/rss"}],
+        "collectors": {"Fake": {"interval": 900, "priority": True, "options": {"limit": 5}}},
+    }))
+    spec = CollectorSpec(
+        name="Fake",
+        target="types:SimpleNamespace",
+        enabled=lambda s: True,
+        options=lambda s: {"limit": 50, "BASE_URL": "https://api.example/v1"},
+    )
+    registry = CollectorRegistry.from_file(path, [spec])
+    collectors = registry.build(SimpleNamespace())
+    assert collectors["Fake"].limit == 5
+    assert registry.warm_up_urls() == {"A": ["https://a.example/rss"], "Fake": ["https://api.example/v1"]}
+
+    scheduler = PollScheduler(max_interval=1200)
+    registry.schedule(scheduler)
+    assert scheduler.sources["Fake"].priority
+
+    # the shipped sources file loads and keeps the wire services on priority
+    shipped = load_registry()
+    assert {f.name for f in shipped.feeds if f.priority} == {"PR Newswire", "GlobeNewswire", "Business Wire"}
+
+
+def test_summary_limits_per_source():
+    path = _write("sources.json", json.dumps({
+        "feeds": [
+            {"name": "A", "url": "https://a.example/rss"},
+            {"name": "B", "url": "https://b.example/rss", "summary_limit": "300"},
+        ],
+        "collectors": {"RSS": {"summary_limit": 800}, "Fake": {"summary_limit": 400}},
+    }))
+    specs = [
+        CollectorSpec(name="Fake", target="types:SimpleNamespace", enabled=lambda s: True),
+        CollectorSpec(name="Other", target="types:SimpleNamespace", enabled=lambda s: True),
+    ]
+    registry = CollectorRegistry.from_file(path, specs)
+    rss = registry.build_rss(concurrent=False, summary_limit=1000)
+    assert rss.summary_limit == 800 and rss.summary_limits == {"B": 300}
+
+    collectors = registry.build(SimpleNamespace(summary_max_chars=1000))
+    assert collectors["Fake"].summary_limit == 400
+    assert collectors["Other"].summary_limit == 1000
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_opml_feeds_with_options,
+        test_disabled_collectors_are_not_imported,
+        test_json_overrides_and_builtin_sources_file,
+        test_summary_limits_per_source,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test concurrent RSS fetching (offline - uses a fake HTTP session)
+"""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from collectors.rss_collector import RSSCollector
+from storage.feed_state import FeedStateStore
+
+FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>t</title>
+<item><title>{title}</title><link>https://example.com/{title}</link>
+<pubDate>Wed, 07 Jan 2026 07:45:00 GMT</pubDate><description>d</description></item>
+</channel></rss>"""
+
+
+class _Resp:
+    def __init__(self, content: bytes, status_code: int = 200):
+        self.content = content
+        self.status_code = status_code
+
+
+class FakeSession:
+    """Sleeps per request and records max parallelism per host."""
+
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = {}
+        self.max_active = {}
+
+    def get(self, url, headers=None, timeout=None):
+        host = url.split("/")[2]
+        with self.lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.max_active[host] = max(self.max_active.get(host, 0), self.active[host])
+        time.sleep(self.delay)
+        with self.lock:
+            self.active[host] -= 1
+        title = url.rstrip("/").split("/")[-1]
+        return _Resp(FEED.replace(b"{title}", title.encode()))
+
+
+SOURCES = [
+    ("A1", "https://a.example/one"),
+    ("A2", "https://a.example/two"),
+    ("A3", "https://a.example/three"),
+    ("B1", "https://b.example/four"),
+    ("C1", "https://c.example/five"),
+]
+
+
+def _collector(**kwargs) -> RSSCollector:
+    store = FeedStateStore(Path(tempfile.mkdtemp()) / "state.json")
+    c = RSSCollector(SOURCES, state_store=store, **kwargs)
+    c.session = FakeSession()
+    return c
+
+
+def test_concurrent_keeps_source_order():
+    c = _collector(max_workers=8, max_per_host=2)
+    items = c.fetch()
+    assert [i.source for i in items] == [name for name, _ in SOURCES]
+    assert [i.title for i in items] == ["one", "two", "three", "four", "five"]
+
+
+def test_concurrent_is_faster_than_sequential():
+    c = _collector(max_workers=8, max_per_host=2)
+    started = time.perf_counter()
+    c.fetch()
+    elapsed = time.perf_counter() - started
+    # 3 feeds on a.example with 2 slots -> 2 rounds of 0.2s (sequential would be 5 x (0.2 + 0.2))
+    assert elapsed < 1.0
+
+
+def test_per_host_limit():
+    c = _collector(max_workers=8, max_per_host=1)
+    c.fetch()
+    assert c.session.max_active["a.example"] == 1
+
+
+def test_timings_reported_per_source():
+    c = _collector()
+    c.fetch()
+    assert set(c.last_timings) == {name for name, _ in SOURCES}
+    assert all(t >= 0.2 for t in c.last_timings.values())
+
+
+def test_iter_fetch_yields_each_source_as_it_completes():
+    c = _collector(max_workers=8, max_per_host=1)
+    started = time.perf_counter()
+    stream = c.iter_fetch()
+    name, items = next(stream)
+    # first feed arrives after one request, not after the 3 serialized a.example ones
+    assert time.perf_counter() - started < 0.4
+    rest = dict(stream)
+    assert set(rest) | {name} == {n for n, _ in SOURCES} and len(items) == 1
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_concurrent_keeps_source_order,
+        test_concurrent_is_faster_than_sequential,
+        test_per_host_limit,
+        test_timings_reported_per_source,
+        test_iter_fetch_yields_each_source_as_it_completes,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test the per-source adaptive poll scheduler (offline, fake clock)
+"""
+
+from core.scheduler import PollScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 1000.0
+
+    def __call__(self):
+        return self.t
+
+
+def _scheduler(clock):
+    return PollScheduler(
+        default_interval=30,
+        min_interval=15,
+        max_interval=300,
+        priority_max_interval=30,
+        clock=clock,
+    )
+
+
+def test_everything_due_on_startup():
+    clock = FakeClock()
+    s = _scheduler(clock)
+    s.add("VentureBeat")
+    s.add("SEC", priority=True)
+    assert s.due() == ["SEC", "VentureBeat"]  # priority first
+
+
+def test_quiet_source_backs_off_to_max():
+    clock = FakeClock()
+    s = _scheduler(clock)
+    s.add("VentureBeat")
+    for _ in range(20):
+        clock.t += s.seconds_until_next()
+        assert s.due() == ["VentureBeat"]
+        s.record("VentureBeat", 0)
+    assert s.sources["VentureBeat"].interval == 300
+
+
+def test_priority_source_keeps_tight_ceiling():
+    clock = FakeClock()
+    s = _scheduler(clock)
+    s.add("SEC", priority=True)
+    for _ in range(20):
+        clock.t += s.seconds_until_next()
+        s.record("SEC", 0)
+    assert s.sources["SEC"].interval == 30
+
+
+def test_busy_source_speeds_up_to_min():
+    clock = FakeClock()
+    s = _scheduler(clock)
+    s.add("PR Newswire")
+    for _ in range(10):
+        clock.t += s.seconds_until_next()
+        s.record("PR Newswire", 10)
+    assert s.sources["PR Newswire"].interval == 15
+
+
+def test_no_drift_from_processing_time():
+    clock = FakeClock()
+    s = _scheduler(clock)
+    s.add("Feed", interval=30)
+    start = s.sources["Feed"].next_due
+    clock.t += 5  # processing took 5 seconds
+    s.record("Feed", 1)
+    interval = s.sources["Feed"].interval
+    assert s.sources["Feed"].next_due == start + interval
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_everything_due_on_startup,
+        test_quiet_source_backs_off_to_max,
+        test_priority_source_keeps_tight_ceiling,
+        test_busy_source_speeds_up_to_min,
+        test_no_drift_from_processing_time,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
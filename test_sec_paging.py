@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test SEC EDGAR paging / cursor catch-up in SECFilteredCollector (offline)
+"""
+
+import tempfile
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from collectors.sec_filtered_collector import SECFilteredCollector
+from storage.feed_state import FeedStateStore
+
+
+def _entry(n, form="8-K"):
+    acc = f"0000000001-26-{n:06d}"
+    return (
+        f"<entry><title>{form} - COMPANY {n} INC (0000000001) (Filer)</title>"
+        f'<link rel="alternate" type="text/html" href="https://www.sec.gov/Archives/{acc}-index.htm"/>'
+        f"<updated>2026-01-07T{8 + n // 60:02d}:{n % 60:02d}:00-05:00</updated>"
+        f"<id>urn:tag:sec.gov,2008:accession-number={acc}</id></entry>"
+    )
+
+
+class _Resp:
+    def __init__(self, content, status_code=200):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+
+
+class EdgarSession:
+    """Serves a newest-first filing list in pages of `count`."""
+
+    def __init__(self, filings, fail=(), by_type=False):
+        self.filings = filings
+        self.fail = set(fail)  # (type, start) answered once with a 503
+        self.by_type = by_type  # honour type= like EDGAR's per-form query
+        self.calls = []
+
+    def get(self, url, headers=None, timeout=None):
+        q = parse_qs(urlsplit(url).query)
+        start, count = int(q.get("start", ["0"])[0]), int(q["count"][0])
+        self.calls.append(start)
+        key = (q.get("type", [""])[0], start)
+        if key in self.fail:
+            self.fail.discard(key)
+            return _Resp(b"", status_code=503)
+        filings = [f for f in self.filings if f[1] == key[0]] if self.by_type and key[0] else self.filings
+        page = filings[start:start + count]
+        body = '<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>x</title>'
+        body += "".join(_entry(n, form) for n, form in page) + "</feed>"
+        return _Resp(body.encode())
+
+
+URL = "https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&type=&start=0&count=3&output=atom"
+
+
+def _collector(**kwargs):
+    store = FeedStateStore(Path(tempfile.mkdtemp()) / "state.json")
+    return SECFilteredCollector(rss_url=URL, state_store=store, min_request_interval=0, **kwargs)
+
+
+def test_first_poll_reads_one_page():
+    c = _collector()
+    c.session = EdgarSession([(n, "8-K") for n in range(10, 0, -1)])
+    assert len(c.fetch()) == 3
+    assert c.session.calls == [0]
+
+
+def test_burst_pages_back_to_last_seen():
+    c = _collector()
+    c.session = EdgarSession([(n, "8-K") for n in range(3, 0, -1)])
+    c.fetch()
+
+    # 7 new filings arrive (2 of them filtered forms) - more than one page
+    burst = [(n, "4" if n % 4 == 0 else "8-K") for n in range(10, 3, -1)]
+    c.session = EdgarSession(burst + [(n, "8-K") for n in range(3, 0, -1)])
+    items = c.fetch()
+    assert [i.raw["guid"][-2:] for i in items] == ["10", "09", "07", "06", "05"]
+    assert c.session.calls == [0, 3, 6]
+    assert c.state_store.get(URL)["last_accession"] == "0000000001-26-000010"
+
+
+def test_paging_stops_at_last_accession():
+    c = _collector()
+    c.session = EdgarSession([(n, "8-K") for n in range(3, 0, -1)])
+    c.fetch()
+    # the seen-keys list no longer covers the old filings (trimmed / lost)
+    state = c.state_store.get(URL)
+    state["watermark"] = dict(state["watermark"], keys=[])
+
+    c.session = EdgarSession([(n, "8-K") for n in range(10, 0, -1)])
+    assert [i.raw["guid"][-2:] for i in c.fetch()] == ["10", "09", "08", "07", "06", "05", "04"]
+    assert c.session.calls == [0, 3, 6]
+    assert state["last_accession"] == "0000000001-26-000010"
+
+
+def test_max_pages_bounds_catch_up():
+    c = _collector(max_pages=2)
+    c.session = EdgarSession([(1, "8-K")])
+    c.fetch()
+    c.session = EdgarSession([(n, "8-K") for n in range(20, 0, -1)])
+    assert len(c.fetch()) == 6
+    assert c.session.calls == [0, 3]
+
+
+def test_per_form_streams_are_deduplicated():
+    store = FeedStateStore(Path(tempfile.mkdtemp()) / "state.json")
+    c = SECFilteredCollector(state_store=store, min_request_interval=0, forms=["8-K", "S-4"])
+    assert len(c.stream_urls) == 2 and "type=S-4" in c.stream_urls[1]
+    c.session = EdgarSession([(2, "S-4"), (1, "8-K")])
+    assert [i.raw["form_type"] for i in c.fetch()] == ["S-4", "8-K"]
+
+
+def test_failed_page_is_retried_next_poll():
+    c = _collector()
+    c.session = EdgarSession([(n, "8-K") for n in range(3, 0, -1)])
+    c.fetch()
+
+    filings = [(n, "8-K") for n in range(10, 0, -1)]
+    c.session = EdgarSession(filings, fail={("", 3)})
+    assert c.fetch() == []
+    # page 0 wasn't marked as seen: the same body is parsed and walked back again
+    c.session = EdgarSession(filings)
+    assert len(c.fetch()) == 7
+    assert c.session.calls == [0, 3, 6]
+
+
+def test_failed_stream_keeps_other_streams():
+    store = FeedStateStore(Path(tempfile.mkdtemp()) / "state.json")
+    c = SECFilteredCollector(state_store=store, min_request_interval=0, forms=["8-K", "S-4"])
+    c.session = EdgarSession([(2, "S-4"), (1, "8-K")], fail={("S-4", 0)}, by_type=True)
+    assert [i.raw["form_type"] for i in c.fetch()] == ["8-K"]
+    assert [i.raw["form_type"] for i in c.fetch()] == ["S-4"]
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_first_poll_reads_one_page,
+        test_burst_pages_back_to_last_seen,
+        test_paging_stops_at_last_accession,
+        test_max_pages_bounds_catch_up,
+        test_per_form_streams_are_deduplicated,
+        test_failed_page_is_retried_next_poll,
+        test_failed_stream_keeps_other_streams,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test the security master and its compiled artifact
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import core.ticker_filter as ticker_filter
+
+from core.company_tickers import SEED_ALIASES, SEED_COMPANY_TO_TICKER, _load_json_mapping, normalize_company_name
+from core.company_tickers import get_aliases, get_company_to_ticker
+from core.models import NewsItem
+from core.security_master import SecurityMaster, get_security_master, load_security_master, symbol_variants
+from core.ticker_extraction import get_company_trie
+from core.ticker_filter import TickerFilter
+from notifier.telegram import TelegramNotifier
+
+LISTINGS = {
+    "AAPL": {"name": "Apple Inc.", "exchange": "NASDAQ", "indices": ["SP500"]},
+    "BRK-B": {"name": "Berkshire Hathaway", "exchange": "", "indices": ["SP500"]},
+    "ZZTOP": {"name": "Zz Top Holdings", "exchange": "NYSE", "indices": []},
+}
+
+
+def _write_json(path: Path, mapping: dict) -> None:
+    path.write_text(json.dumps(mapping), encoding="utf-8")
+
+
+def test_maps_match_seed_and_json_merge():
+    master = get_security_master()
+    merged = {normalize_company_name(k): v for k, v in SEED_COMPANY_TO_TICKER.items()}
+    merged.update(_load_json_mapping(Path("data") / "company_to_ticker.json"))
+    assert master.company_to_ticker == merged
+    assert master.aliases == {normalize_company_name(k): v for k, v in SEED_ALIASES.items()}
+    assert master.known == frozenset(merged.values()) | frozenset(master.aliases.values())
+
+    # extraction and the company_tickers getters use the master's own maps / trie
+    assert get_company_to_ticker() is master.company_to_ticker
+    assert get_aliases() is master.aliases
+    assert get_company_trie(get_company_to_ticker(), get_aliases()) is master.trie
+
+
+def test_lookup_variants_and_names():
+    master = SecurityMaster(
+        {"berkshire hathaway": "BRK-B", "apple": "AAPL", "apple computer": "AAPL"},
+        {"aapl": "AAPL"},
+        LISTINGS,
+    )
+    assert symbol_variants("brk/b") == ("BRK-B", "BRK.B")
+    assert master.lookup("BRK.B").symbol == "BRK-B"
+    assert master.lookup(" brk-b ").names == ("berkshire hathaway",)
+    assert master.lookup("brk/b").variants == ("BRK-B", "BRK.B")
+    assert master.lookup("MSFT") is None and master.lookup("") is None
+
+    aapl = master.lookup("AAPL")
+    assert aapl.name == "Apple Inc." and aapl.exchange == "NASDAQ"
+    assert aapl.names == ("apple", "apple computer") and aapl.aliases == ("aapl",)
+
+    # NASDAQ-listed or S&P 500, in every spelling; NYSE-only is not major
+    assert master.major == {"AAPL", "BRK-B", "BRK.B"}
+    assert master.is_major("brk.b") and not master.is_major("ZZTOP")
+    assert master.is_known("ZZTOP") and "ZZTOP" not in master.known
+
+    phrase, sec = master.match_name("Shares of Apple Computer Inc. rose")
+    assert (phrase, sec.symbol) == ("apple computer", "AAPL")
+    assert master.match_name("nothing to see") is None
+
+
+def test_artifact_roundtrip_and_staleness():
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, artifact = Path(tmp) / "map.json", Path(tmp) / "master.pkl"
+        _write_json(json_path, {"Acme Corp": "ACME"})
+
+        master = load_security_master(json_path, artifact, listings=LISTINGS)
+        assert artifact.exists()
+        loaded = load_security_master(json_path, artifact)
+        assert loaded.source_key == master.source_key
+        assert loaded.built == master.built  # came from the artifact, not rebuilt
+        # the trie survives pickling
+        assert loaded.match_name("acme wins contract")[1].symbol == "ACME"
+        assert loaded.lookup("AAPL").name == "Apple Inc."
+
+        # the JSON changed: rebuilt from it, listings carried over
+        _write_json(json_path, {"Acme Corp": "ACME", "Widget Works": "WDGT"})
+        os.utime(json_path, ns=(1, 1))
+        rebuilt = load_security_master(json_path, artifact)
+        assert rebuilt.built != master.built
+        assert rebuilt.lookup("WDGT") is not None
+        assert rebuilt.is_major("AAPL")
+        # ... still dated by their download, not by the rebuild
+        assert rebuilt.listings_updated == master.listings_updated
+        assert SecurityMaster.load(artifact).lookup("WDGT") is not None
+
+        artifact.write_bytes(b"not a pickle")
+        assert SecurityMaster.load(artifact) is None
+        assert load_security_master(json_path, artifact).lookup("ACME") is not None
+
+
+def test_ticker_filter_clean_adds_variants():
+    cleaned = TickerFilter._clean(["aapl", "BF/B", "bad ticker", "TOOLONGX"])
+    assert {"AAPL", "BF-B", "BF.B", "RDNT", "BRK.B", "BRK-B"} <= cleaned
+    assert "BAD TICKER" not in cleaned and "TOOLONGX" not in cleaned
+
+
+def test_telegram_guess_uses_master():
+    item = NewsItem(source="test", title="RadNet expands imaging network", link="https://example.com/a")
+    notifier = TelegramNotifier.__new__(TelegramNotifier)
+    assert notifier._guess_company_or_ticker(item) == "Radnet → RDNT"
+
+
+def test_ticker_filter_expires_master_listings():
+    cache = Path(tempfile.mkdtemp()) / "ticker_cache.json"
+    cache.write_text(json.dumps({"tickers": ["ZZTOP"], "timestamp": time.time()}), encoding="utf-8")
+    fresh = SecurityMaster({"apple": "AAPL"}, {}, LISTINGS)
+    stale = SecurityMaster({"apple": "AAPL"}, {}, LISTINGS, listings_updated=time.time() - 2 * TickerFilter.CACHE_TTL_SECONDS)
+    get_master = ticker_filter.get_security_master
+    try:
+        ticker_filter.get_security_master = lambda: fresh
+        f = TickerFilter(cache_file=cache)
+        assert f.source == "security_master" and f.is_valid_ticker("AAPL") and f.get_stats()["cache_valid"]
+
+        # listings older than the TTL: the download path (here its fresh cache) is used
+        ticker_filter.get_security_master = lambda: stale
+        f = TickerFilter(cache_file=cache)
+        assert f.source == "cache" and f.is_valid_ticker("ZZTOP") and not f.is_valid_ticker("AAPL")
+    finally:
+        ticker_filter.get_security_master = get_master
+    assert stale.get_stats()["listings_age_hours"] > 24
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_maps_match_seed_and_json_merge,
+        test_lookup_variants_and_names,
+        test_artifact_roundtrip_and_staleness,
+        test_ticker_filter_clean_adds_variants,
+        test_telegram_guess_uses_master,
+        test_ticker_filter_expires_master_listings,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
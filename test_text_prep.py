@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test the shared per-item text preprocessing
+"""
+
+from core.models import NewsItem
+from core.scoring import keyword_hits, score, topic
+from core.text_prep import PreparedText, prepare
+from tools.bench_company_match import CORPUS
+from tools.bench_keywords import HEADLINES
+from tools.bench_text_prep import _items, legacy_pipeline, prepared_pipeline
+
+
+def test_forms():
+    text = PreparedText("Acme Corp (NASDAQ: ACME)", "Raises Guidance")
+    assert text.raw == "Acme Corp (NASDAQ: ACME) Raises Guidance"
+    assert text.lower == "acme corp (nasdaq: acme) raises guidance"
+    assert text.words == [("acme", 0), ("acme", 19), ("raises", 25), ("guidance", 32)]
+    assert text.tokens == ["acme", "acme", "raises", "guidance"]
+
+
+def test_prepare_is_cached_per_item():
+    item = NewsItem(source="test", title="Apple to acquire Acme", link="https://example.com/a", summary="deal")
+    text = prepare(item)
+    assert prepare(item) is text
+
+    item.summary = "merger agreement"
+    assert prepare(item) is not text
+    assert prepare(item).raw == "Apple to acquire Acme merger agreement"
+    assert "_prepared" not in item.model_dump()
+
+
+def test_score_and_topic_share_one_keyword_pass():
+    title, summary = HEADLINES[1]
+    text = PreparedText(title, summary)
+    assert score("PR Newswire", title, summary, prepared=text) == score("PR Newswire", title, summary)
+    assert text.keyword_hits == keyword_hits(f"{title} {summary}")
+    hits = text.keyword_hits
+    assert topic(title, summary, prepared=text) == topic(title, summary) == "m&a"
+    assert text.keyword_hits is hits
+
+
+def test_prepared_pipeline_equals_per_analyzer():
+    corpus = CORPUS + HEADLINES + [("", ""), ("<p>Tesla &amp; Nvidia</p>", "  $TSLA  ")]
+    for item in _items(corpus):
+        assert prepared_pipeline(item) == legacy_pipeline(item), item.title
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_forms,
+        test_prepare_is_cached_per_item,
+        test_score_and_topic_share_one_keyword_pass,
+        test_prepared_pipeline_equals_per_analyzer,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test the single-pass ticker candidate scanner and multi-ticker ranking
+"""
+
+from core.ticker_extraction import extract_all_tickers, extract_ticker, pick_ticker, rank_tickers, scan_tickers
+
+
+def _kinds(title, summary=""):
+    return [(c.kind, c.ticker, c.start) for c in scan_tickers(title, summary) if c.kind != "company"]
+
+
+def test_typed_candidates_with_positions():
+    assert _kinds("NYSE: ACME and (AAPL) - BRK.B $tsla") == [
+        ("exchange", "ACME", 6),
+        ("allcaps", "NYSE", 0),
+        ("allcaps", "ACME", 6),
+        ("paren", "AAPL", 16),
+        ("allcaps", "AAPL", 16),
+        ("delim", "BRK.B", 24),
+        ("allcaps", "BRK.B", 24),  # "B" inside BRK.B is not a separate token
+    ]
+    names = [c for c in scan_tickers("Shares of Bank of America rose") if c.kind == "company"]
+    assert [(c.ticker, c.start, c.end, c.words) for c in names] == [("BAC", 10, 25, 3)]
+
+
+def test_priority_order():
+    # explicit forms beat company names, which beat bare ALL-CAPS tokens
+    assert extract_ticker("Apple partners with Microsoft (MSFT)", "") == "MSFT"
+    assert extract_ticker("F shares flat as Microsoft beats", "") == "MSFT"
+    assert extract_ticker("USA and F", "") == "F"
+    # only the first match of each explicit form counts (as before): the
+    # second paren is skipped, the pick comes from names (alias "aapl")
+    assert extract_ticker("(ZZZZ) then (AAPL) and Microsoft", "") == "AAPL"
+    assert [c.kind for c in scan_tickers("(ZZZZ) then (AAPL)") if c.ticker == "AAPL"] == ["paren", "allcaps", "company"]
+    assert extract_ticker("(ZZZZ) then $AAPL", "") == "AAPL"
+
+
+def test_ranked_multi_ticker_result():
+    assert extract_all_tickers("Apple (AAPL) and Microsoft (MSFT) lead tech stocks higher") == ["AAPL", "MSFT"]
+    assert extract_all_tickers("$TSLA, $NVDA, and $AMD are top picks according to analyst") == ["TSLA", "NVDA", "AMD"]
+    title = "Globex deal lifts Nvidia"
+    candidates = scan_tickers(title, "Analysts also mention (MSFT), $MSFT and Microsoft.")
+    ranked = rank_tickers(candidates, title_len=len(title))
+    assert ranked[0][0] == pick_ticker(candidates) == "MSFT"
+    assert dict(ranked)["NVDA"] == 0.7  # company 0.6 + title 0.1
+    assert extract_all_tickers("Market commentary on tech sector") == []
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_typed_candidates_with_positions,
+        test_priority_order,
+        test_ranked_multi_ticker_result,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
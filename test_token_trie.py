@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Test the token trie used for company-name resolution in ticker extraction
+"""
+
+from core.company_tickers import get_aliases, get_company_to_ticker
+from core.ticker_extraction import _match_company_name_ngrams
+from core.token_trie import TokenTrie
+from tools.bench_company_match import CORPUS, legacy_match
+
+
+def test_longest_then_leftmost():
+    trie = TokenTrie(max_tokens=3)
+    trie.insert(["bank"], "B1")
+    trie.insert(["bank", "of", "america"], "BAC")
+    trie.insert(["of"], "X", overwrite=False)
+    trie.insert(["of"], "Y", overwrite=False)
+    trie.insert("a b c d".split(), "TOO_LONG")
+    assert len(trie) == 3
+
+    assert trie.longest_match("news bank of america bank".split()) == (1, 3, "BAC")
+    assert trie.longest_match("bank of x of".split()) == (0, 1, "B1")
+    assert list(trie.iter_matches("of bank".split())) == [(0, 1, "X"), (1, 1, "B1")]
+    assert trie.longest_match("a b c d".split()) is None
+
+
+def test_company_match_equals_ngram_scan():
+    company_map, aliases = get_company_to_ticker(), get_aliases()
+    extra = [
+        ("Shares of Bank of America and Apple rose", ""),
+        ("GSK (GlaxoSmithKline) and RadNet Inc news", "rad net imaging"),
+        ("", ""),
+        ("the inc corp", "co ltd"),
+    ]
+    for title, summary in CORPUS + extra:
+        text = f"{title} {summary}"
+        assert _match_company_name_ngrams(text, company_map, aliases) == legacy_match(text, company_map, aliases), title
+
+
+if __name__ == "__main__":
+    for fn in (
+        test_longest_then_leftmost,
+        test_company_match_equals_ngram_scan,
+    ):
+        fn()
+        print(f"[PASS] {fn.__name__}")
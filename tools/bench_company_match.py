@@ -0,0 +1,132 @@
+"""
+Benchmark: company-name resolution in ticker extraction, n-gram scan
+(every 6..1-word phrase joined and looked up) vs the token trie.
+
+Usage (from the project root):
+    python -m tools.bench_company_match [--archive CAPTURE.jsonl.gz] [--repeat N]
+
+--archive takes an HTTP capture (HTTP_CAPTURE_FILE) and benchmarks on the
+titles + summaries of every feed in it; without one, a built-in corpus of
+wire-service headlines with press-release-length summaries is used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import time
+from typing import Dict, List, Optional, Tuple
+
+from core.company_tickers import get_aliases, get_company_to_ticker, normalize_company_name
+from core.ticker_extraction import _match_company_name_ngrams, get_company_trie
+
+_BOILERPLATE = (
+    "The company will host a conference call and webcast at 8:30 a.m. Eastern Time to discuss the results. "
+    "This press release contains forward-looking statements within the meaning of the Private Securities "
+    "Litigation Reform Act of 1995, including statements regarding expected timing, market opportunity and "
+    "regulatory review, which are subject to risks and uncertainties that could cause actual results to differ."
+)
+
+CORPUS: List[Tuple[str, str]] = [
+    ("Apple Reports Fourth Quarter Results", "Apple today announced financial results for its fiscal 2025 fourth quarter. " + _BOILERPLATE),
+    ("Microsoft to Acquire Nuance Communications for $19.7 Billion", "Microsoft Corp. and Nuance Communications, Inc. today announced a definitive agreement. " + _BOILERPLATE),
+    ("Pfizer and BioNTech Receive FDA Approval for Updated COVID-19 Vaccine", "Pfizer Inc. and BioNTech SE announced the U.S. Food and Drug Administration approved the supplemental application. " + _BOILERPLATE),
+    ("JPMorgan Chase Reports Third-Quarter 2025 Net Income of $14.4 Billion", "JPMorgan Chase & Co. reported net income and earnings per share above consensus. " + _BOILERPLATE),
+    ("Tesla Q3 deliveries beat expectations as Model Y demand rebounds", "Tesla delivered more vehicles than analysts expected in the third quarter, the company said on Thursday."),
+    ("Walmart raises full-year outlook after strong holiday quarter", "Walmart Inc. lifted its forecast as e-commerce sales grew and grocery demand stayed resilient."),
+    ("Nvidia unveils next-generation AI chip at GTC", "Nvidia Corporation introduced its next data-center GPU platform, with shipments to cloud providers next year."),
+    ("Eli Lilly's obesity drug meets primary endpoint in Phase 3 trial", "Eli Lilly and Company said its once-weekly treatment met the primary endpoint. " + _BOILERPLATE),
+    ("Bank of America Declares Preferred Stock Dividends", "Bank of America Corporation today announced that its board of directors declared regular quarterly cash dividends."),
+    ("Exxon Mobil Completes Acquisition of Pioneer Natural Resources", "Exxon Mobil Corporation completed its acquisition of Pioneer Natural Resources Company in an all-stock transaction. " + _BOILERPLATE),
+    ("Stocks rally as tech leads gains; Treasury yields slip", "The S&P 500 rose 1.2% and the Nasdaq Composite gained 1.8% as investors weighed inflation data and Federal Reserve comments."),
+    ("Goldman Sachs downgrades semiconductor sector to neutral", "Analysts at Goldman Sachs cut their rating on chipmakers, citing slowing orders and elevated inventories."),
+    ("Moderna Announces Positive Topline Data from Phase 3 Flu Vaccine Trial", "Moderna, Inc. today announced positive interim results. " + _BOILERPLATE),
+    ("Johnson & Johnson beats estimates, raises 2025 guidance", "Johnson & Johnson reported quarterly sales growth in its innovative medicine and medtech segments."),
+    ("Starbucks names new chief executive officer", "Starbucks Corporation announced a leadership transition effective next month, sending shares higher in premarket trading."),
+    ("Rivian recalls vehicles over steering issue", "Rivian Automotive, Inc. is recalling certain R1S and R1T vehicles, according to a filing with NHTSA."),
+    ("Acme Therapeutics Prices $150 Million Public Offering of Common Stock", "Acme Therapeutics, Inc. (NASDAQ: ACME), a clinical-stage biopharmaceutical company, announced the pricing. " + _BOILERPLATE),
+    ("Oracle wins multi-billion cloud contract with federal agency", "Oracle Corporation said the award covers infrastructure and database services over ten years."),
+    ("Ford to invest $3.5 billion in Michigan battery plant", "Ford Motor Company will build lithium iron phosphate batteries at the new facility starting in 2026."),
+    ("Salesforce completes acquisition of data management startup", "Salesforce, Inc. closed the previously announced deal, expanding its data cloud offering. " + _BOILERPLATE),
+]
+
+
+def corpus_from_archive(path: str) -> List[Tuple[str, str]]:
+    from collectors.feed_parser import iter_entries
+    from utils.http_archive import iter_records
+
+    texts = []
+    for rec in iter_records(path):
+        body = rec.get("body")
+        if not body or rec.get("status") != 200:
+            continue
+        try:
+            for e in iter_entries(base64.b64decode(body)):
+                texts.append((e.title, e.summary))
+        except Exception:
+            continue
+    return texts
+
+
+def legacy_match(text: str, company_map: Dict[str, str], aliases: Dict[str, str]) -> Optional[str]:
+    """The n-gram scan the trie replaced (longest first, then leftmost)."""
+    norm = normalize_company_name(text)
+    if not norm:
+        return None
+    tokens = norm.split()
+    for n in range(min(6, len(tokens)), 0, -1):
+        for i in range(0, len(tokens) - n + 1):
+            phrase = " ".join(tokens[i : i + n])
+            if phrase in company_map:
+                return company_map[phrase]
+            if phrase in aliases:
+                return aliases[phrase]
+    return None
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench(corpus: List[Tuple[str, str]], repeat: int = 5) -> Dict[str, float]:
+    company_map, aliases = get_company_to_ticker(), get_aliases()
+    texts = [f"{t} {s}" for t, s in corpus]
+    t0 = time.perf_counter()
+    get_company_trie(company_map, aliases)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    mismatches = sum(
+        1 for t in texts if legacy_match(t, company_map, aliases) != _match_company_name_ngrams(t, company_map, aliases)
+    )
+    return {
+        "texts": len(texts),
+        "names": len(company_map) + len(aliases),
+        "build_ms": build_ms,
+        "ngram_us": _time(lambda: [legacy_match(t, company_map, aliases) for t in texts], repeat) / len(texts) * 1e6,
+        "trie_us": _time(lambda: [_match_company_name_ngrams(t, company_map, aliases) for t in texts], repeat)
+        / len(texts) * 1e6,
+        "mismatches": mismatches,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--archive", help="HTTP capture archive to take feed titles / summaries from")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    corpus = corpus_from_archive(args.archive) if args.archive else CORPUS
+    r = bench(corpus, repeat=args.repeat)
+    print(f"{r['texts']} texts, {r['names']} names/aliases, trie built in {r['build_ms']:.1f}ms")
+    print(f"n-gram scan: {r['ngram_us']:8.1f}us per text")
+    print(f"token trie : {r['trie_us']:8.1f}us per text  ({r['ngram_us'] / r['trie_us']:.1f}x)")
+    print(f"different results: {r['mismatches']}")
+
+
+if __name__ == "__main__":
+    main()
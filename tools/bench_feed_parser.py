@@ -0,0 +1,129 @@
+"""
+Benchmark: lxml fast path vs feedparser on recorded feed bodies.
+
+Usage (from the project root):
+    python -m tools.bench_feed_parser [DIR_WITH_FEED_BODIES] [--repeat N]
+
+DIR should contain raw feed bodies (*.xml / *.rss / *.atom), e.g. saved with
+    curl -s URL -o data/feed_samples/prnewswire.xml
+If no directory is given (or it is empty) synthetic RSS / SEC Atom bodies of
+typical size are generated instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import feedparser
+
+from collectors.feed_parser import iter_entries, iter_entries_fast
+
+DEFAULT_DIR = Path("data") / "feed_samples"
+
+
+def _synthetic_rss(n: int = 50) -> bytes:
+    items = []
+    for i in range(n):
+        items.append(
+            f"<item><title>Company {i} announces definitive agreement to acquire Target {i}</title>"
+            f"<link>https://www.example.com/news/{i}</link><guid>news-{i}</guid>"
+            f"<pubDate>Wed, 07 Jan 2026 07:{i % 60:02d}:00 GMT</pubDate>"
+            f"<description><![CDATA[<p>NEW YORK -- <b>Company {i}</b> (NASDAQ: CO{i % 10}) "
+            f"today announced ... {'lorem ipsum ' * 40}</p><img src='x.png'/>]]></description></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Wire</title>'
+        + "".join(items)
+        + "</channel></rss>"
+    ).encode()
+
+
+def _synthetic_sec_atom(n: int = 100) -> bytes:
+    entries = []
+    for i in range(n):
+        entries.append(
+            f'<entry><title>8-K - COMPANY {i} INC (000{i:07d}) (Filer)</title>'
+            f'<link rel="alternate" type="text/html" href="https://www.sec.gov/Archives/edgar/data/{i}/000{i:07d}-26-000001-index.htm"/>'
+            f'<summary type="html"> &lt;b&gt;Filed:&lt;/b&gt; 2026-01-07 &lt;b&gt;AccNo:&lt;/b&gt; 000{i:07d}-26-000001 </summary>'
+            f"<updated>2026-01-07T07:45:00-05:00</updated>"
+            f'<category scheme="https://www.sec.gov/" label="form type" term="8-K"/>'
+            f"<id>urn:tag:sec.gov,2008:accession-number=000{i:07d}-26-000001</id></entry>"
+        )
+    return (
+        '<?xml version="1.0" encoding="ISO-8859-1" ?><feed xmlns="http://www.w3.org/2005/Atom">'
+        "<title>Latest Filings</title>" + "".join(entries) + "</feed>"
+    ).encode()
+
+
+def load_bodies(directory: Path) -> Dict[str, bytes]:
+    bodies: Dict[str, bytes] = {}
+    if directory.exists():
+        for p in sorted(directory.iterdir()):
+            if p.suffix.lower() in (".xml", ".rss", ".atom"):
+                bodies[p.name] = p.read_bytes()
+    if not bodies:
+        bodies = {
+            "synthetic_rss_50.xml": _synthetic_rss(),
+            "synthetic_sec_atom_100.xml": _synthetic_sec_atom(),
+        }
+    return bodies
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def bench(bodies: Dict[str, bytes], repeat: int = 5, early_stop: int = 5) -> List[dict]:
+    rows = []
+    for name, body in bodies.items():
+        n_entries = len(feedparser.parse(body).entries)
+
+        def fast_all():
+            return list(iter_entries(body, fast=True))
+
+        def fast_early():
+            it = iter_entries_fast(body)
+            for i, _ in enumerate(it):
+                if i + 1 >= early_stop:
+                    break
+            it.close()
+
+        rows.append({
+            "feed": name,
+            "kb": len(body) / 1024,
+            "entries": n_entries,
+            "feedparser_ms": _time(lambda: feedparser.parse(body), repeat),
+            "fast_ms": _time(fast_all, repeat),
+            "fast_early_ms": _time(fast_early, repeat),
+        })
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("directory", nargs="?", default=str(DEFAULT_DIR))
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--early-stop", type=int, default=5, help="entries read before stopping (high-water mark)")
+    args = ap.parse_args()
+
+    rows = bench(load_bodies(Path(args.directory)), repeat=args.repeat, early_stop=args.early_stop)
+
+    print(f"{'feed':32} {'KB':>7} {'entries':>7} {'feedparser':>11} {'fast':>9} {'fast@' + str(args.early_stop):>9} {'speedup':>8}")
+    for r in rows:
+        speedup = r["feedparser_ms"] / r["fast_ms"] if r["fast_ms"] else 0
+        print(
+            f"{r['feed'][:32]:32} {r['kb']:7.1f} {r['entries']:7d} "
+            f"{r['feedparser_ms']:9.2f}ms {r['fast_ms']:7.2f}ms {r['fast_early_ms']:7.2f}ms {speedup:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
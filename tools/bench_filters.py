@@ -0,0 +1,104 @@
+"""
+Microbenchmark: stock-market relevance filter and SEC clinical keyword check,
+per-pattern regex loops (previous implementation) vs the compiled keyword
+automata.
+
+Usage (from the project root):
+    python -m tools.bench_filters [--repeat N] [--rounds N]
+
+The legacy implementations are kept here as the reference the tests compare
+the automata against.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from typing import Callable, Dict, List, Tuple
+
+from collectors.sec_filtered_collector import SECFilteredCollector
+from core import stock_filter
+from tools.bench_keywords import HEADLINES
+
+LEGACY_CLINICAL_KEYWORDS = [
+    r"\bphase\s+[I1]\b", r"\bphase\s+[I2]\b", r"\bphase\s+[I3]\b",
+    r"\bphase\s+1\b", r"\bphase\s+2\b", r"\bphase\s+3\b",
+    r"\bclinical\s+trial", r"\bclinical\s+study", r"\btrial\s+results?", r"\bstudy\s+results?",
+    r"\bFDA\s+approval", r"\bFDA\s+clearance", r"\bFDA\s+granted", r"\bFDA\s+accepted",
+    r"\bbreakthrough\s+therapy", r"\bfast\s+track", r"\borphan\s+drug", r"\bpriority\s+review",
+    r"\bEMA\s+approval",
+    r"\bvaccine", r"\bimmunization", r"\bimmunotherapy", r"\bantibody", r"\bmonoclonal",
+    r"\bdrug\s+candidate", r"\btherapeutic", r"\btreatment\s+candidate", r"\binvestigational\s+drug",
+    r"\bIND\s+application", r"\bNDA\s+submission", r"\bBLA\s+submission",
+    r"\bprimary\s+endpoint", r"\bstatistically\s+significant", r"\bpositive\s+results?",
+    r"\bsuccessful\s+completion", r"\bmeets?\s+endpoint",
+]
+_LEGACY_CLINICAL = [re.compile(p, re.IGNORECASE) for p in LEGACY_CLINICAL_KEYWORDS]
+
+
+def legacy_is_clinical_related(title: str, summary: str) -> bool:
+    combined_text = f"{title} {summary}".lower()
+    return any(p.search(combined_text) for p in _LEGACY_CLINICAL)
+
+
+def _legacy_has_indicator(text: str, indicator: str) -> bool:
+    if " " in indicator or "&" in indicator or "-" in indicator:
+        return indicator in text
+    return re.search(r"\b" + re.escape(indicator) + r"\b", text) is not None
+
+
+def legacy_is_stock_market_related(title: str, summary: str) -> Tuple[bool, str]:
+    text = f"{title} {summary}".lower().strip()
+    if not text:
+        return False, "Empty text"
+    found = [i for i in stock_filter.STOCK_MARKET_INDICATORS if _legacy_has_indicator(text, i)]
+    if found:
+        return True, f"Stock market indicators: {', '.join(found[:3])}"
+    if stock_filter._TICKER_PATTERN.search(title + " " + summary):
+        return True, "Contains ticker symbol"
+    exclusion_found = [t for t in stock_filter.EXCLUSION_TERMS if t in text]
+    if exclusion_found:
+        return False, f"Not stock-related: {', '.join(exclusion_found[:2])}"
+    return False, "No stock market indicators found"
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench(repeat: int = 5, rounds: int = 200) -> List[Dict[str, object]]:
+    texts = HEADLINES * rounds
+    sec = SECFilteredCollector.__new__(SECFilteredCollector)  # only the keyword check is used
+    cases = [
+        ("is_stock_market_related", legacy_is_stock_market_related, stock_filter.is_stock_market_related),
+        ("sec _is_clinical_related", legacy_is_clinical_related, sec._is_clinical_related),
+    ]
+    rows = []
+    for name, old, new in cases:
+        rows.append({
+            "check": name,
+            "old_us": _time(lambda: [old(t, s) for t, s in texts], repeat) / len(texts) * 1e6,
+            "new_us": _time(lambda: [new(t, s) for t, s in texts], repeat) / len(texts) * 1e6,
+        })
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--rounds", type=int, default=200, help="copies of the headline corpus per run")
+    args = ap.parse_args()
+
+    print(f"{'check':26} {'regex loop':>11} {'automaton':>11} {'speedup':>8}   (per text)")
+    for r in bench(repeat=args.repeat, rounds=args.rounds):
+        print(f"{r['check']:26} {r['old_us']:9.1f}us {r['new_us']:9.1f}us {r['old_us'] / r['new_us']:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: keyword scoring, `k in text` loop vs the Aho-Corasick automaton,
+as the keyword dictionary grows.
+
+Usage (from the project root):
+    python -m tools.bench_keywords [--sizes 25,250,2500,10000] [--repeat N]
+
+The dictionary is core.scoring.KEYWORDS padded with synthetic multi-word
+phrases (sector terms / per-ticker catalysts) up to each size; the texts
+are typical headline + summary pairs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from core.aho_corasick import AhoCorasick
+from core.scoring import KEYWORDS
+
+HEADLINES = [
+    ("Acme Therapeutics Announces Positive Topline Results from Phase 3 Trial of ACM-101",
+     "NEW YORK -- Acme Therapeutics, Inc. (NASDAQ: ACME) today announced that its pivotal Phase 3 trial met "
+     "its primary endpoint with statistically significant improvement versus placebo. The company plans to "
+     "submit an NDA to the FDA in the first half of next year."),
+    ("Globex to Acquire Initech in $2.1 Billion All-Cash Deal",
+     "Globex Corporation (NYSE: GBX) and Initech, Inc. (NASDAQ: INTC) have entered into a definitive agreement "
+     "under which Globex will acquire Initech for $42.00 per share in cash, a 38% premium."),
+    ("Stocks rally as tech leads gains; Treasury yields slip",
+     "The S&P 500 rose 1.2% and the Nasdaq Composite gained 1.8% on Tuesday as investors weighed fresh "
+     "inflation data and comments from Federal Reserve officials."),
+    ("Hooli Prices $300 Million Registered Direct Offering",
+     "Hooli, Inc. (NASDAQ: HOOL) announced the pricing of a registered direct offering of 12,000,000 shares "
+     "of common stock. The company intends to use the net proceeds for working capital."),
+]
+
+_WORDS = (
+    "revenue guidance margin outlook contract award partnership license approval recall layoffs buyback "
+    "dividend split upgrade downgrade lawsuit settlement patent launch expansion facility subsidiary "
+    "quarterly annual preliminary record strategic review spin-off divestiture pipeline cohort"
+).split()
+
+
+def dictionary(size: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    phrases = list(KEYWORDS)
+    seen = set(phrases)
+    while len(phrases) < size:
+        p = " ".join(rng.sample(_WORDS, rng.randint(2, 3))) + f" {rng.randint(0, 9999)}"
+        if p not in seen:
+            seen.add(p)
+            phrases.append(p)
+    return phrases
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench(sizes: List[int], repeat: int = 5, rounds: int = 50) -> List[Dict[str, float]]:
+    texts = [f"{t} {s}" for t, s in HEADLINES] * rounds
+    rows = []
+    for size in sizes:
+        phrases = dictionary(size)
+        t0 = time.perf_counter()
+        ac = AhoCorasick(phrases)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        def loop():
+            for text in texts:
+                low = text.lower()
+                [k for k in phrases if k in low]
+
+        def automaton():
+            for text in texts:
+                ac.matches(text)
+
+        rows.append({
+            "phrases": size,
+            "build_ms": build_ms,
+            "loop_us": _time(loop, repeat) / len(texts) * 1e6,
+            "ac_us": _time(automaton, repeat) / len(texts) * 1e6,
+        })
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default="25,250,2500,10000")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    sizes = [max(int(s), len(KEYWORDS)) for s in args.sizes.split(",")]
+    print(f"{'phrases':>8} {'build':>9} {'k in text':>11} {'automaton':>11} {'speedup':>8}   (per text)")
+    for r in bench(sizes, repeat=args.repeat):
+        print(
+            f"{r['phrases']:8d} {r['build_ms']:7.1f}ms {r['loop_us']:9.1f}us {r['ac_us']:9.1f}us "
+            f"{r['loop_us'] / r['ac_us']:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
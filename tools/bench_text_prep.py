@@ -0,0 +1,105 @@
+"""
+Benchmark: per-item analysis CPU, each analyzer rebuilding "title summary"
+(and lowercasing / normalizing it) vs one shared PreparedText.
+
+Usage (from the project root):
+    python -m tools.bench_text_prep [--archive CAPTURE.jsonl.gz] [--repeat N]
+
+The pipeline is what app.py runs on a new item: stock-market relevance,
+ticker scan, impact score, event topic, plus the Telegram company guess.
+--archive takes an HTTP capture (HTTP_CAPTURE_FILE) and uses the titles +
+summaries of every feed in it; without one, the wire-service corpus of
+tools.bench_company_match is used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict, List, Tuple
+
+from core.models import NewsItem
+from core.scoring import score, topic
+from core.security_master import get_security_master
+from core.stock_filter import is_stock_market_related
+from core.text_prep import prepare
+from core.ticker_extraction import scan_tickers
+from tools.bench_company_match import CORPUS, corpus_from_archive
+
+
+def legacy_pipeline(item: NewsItem) -> Tuple[Any, ...]:
+    """Every analyzer prepares the text itself (the code before PreparedText)."""
+    guess = get_security_master().match_name(f"{item.title} {item.summary}".strip())
+    return (
+        is_stock_market_related(item.title, item.summary),
+        scan_tickers(item.title, item.summary),
+        score(item.source, item.title, item.summary),
+        topic(item.title, item.summary),
+        guess,
+    )
+
+
+def prepared_pipeline(item: NewsItem) -> Tuple[Any, ...]:
+    text = prepare(item)
+    guess = get_security_master().match_tokens(text.tokens)
+    return (
+        is_stock_market_related(item.title, item.summary, prepared=text),
+        scan_tickers(item.title, item.summary, prepared=text),
+        score(item.source, item.title, item.summary, prepared=text),
+        topic(item.title, item.summary, prepared=text),
+        guess,
+    )
+
+
+def _items(corpus: List[Tuple[str, str]]) -> List[NewsItem]:
+    return [NewsItem(source="bench", title=t, link=f"https://example.com/{i}", summary=s) for i, (t, s) in enumerate(corpus)]
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench(corpus: List[Tuple[str, str]], repeat: int = 5) -> Dict[str, float]:
+    get_security_master()  # load outside the timings
+    items = _items(corpus)
+    mismatches = sum(1 for item in items if legacy_pipeline(item) != prepared_pipeline(item))
+
+    def prepared():
+        # fresh items: preparation is part of the per-item cost
+        for item in _items(corpus):
+            prepared_pipeline(item)
+
+    def legacy():
+        for item in _items(corpus):
+            legacy_pipeline(item)
+
+    return {
+        "items": len(items),
+        "legacy_us": _time(legacy, repeat) / len(items) * 1e6,
+        "prepared_us": _time(prepared, repeat) / len(items) * 1e6,
+        "mismatches": mismatches,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--archive", help="HTTP capture archive to take feed titles / summaries from")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    corpus = corpus_from_archive(args.archive) if args.archive else CORPUS
+    r = bench(corpus, repeat=args.repeat)
+    saved = 1 - r["prepared_us"] / r["legacy_us"]
+    print(f"{r['items']} items")
+    print(f"per analyzer : {r['legacy_us']:8.1f}us per item")
+    print(f"PreparedText : {r['prepared_us']:8.1f}us per item  ({saved:.0%} less CPU)")
+    print(f"different results: {r['mismatches']}")
+
+
+if __name__ == "__main__":
+    main()
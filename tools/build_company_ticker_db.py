@@ -1,11 +1,27 @@
+"""
+Build the company -> ticker database and compile the security master.
+
+Downloads the S&P 500 (Wikipedia) and NASDAQ listings, writes
+data/company_to_ticker.json and compiles data/security_master.pkl - the
+artifact core.security_master loads at startup - with each symbol's
+exchange, index membership and display name.
+
+Usage:
+    python -m tools.build_company_ticker_db
+    python -m tools.build_company_ticker_db --compile-only   # no downloads: recompile from the JSON
+"""
+
 from __future__ import annotations
 
+import argparse
 import json
 import re
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Optional
 import requests
 
+from core.security_master import ARTIFACT_PATH, NASDAQ, SP500, SecurityMaster, load_security_master
+
 OUT_PATH = Path("data/company_to_ticker.json")
 OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
 
@@ -42,9 +58,10 @@ def normalize_company_name(name: str) -> str:
     return " ".join(parts).strip()
 
 
-def fetch_sp500() -> Dict[str, str]:
+def fetch_sp500(display_names: Optional[Dict[str, str]] = None) -> Dict[str, str]:
     """
     Wikipedia table: Symbol + Security.
+    display_names (optional) collects symbol -> company name as listed.
     FIX: download HTML with requests+headers to avoid 403, then pandas.read_html(html).
     """
     try:
@@ -67,6 +84,8 @@ def fetch_sp500() -> Dict[str, str]:
 
         if not symbol or not name:
             continue
+        if display_names is not None:
+            display_names[symbol] = name
 
         norm = normalize_company_name(name)
         if norm:
@@ -80,18 +99,19 @@ def fetch_sp500() -> Dict[str, str]:
     return out
 
 
-def fetch_nasdaq_listed() -> Dict[str, str]:
+def fetch_nasdaq_listed(display_names: Optional[Dict[str, str]] = None) -> Dict[str, str]:
     """
     Try NASDAQ screener API first (may block bots).
     Fallback: nasdaqtrader listed file (official).
+    display_names (optional) collects symbol -> company name as listed.
     """
     try:
-        return _fetch_nasdaq_from_api()
+        return _fetch_nasdaq_from_api(display_names)
     except Exception as e:
         print(f"  ⚠️ NASDAQ API failed: {e} -> trying nasdaqtrader file...")
-        return _fetch_nasdaq_from_trader_file()
+        return _fetch_nasdaq_from_trader_file(display_names)
 
-def _fetch_nasdaq_from_api() -> Dict[str, str]:
+def _fetch_nasdaq_from_api(display_names: Optional[Dict[str, str]] = None) -> Dict[str, str]:
     url = "https://api.nasdaq.com/api/screener/stocks?tableonly=true&limit=10000&exchange=nasdaq"
 
     session = requests.Session()
@@ -121,6 +141,8 @@ def _fetch_nasdaq_from_api() -> Dict[str, str]:
         name = (row.get("name") or "").strip()
         if not symbol or not name:
             continue
+        if display_names is not None:
+            display_names[symbol] = name
 
         norm = normalize_company_name(name)
         if norm:
@@ -128,7 +150,7 @@ def _fetch_nasdaq_from_api() -> Dict[str, str]:
 
     return out
 
-def _fetch_nasdaq_from_trader_file() -> Dict[str, str]:
+def _fetch_nasdaq_from_trader_file(display_names: Optional[Dict[str, str]] = None) -> Dict[str, str]:
     """
     Official NASDAQ Trader file (listed NASDAQ symbols).
     Note: this file includes symbol + security name.
@@ -156,6 +178,8 @@ def _fetch_nasdaq_from_trader_file() -> Dict[str, str]:
 
         if not symbol or not name:
             continue
+        if display_names is not None:
+            display_names[symbol] = name
 
         norm = normalize_company_name(name)
         if norm:
@@ -176,22 +200,66 @@ def merge_maps(primary: Dict[str, str], secondary: Dict[str, str]) -> Dict[str,
     return merged
 
 
-def main() -> None:
-    print("Fetching S&P 500 (Wikipedia)...")
-    sp = fetch_sp500()
-    print(f"  ✅ S&P 500 mappings: {len(sp)}")
+def build_listings(sp_names: Dict[str, str], nas_names: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    """symbol -> {name, exchange, indices} for the security master."""
+    listings: Dict[str, Dict[str, Any]] = {}
+    for symbol, name in sp_names.items():
+        listings[symbol] = {"name": name, "exchange": "", "indices": [SP500]}
+    for symbol, name in nas_names.items():
+        entry = listings.setdefault(symbol, {"name": name, "exchange": "", "indices": []})
+        entry["exchange"] = NASDAQ
+    return listings
 
-    print("Fetching NASDAQ listed (Nasdaq API)...")
-    nas = fetch_nasdaq_listed()
-    print(f"  ✅ NASDAQ mappings: {len(nas)}")
 
-    merged = merge_maps(sp, nas)
+def compile_security_master(
+    listings: Optional[Dict[str, Dict[str, Any]]] = None,
+    artifact: Path = ARTIFACT_PATH,
+) -> SecurityMaster:
+    """
+    Compile the artifact from OUT_PATH + seeds. Without `listings`, the
+    existing artifact's are kept.
+    """
+    if listings is None:
+        master = load_security_master(OUT_PATH, artifact)
+    else:
+        master = SecurityMaster.from_sources(OUT_PATH, listings)
+    master.save(artifact)
+    return master
 
-    OUT_PATH.write_text(
-        json.dumps(merged, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
-    print(f"\n✅ Saved {len(merged)} company→ticker mappings to {OUT_PATH}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--compile-only", action="store_true",
+                        help="skip the downloads; compile the security master from the existing JSON")
+    parser.add_argument("--artifact", type=Path, default=ARTIFACT_PATH, help="security master output path")
+    args = parser.parse_args()
+
+    listings = None
+    if not args.compile_only:
+        sp_names: Dict[str, str] = {}
+        nas_names: Dict[str, str] = {}
+
+        print("Fetching S&P 500 (Wikipedia)...")
+        sp = fetch_sp500(sp_names)
+        print(f"  ✅ S&P 500 mappings: {len(sp)}")
+
+        print("Fetching NASDAQ listed (Nasdaq API)...")
+        nas = fetch_nasdaq_listed(nas_names)
+        print(f"  ✅ NASDAQ mappings: {len(nas)}")
+
+        merged = merge_maps(sp, nas)
+
+        OUT_PATH.write_text(
+            json.dumps(merged, indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        print(f"\n✅ Saved {len(merged)} company→ticker mappings to {OUT_PATH}")
+        listings = build_listings(sp_names, nas_names)
+
+    master = compile_security_master(listings, args.artifact)
+    stats = master.get_stats()
+    print(f"✅ Compiled security master: {stats['securities']} securities, "
+          f"{stats['names']} names, {stats['major']} NASDAQ / S&P 500 symbols -> {args.artifact}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,53 @@
+"""
+Import feeds from an OPML export into the sources file.
+
+Usage (from the project root):
+    python -m tools.import_opml FEEDS.opml [--sources data/sources.json] [--category NAME] [--dry-run]
+
+Feeds whose URL (or name) is already in the sources file are skipped, so
+the import can be re-run after the reading list grows. Existing entries
+and collector overrides are left untouched.
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import replace
+from pathlib import Path
+
+from collectors.registry import DEFAULT_SOURCES_FILE, dump_json, load_json, load_opml
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("opml", type=Path)
+    ap.add_argument("--sources", type=Path, default=DEFAULT_SOURCES_FILE)
+    ap.add_argument("--category", default="", help="Category for feeds that have none in the OPML")
+    ap.add_argument("--dry-run", action="store_true", help="Only list what would be added")
+    args = ap.parse_args()
+
+    feeds, overrides = load_json(args.sources) if args.sources.exists() else ([], {})
+    urls = {f.url for f in feeds}
+    names = {f.name for f in feeds}
+
+    added = []
+    for feed in load_opml(args.opml):
+        if feed.url in urls or feed.name in names:
+            continue
+        if not feed.category and args.category:
+            feed = replace(feed, category=args.category)
+        added.append(feed)
+        urls.add(feed.url)
+        names.add(feed.name)
+
+    for feed in added:
+        print(f"+ {feed.name:<40} {feed.category:<12} {feed.url}")
+    print(f"{len(added)} new feeds ({len(feeds)} already in {args.sources})")
+
+    if added and not args.dry_run:
+        dump_json(feeds + added, args.sources, overrides)
+        print(f"Wrote {args.sources}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Circuit Breakers & Retry Budget
+===============================
+Keeps dead sources and failing providers from costing time on every poll.
+
+CircuitBreaker (one per source / provider, shared registry):
+- closed: calls go through; `failure_threshold` consecutive failures open it
+- open: calls are skipped until the cooldown has passed
+- half-open: one probe call is let through; success closes the breaker,
+  failure re-opens it with the cooldown doubled (up to `max_cooldown`)
+
+RetryBudget (process-wide): retries in the current window may not exceed
+`min_retries` + `ratio` x requests, so a bad network minute can't turn
+every request into 3 requests. The shared HTTP client checks it before
+each retry.
+
+    breaker = get_breakers().get("rss:PR Newswire")
+    if breaker.allow():
+        try:
+            ...
+            breaker.record_success()
+        except Exception:
+            breaker.record_failure()
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger("market_radar.circuit")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+DEFAULT_COOLDOWN = float(os.getenv("CIRCUIT_COOLDOWN_SECONDS", "60"))
+DEFAULT_MAX_COOLDOWN = float(os.getenv("CIRCUIT_MAX_COOLDOWN_SECONDS", "1800"))
+DEFAULT_RETRY_RATIO = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown: float = DEFAULT_COOLDOWN,
+        max_cooldown: float = DEFAULT_MAX_COOLDOWN,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            name: Source / provider name (for logs and stats)
+            failure_threshold: Consecutive failures that open the breaker
+            cooldown: Seconds before the first half-open probe
+            max_cooldown: Ceiling for the doubled cooldown
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._cooldown = cooldown
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(self.clock())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self._cooldown:
+            self._state = HALF_OPEN
+            self._probe_started = None
+        return self._state
+
+    def allow(self) -> bool:
+        """May a call go out now? (In half-open state only one probe at a time.)"""
+        with self._lock:
+            now = self.clock()
+            state = self._current_state(now)
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN:
+                # a probe that never reported back doesn't block forever
+                if self._probe_started is None or now - self._probe_started >= self._cooldown:
+                    self._probe_started = now
+                    return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"⚡ {self.name}: circuit closed (recovered)")
+            self._state = CLOSED
+            self._failures = 0
+            self._cooldown = self.base_cooldown
+            self._probe_started = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = self.clock()
+            state = self._current_state(now)
+            self._failures += 1
+            if state == HALF_OPEN:
+                self._cooldown = min(self._cooldown * 2, self.max_cooldown)
+                self._trip(now)
+            elif state == CLOSED and self._failures >= self.failure_threshold:
+                self._trip(now)
+
+    def _trip(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._probe_started = None
+        self.trips += 1
+        logger.warning(
+            f"⚡ {self.name}: circuit open after {self._failures} failures, "
+            f"next probe in {self._cooldown:.0f}s"
+        )
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed (0 if calls go through)."""
+        with self._lock:
+            now = self.clock()
+            if self._current_state(now) != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self._cooldown - now)
+
+    def snapshot(self) -> Dict[str, object]:
+        state = self.state
+        return {
+            "state": state,
+            "failures": self._failures,
+            "cooldown": round(self._cooldown, 1),
+            "retry_in": round(self.retry_in(), 1),
+            "rejected": self.rejected,
+            "trips": self.trips,
+        }
+
+
+class BreakerRegistry:
+    def __init__(self, **defaults):
+        """`defaults` are passed to every CircuitBreaker created by get()."""
+        self.defaults = defaults
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, **self.defaults)
+                self._breakers[name] = breaker
+            return breaker
+
+    def open_circuits(self) -> List[str]:
+        """Names of breakers that are currently not closed."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [b.name for b in breakers if b.state != CLOSED]
+
+    def get_stats(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.name: b.snapshot() for b in breakers}
+
+
+class RetryBudget:
+    def __init__(
+        self,
+        ratio: float = DEFAULT_RETRY_RATIO,
+        min_retries: int = 10,
+        window: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            ratio: Retries allowed per request sent in the window
+            min_retries: Retries always allowed per window (low traffic)
+            window: Window length in seconds
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._window_start = clock()
+        self._requests = 0
+        self._retries = 0
+        self.denied = 0
+
+    def _roll(self, now: float) -> None:
+        if now - self._window_start >= self.window:
+            self._window_start = now
+            self._requests = 0
+            self._retries = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._roll(self.clock())
+            self._requests += 1
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False if the budget is used up."""
+        with self._lock:
+            self._roll(self.clock())
+            if self._retries >= self.min_retries + self.ratio * self._requests:
+                self.denied += 1
+                return False
+            self._retries += 1
+            return True
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            self._roll(self.clock())
+            return {
+                "requests": self._requests,
+                "retries": self._retries,
+                "allowed": self.min_retries + self.ratio * self._requests,
+                "denied": self.denied,
+            }
+
+
+_breakers: Optional[BreakerRegistry] = None
+_retry_budget: Optional[RetryBudget] = None
+_global_lock = threading.Lock()
+
+
+def get_breakers() -> BreakerRegistry:
+    global _breakers
+    with _global_lock:
+        if _breakers is None:
+            _breakers = BreakerRegistry()
+        return _breakers
+
+
+def get_retry_budget() -> RetryBudget:
+    global _retry_budget
+    with _global_lock:
+        if _retry_budget is None:
+            _retry_budget = RetryBudget()
+        return _retry_budget
@@ -0,0 +1,201 @@
+"""
+HTTP Record & Replay Archive
+============================
+Capture every response that goes through the shared HTTP client
+(utils.http_client) to a gzip-compressed, append-only JSON-lines file,
+and feed those responses back later through a requests transport adapter.
+
+Capture (live network):
+    get_http_client().enable_capture("data/http_archive.jsonl.gz")
+
+Replay (offline):
+    get_http_client().enable_replay("data/http_archive.jsonl.gz", speed=0)
+
+Each record holds method, url, status, headers, body (base64), the time
+it was received and the request latency. Bodies are stored decoded, so
+Content-Encoding / Content-Length are dropped from the stored headers.
+
+Archives get copied around for replay and benchmarks, so credentials never
+reach them: API key query parameters (apikey=, apiKey=, api_token=, ...)
+and Telegram's /bot<token> path segment are redacted from stored URLs
+(redact_url), and notifier traffic (api.telegram.org) isn't recorded at
+all. Replay matches on the redacted form.
+
+Replay matching: the next unused response for the exact method + URL;
+failing that, the next one for method + host + path (query strings that
+carry cursors, e.g. time_from, change between runs). When a URL's
+responses run out the last one is served again, so a long replay settles
+into "nothing changed". Requests with no recording raise ConnectionError.
+
+`speed` replays the recorded latency: 1.0 = real time, 10 = ten times
+faster, 0 = no delay.
+
+Not covered: yfinance (uses its own HTTP stack).
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import logging
+import re
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger("market_radar.http_archive")
+
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+# Credentials that travel in URLs
+_SECRET_PARAM_RE = re.compile(
+    r"([?&](?:apikey|api_key|api_token|access_token|token|key)=)[^&#]*", re.I
+)
+_BOT_TOKEN_RE = re.compile(r"/bot\d+:[^/?#]+")
+REDACTED = "REDACTED"
+
+# Notifier traffic: never replayed, and its URLs carry the bot token
+_UNRECORDED_HOSTS = {"api.telegram.org"}
+
+
+def redact_url(url: str) -> str:
+    """`url` with API key query parameters and /bot<token> path segments redacted."""
+    url = _SECRET_PARAM_RE.sub(r"\g<1>" + REDACTED, url)
+    return _BOT_TOKEN_RE.sub("/bot" + REDACTED, url)
+
+
+class HttpArchiveWriter:
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # "ab": every run appends a new gzip member; readers see one stream
+        self._fh = gzip.open(self.path, "ab")
+        self.records = 0
+
+    def record(self, resp: requests.Response, elapsed: float) -> None:
+        req = resp.request
+        url = req.url if req is not None else resp.url
+        if (urlsplit(url).hostname or "").lower() in _UNRECORDED_HOSTS:
+            return
+        rec = {
+            "ts": time.time(),
+            "method": req.method if req is not None else "GET",
+            "url": redact_url(url),
+            "status": resp.status_code,
+            "headers": {k: v for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS},
+            "body": base64.b64encode(resp.content or b"").decode("ascii"),
+            "elapsed": round(elapsed, 4),
+        }
+        line = (json.dumps(rec, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            self._fh.write(line)
+            # sync flush: records written so far stay readable if we crash
+            self._fh.flush(zlib.Z_SYNC_FLUSH)
+            self.records += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
+
+
+def iter_records(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield archived records in capture order (tolerates a truncated tail)."""
+    with gzip.open(path, "rb") as fh:
+        try:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            logger.debug(f"{path}: archive ends mid-record (interrupted capture)")
+
+
+def _path_key(method: str, url: str) -> Tuple[str, str]:
+    parts = urlsplit(url)
+    return method.upper(), f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+class ReplayAdapter(BaseAdapter):
+    """requests transport adapter that answers from an archive."""
+
+    def __init__(self, records: List[Dict[str, Any]], speed: float = 0.0):
+        super().__init__()
+        self.speed = speed
+        self._records = records
+        self._lock = threading.Lock()
+        # queues of record indexes; a record used via one queue is skipped in the other
+        self._by_url: Dict[Tuple[str, str], Deque[int]] = defaultdict(deque)
+        self._by_path: Dict[Tuple[str, str], Deque[int]] = defaultdict(deque)
+        self._used: set = set()
+        self._last: Dict[Tuple[str, str], int] = {}
+        for i, rec in enumerate(records):
+            url = redact_url(rec["url"])  # archives written before redaction too
+            self._by_url[(rec["method"].upper(), url)].append(i)
+            self._by_path[_path_key(rec["method"], url)].append(i)
+        self.served = 0
+        self.missed = 0
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], speed: float = 0.0) -> "ReplayAdapter":
+        records = list(iter_records(path))
+        logger.info(f"▶️  Replaying {len(records)} recorded responses from {path} (speed={speed or 'max'})")
+        return cls(records, speed=speed)
+
+    def _pop(self, queue: Optional[Deque[int]]) -> Optional[int]:
+        while queue:
+            i = queue.popleft()
+            if i not in self._used:
+                self._used.add(i)
+                return i
+        return None
+
+    def _next(self, method: str, url: str) -> Optional[Dict[str, Any]]:
+        url = redact_url(url)
+        path_key = _path_key(method, url)
+        with self._lock:
+            i = self._pop(self._by_url.get((method.upper(), url)))
+            if i is None:
+                i = self._pop(self._by_path.get(path_key))
+            if i is None:
+                i = self._last.get(path_key)
+            if i is None:
+                return None
+            self._last[path_key] = i
+            return self._records[i]
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        rec = self._next(request.method, request.url)
+        if rec is None:
+            with self._lock:
+                self.missed += 1
+            raise requests.ConnectionError(
+                f"no recorded response for {request.method} {redact_url(request.url)}", request=request
+            )
+
+        if self.speed > 0 and rec.get("elapsed"):
+            time.sleep(rec["elapsed"] / self.speed)
+
+        resp = requests.Response()
+        resp.status_code = int(rec["status"])
+        resp.headers = CaseInsensitiveDict(rec.get("headers") or {})
+        resp.raw = BytesIO(base64.b64decode(rec.get("body") or ""))
+        resp.url = request.url
+        resp.request = request
+        resp.reason = "Replayed"
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        with self._lock:
+            self.served += 1
+        return resp
+
+    def close(self) -> None:
+        pass
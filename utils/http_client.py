@@ -0,0 +1,297 @@
+"""
+Shared HTTP Client
+==================
+One pooled requests.Session for collectors, market data providers, the
+ticker lists and the Telegram notifier, instead of a bare requests.get()
+(new TCP + TLS handshake) per call.
+
+- Keep-alive connection pools per host (HTTPAdapter, pool_maxsize).
+- Default (connect, read) timeout for every request.
+- urllib3 Retry for idempotent methods on connect errors / 429 / 5xx,
+  honouring Retry-After, and only while the global retry budget
+  (utils.circuit_breaker) allows it. POST is never retried here.
+- Response bodies are read with a size cap (ResponseTooLarge).
+- Per-host counters: requests, errors, bytes, average / max latency.
+- warm_up(): resolve and pre-connect hosts before a poll, so the first
+  request of the poll doesn't pay for DNS + TLS.
+- enable_capture() / enable_replay(): record every response to an
+  archive, or answer from one offline (utils.http_archive).
+
+    client = get_http_client()
+    resp = client.get(url, headers=..., timeout=25)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError
+from urllib3.util.retry import Retry
+
+from utils.circuit_breaker import RetryBudget, get_retry_budget
+from utils.http_archive import HttpArchiveWriter, ReplayAdapter
+
+logger = logging.getLogger("market_radar.http")
+
+Timeout = Union[float, Tuple[float, float]]
+
+DEFAULT_TIMEOUT: Tuple[float, float] = (5.0, 25.0)  # (connect, read)
+DEFAULT_MAX_BYTES = int(os.getenv("HTTP_MAX_RESPONSE_BYTES", str(10 * 1024 * 1024)))
+DEFAULT_USER_AGENT = "MarketRadar/1.0 (+https://example.com)"
+# A host used this recently still has a pooled keep-alive connection (warm_up skips it)
+WARM_IDLE_SECONDS = 30.0
+
+
+class ResponseTooLarge(requests.RequestException):
+    """Response body exceeded the client's size cap."""
+
+
+class BudgetedRetry(Retry):
+    """urllib3 Retry that also draws each retry from a shared RetryBudget."""
+
+    def __init__(self, *args: Any, budget: Optional[RetryBudget] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.budget = budget
+
+    def new(self, **kwargs: Any) -> "BudgetedRetry":
+        retry = super().new(**kwargs)
+        retry.budget = self.budget
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        if self.budget is not None and not self.budget.try_spend():
+            logger.debug(f"retry budget exhausted, not retrying {url}")
+            raise MaxRetryError(_pool, url, error or "retry budget exhausted")
+        return retry
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    errors: int = 0
+    bytes: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        avg = self.total_latency / self.requests if self.requests else 0.0
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "avg_ms": round(avg * 1000, 1),
+            "max_ms": round(self.max_latency * 1000, 1),
+        }
+
+
+class HttpClient:
+    def __init__(
+        self,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        retries: int = 2,
+        backoff_factor: float = 0.5,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        pool_maxsize: int = 10,
+        user_agent: str = DEFAULT_USER_AGENT,
+        retry_budget: Optional[RetryBudget] = None,
+    ):
+        """
+        Args:
+            timeout: Default (connect, read) timeout in seconds
+            retries: Retries for idempotent requests (connect errors, 429, 5xx)
+            backoff_factor: urllib3 exponential backoff factor
+            max_bytes: Default response size cap (0 = unlimited)
+            pool_maxsize: Keep-alive connections kept per host
+            user_agent: Default User-Agent (callers may override per request)
+            retry_budget: Shared retry budget (default: process-wide budget)
+        """
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.retry_budget = retry_budget or get_retry_budget()
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        retry = BudgetedRetry(
+            budget=self.retry_budget,
+            total=retries,
+            connect=retries,
+            read=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=32, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._stats: Dict[str, HostStats] = {}
+        self._stats_lock = threading.Lock()
+        # scheme://netloc -> monotonic time of the last response (warm_up)
+        self._last_used: Dict[str, float] = {}
+
+        self.recorder: Optional[HttpArchiveWriter] = None
+        self.replay: Optional[ReplayAdapter] = None
+
+    # ------------------------------------------------------------------ requests
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        timeout: Optional[Timeout] = None,
+        max_bytes: Optional[int] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send a request; the body is fully read (capped) before returning."""
+        cap = self.max_bytes if max_bytes is None else max_bytes
+        host = (urlsplit(url).hostname or "").lower()
+        started = time.perf_counter()
+        size = 0
+        self.retry_budget.record_request()
+        try:
+            resp = self.session.request(
+                method, url, timeout=timeout or self.timeout, stream=True, **kwargs
+            )
+            try:
+                declared = int(resp.headers.get("Content-Length") or 0)
+                if cap and declared > cap:
+                    raise ResponseTooLarge(f"{host}: Content-Length {declared} > {cap} bytes")
+                buf = bytearray()
+                for chunk in resp.iter_content(64 * 1024):
+                    buf += chunk
+                    if cap and len(buf) > cap:
+                        raise ResponseTooLarge(f"{host}: body > {cap} bytes")
+                resp._content = bytes(buf)
+                size = len(buf)
+            finally:
+                # fully read -> connection goes back to the pool; otherwise it's dropped
+                resp.close()
+        except Exception:
+            self._record(host, time.perf_counter() - started, 0, error=True)
+            raise
+        elapsed = time.perf_counter() - started
+        self._record(host, elapsed, size, error=resp.status_code >= 500)
+        self._touch(url)
+        if self.recorder is not None:
+            self.recorder.record(resp, elapsed)
+        return resp
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def head(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("HEAD", url, **kwargs)
+
+    # ------------------------------------------------------------------ warm-up
+
+    def warm_up(
+        self,
+        urls: Iterable[str],
+        timeout: float = 3.0,
+        max_workers: int = 8,
+        idle: float = WARM_IDLE_SECONDS,
+    ) -> int:
+        """
+        Open a pooled connection to each distinct host in `urls` (DNS, TCP
+        and TLS) with a HEAD / through the session, so it lands in the same
+        keep-alive pool the real request will use. Hosts that answered in the
+        last `idle` seconds still have a connection and are skipped. Failures
+        are ignored - the real request will report them.
+
+        Returns:
+            Number of hosts newly connected
+        """
+        if self.replay is not None:
+            return 0
+        now = time.monotonic()
+        targets = []
+        for url in urls:
+            parts = urlsplit(url)
+            origin = f"{parts.scheme}://{parts.netloc}"
+            if not parts.hostname or origin in targets:
+                continue
+            last = self._last_used.get(origin)
+            if last is None or now - last > idle:
+                targets.append(origin)
+        if not targets:
+            return 0
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(targets)), thread_name_prefix="warmup") as pool:
+            return sum(pool.map(lambda origin: self._preconnect(origin + "/", timeout), targets))
+
+    def _preconnect(self, url: str, timeout: float) -> bool:
+        try:
+            # no body: the connection goes straight back to the pool
+            self.session.head(url, timeout=timeout, allow_redirects=False).close()
+        except requests.RequestException as e:
+            logger.debug(f"warm-up {url} failed: {e}")
+            return False
+        self._touch(url)
+        return True
+
+    # ------------------------------------------------------------------ record / replay
+
+    def enable_capture(self, path: str) -> HttpArchiveWriter:
+        """Append every response (status, headers, body, timing) to a gzip archive."""
+        self.recorder = HttpArchiveWriter(path)
+        logger.info(f"⏺️  Capturing HTTP responses to {path}")
+        return self.recorder
+
+    def enable_replay(self, path: str, speed: float = 0.0) -> ReplayAdapter:
+        """Answer all requests from a capture archive instead of the network."""
+        self.replay = ReplayAdapter.from_file(path, speed=speed)
+        self.session.mount("http://", self.replay)
+        self.session.mount("https://", self.replay)
+        return self.replay
+
+    # ------------------------------------------------------------------ stats
+
+    def _touch(self, url: str) -> None:
+        parts = urlsplit(url)
+        self._last_used[f"{parts.scheme}://{parts.netloc}"] = time.monotonic()
+
+    def _record(self, host: str, latency: float, size: int, error: bool = False) -> None:
+        with self._stats_lock:
+            st = self._stats.setdefault(host, HostStats())
+            st.requests += 1
+            st.bytes += size
+            st.total_latency += latency
+            st.max_latency = max(st.max_latency, latency)
+            if error:
+                st.errors += 1
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host request / error / byte counters and latency."""
+        with self._stats_lock:
+            return {host: st.as_dict() for host, st in sorted(self._stats.items())}
+
+    def close(self) -> None:
+        if self.recorder is not None:
+            self.recorder.close()
+        self.session.close()
+
+
+_global_client: Optional[HttpClient] = None
+_global_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    global _global_client
+    with _global_lock:
+        if _global_client is None:
+            _global_client = HttpClient()
+        return _global_client